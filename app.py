@@ -1,110 +1,324 @@
 # Import necessary libraries
 import streamlit as st  # For creating the Streamlit web app
-import pandas as pd     # For handling dataframes
+import numpy as np      # For the encoded feature rows
+import pandas as pd     # For the what-if charts
+import altair as alt    # For the two-field what-if heatmap
 from streamlit_router import StreamlitRouter  # For page routing within Streamlit
-import pickle  # For loading the trained model from a file
-
-# Function to load the machine learning model (cached to avoid reloading every time)
-@st.cache_resource()
-def load_model():
-    with open("best_model.pkl", "rb") as f:
-        model = pickle.load(f)
-    return model
-
-
-# Load the model once and store it
-model = load_model()
+import time  # For naming batch result files
+from batch_score import score_file, format_report  # Chunked batch scoring
+from model_registry import ModelRegistry, validation_batch  # Model artifact with hot reload and rollback
+from prediction_cache import PredictionCache  # LRU cache of recent predictions
+import os  # For the metrics export switches
+import json  # For requests to the scoring service
+import urllib.request  # For requests to the scoring service
+import metrics  # Stage timings, counters and Prometheus export
+from metrics import timed
+import whatif  # Batched what-if sweeps
+from explain import format_reason  # Top contributing features of a prediction
+from features import CATEGORICAL_COLUMNS, CATEGORIES, NUMERIC_COLUMNS
+from drift_monitor import REFERENCE_PATH, load_monitor  # Input drift against the training data
+import audit_log  # Background-written log of every prediction
+
+# Prediction cache settings (shared by all sessions)
+PREDICTION_CACHE_SIZE = 4096     # Maximum number of cached client profiles
+PREDICTION_CACHE_TTL = None      # Seconds before an entry expires (None = never)
+
+# Metrics export (see metrics.py): a /metrics port and/or a file, both optional
+METRICS_PORT = os.environ.get("ADA442_METRICS_PORT")
+METRICS_FILE = os.environ.get("ADA442_METRICS_FILE")
+METRICS_FILE_INTERVAL = 1.0      # Seconds between metrics file rewrites
+
+# Optional scoring service (e.g. `scoring_service.py --workers 4`): when set,
+# predictions are sent to its pre-forked worker pool instead of scoring in
+# this Streamlit process. The service loads its model once at startup, so a
+# new model file reaches it only through a restart (no hot reload there)
+SCORING_URL = os.environ.get("ADA442_SCORING_URL")   # e.g. http://127.0.0.1:8502
+SCORING_TIMEOUT = 5.0            # Seconds to wait for the service
+
+# Features listed with every "Yes" prediction (see explain.py)
+EXPLAIN_TOP = 3
+
+# Input drift monitor (see drift_monitor.py); off when the reference file is missing
+DRIFT_REFERENCE = os.environ.get("ADA442_DRIFT_REFERENCE", REFERENCE_PATH)
+
+# Hot model reload (see model_registry.py): how often the model file is checked
+MODEL_POLL_INTERVAL = 2.0        # Seconds
+
+# Audit log of every prediction (see audit_log.py); an empty value turns it off.
+# With ADA442_SCORING_URL set, the service logs the form's predictions (its
+# --audit-dir) and this log only gets the batch files scored here
+AUDIT_DIR = os.environ.get("ADA442_AUDIT_DIR", audit_log.AUDIT_DIR)
+
+# Batch scoring: results are written here and kept, so large files never
+# have to be held in memory; smaller ones can also be downloaded
+BATCH_DIR = os.environ.get("ADA442_BATCH_DIR", "batch_results")
+BATCH_DOWNLOAD_MAX_BYTES = 200 * 2**20
+
+# What-if sweeps (see whatif.py)
+WHATIF_FIELDS = NUMERIC_COLUMNS + CATEGORICAL_COLUMNS
+WHATIF_MAX_POINTS = 100          # Per field; 100 x 100 rows are still one fast model call
+
+# === STATIC HTML/CSS ===
+# Built once at import instead of as string literals inside the page
+# functions; the form page only emits them on full page runs (see
+# prediction_form below)
+SIDEBAR_HTML = """
+<div style="background-color:#e0e0e0; padding:20px; border-radius:10px;">
+    <h2 style="color:#b03b6b; font-size:24px;">🎓 ADA442 Project</h2>
+    <p style="font-size:16px;">Welcome to the Term Deposit Predictor App</p>
+    <hr style="border:1px solid #f0b7cd;">
+    <h4 style="margin-top:20px; color:#7a2c4f;">👥 Group Members:</h4>
+    <ul style="padding-left: 20px; font-size:16px; line-height:1.8;">
+        <li>İdil Yakut</li>
+        <li>Helin Kahraman</li>
+        <li>Kardelen Helvacıoğlu</li>
+    </ul>
+    <hr style="border:1px dashed #f3a6c0;">
+    <p style="font-style: italic; font-size:15px; color:#5e3a47;">
+    </p>
+</div>
+"""
+
+PREDICTION_PAGE_CSS = """
+<style>
+    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;500;700&display=swap');
+    html, body, [class*="css"] {
+        font-family: 'Poppins', sans-serif;
+        background-color: #ffe4ec;
+        color: #3d2f1b;
+    }
+    .main-title {
+        font-size: 32px;
+        font-weight: 700;
+        color: #2e230a;
+        text-align: center;
+        margin-bottom: 25px;
+    }
+    .section {
+        background-color: #fddde6;
+        padding: 20px;
+        margin-bottom: 20px;
+        border-radius: 12px;
+        box-shadow: 0px 1px 8px rgba(220, 100, 140, 0.08);
+        border: 1px solid #f7c7d9;
+        max-width: 800px;
+        margin-left: auto;
+        margin-right: auto;
+    }
+    .section h4 {
+        color: #4b3832;
+        font-size: 24px;
+        font-weight: 700;
+        text-align: center;
+        margin-bottom: 18px;
+        border-bottom: 2px dashed #e0c98f;
+        padding-bottom: 6px;
+    }
+    label {
+        font-weight: 500 !important;
+        color: #4e3a1e !important;
+    }
+    .stButton > button {
+        background-color: #ec94b8;
+        color: white;
+        font-size: 16px;
+        font-weight: bold;
+        border-radius: 10px;
+        height: 45px;
+        width: 100%;
+        transition: 0.3s;
+        border: none;
+        box-shadow: 0px 2px 4px rgba(200, 80, 120, 0.2);
+    }
+    .stButton > button:hover {
+        background-color: #e279a5;
+        transform: scale(1.02);
+    }
+    .block-container {
+        max-width: 900px !important;
+        padding-left: 2rem;
+        padding-right: 2rem;
+        margin-left: auto;
+        margin-right: auto;
+    }
+</style>
+"""
+
+RESULT_YES_HTML = """
+<div style='background-color:#d4edda; padding:20px; border-radius:10px; border: 2px solid #a0d5a0; margin-top:20px;'>
+    <h3 style='color:#155724; text-align:center; font-size:28px;'>✅ Prediction: Subscribed (Yes). This client is likely to subscribe to a term deposit.</h3>
+</div>
+"""
+
+RESULT_NO_HTML = """
+<div style='background-color:#f8d7da; padding:20px; border-radius:10px; border: 2px solid #e8a4a7; margin-top:20px;'>
+    <h3 style='color:#721c24; text-align:center; font-size:28px;'>❌ Prediction: Not Subscribed (No). This client is not likely to subscribe. </h3>
+</div>
+"""
+
+WELCOME_PAGE_CSS = """
+<style>
+    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;500;700&display=swap');
+    html, body, [class*="css"] {
+        font-family: 'Poppins', sans-serif;
+        background-color: #e0f0ff;
+        color: #2f2f2f;
+    }
+    .main-title {
+        font-size: 56px;
+        font-weight: 800;
+        color: #1e3a5f;
+        text-align: center;
+        margin-top: 50px;
+        margin-bottom: 20px;
+    }
+    .subtitle {
+        font-size: 28px;
+        color: #315475;
+        text-align: center;
+        margin-bottom: 30px;
+    }
+    .member-list {
+        font-size: 22px;
+        text-align: center;
+        color: #3c3c3c;
+        line-height: 2.2;
+        margin-bottom: 40px;
+    }
+    .predict-instruction {
+        font-size: 20px;
+        text-align: center;
+        color: #555;
+        margin-bottom: 20px;
+    }
+    .stButton > button {
+        background-color: #70b8ff;
+        color: white;
+        font-size: 20px;
+        font-weight: bold;
+        border-radius: 12px;
+        height: 55px;
+        width: 100%;
+        margin-top: 10px;
+        transition: 0.3s;
+        border: none;
+        box-shadow: 0px 3px 6px rgba(80, 120, 180, 0.3);
+    }
+    .stButton > button:hover {
+        background-color: #51a5ec;
+        transform: scale(1.04);
+    }
+</style>
+"""
+
+# Function to start the model registry once per server process. It loads the
+# model artifact (fitted scaling, one-hot layout and estimator) and warms it;
+# a model file replaced by rename is then loaded and warmed in a background
+# thread and swapped in for the following requests, so there is no restart and
+# no slow first request. The previous model is kept for rollback.
+@st.cache_resource
+def load_registry():
+    return ModelRegistry(poll_interval=MODEL_POLL_INTERVAL, batch=validation_batch()).start()
+
+
+# Function to create the prediction cache shared across Streamlit sessions;
+# one per model version, and the previous version's stays warm for a rollback
+@st.cache_resource(max_entries=2)
+def load_prediction_cache(model_version):
+    return PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL, model_version)
+
+
+# Drift counts shared across Streamlit sessions (None without a reference)
+@st.cache_resource
+def load_drift_monitor(path):
+    return load_monitor(path)
+
+
+# One audit writer thread per server process (None when the log is off)
+@st.cache_resource
+def load_audit_logger(directory):
+    return audit_log.AuditLogger(directory) if directory else None
+
+
+# Start the metrics endpoint once per server process
+@st.cache_resource
+def start_metrics_server(port):
+    return metrics.serve_metrics(int(port))
+
+
+# Function to score one encoded row in this process: (label, P(yes), model
+# version), with NaN for models without probabilities
+def local_predict(model, row):
+    X = row.reshape(1, -1)
+    if not model.has_proba:
+        return model.predict_encoded(X)[0], float("nan"), model.version
+    proba = model.predict_proba_encoded(X)[0]
+    return model.classes_[proba.argmax()], float(proba[1]), model.version
+
+
+# Function to score one record with the scoring service's worker pool
+def remote_predict(record):
+    request = urllib.request.Request(SCORING_URL.rstrip("/") + "/predict",
+                                     data=json.dumps(record).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=SCORING_TIMEOUT) as response:
+        payload = json.load(response)
+    result = payload["predictions"][0]
+    return result["prediction"], result["probability_yes"], payload["model_version"]
+
+
+# Function to render a block of inline HTML/CSS, timed as the "render" stage
+def render_html(html):
+    with timed("render"):
+        st.markdown(html, unsafe_allow_html=True)
+
+
+if METRICS_PORT:
+    start_metrics_server(METRICS_PORT)
+
+# The registry holds the live model; pages read registry.current once per run
+registry = load_registry()
+model = registry.current
+drift = load_drift_monitor(DRIFT_REFERENCE)
+audit = load_audit_logger(AUDIT_DIR)
 
 # === FUNCTION TO CREATE PREDICTION FORM PAGE ===
 def create_interface():
     # Sidebar content with project and team details
     with st.sidebar:
-        st.markdown("""
-            <div style="background-color:#e0e0e0; padding:20px; border-radius:10px;">
-                <h2 style="color:#b03b6b; font-size:24px;">🎓 ADA442 Project</h2>
-                <p style="font-size:16px;">Welcome to the Term Deposit Predictor App</p>
-                <hr style="border:1px solid #f0b7cd;">
-                <h4 style="margin-top:20px; color:#7a2c4f;">👥 Group Members:</h4>
-                <ul style="padding-left: 20px; font-size:16px; line-height:1.8;">
-                    <li>İdil Yakut</li>
-                    <li>Helin Kahraman</li>
-                    <li>Kardelen Helvacıoğlu</li>
-                </ul>
-                <hr style="border:1px dashed #f3a6c0;">
-                <p style="font-style: italic; font-size:15px; color:#5e3a47;">
-                </p>
-            </div>
-        """, unsafe_allow_html=True)
+        render_html(SIDEBAR_HTML)
+        # Live model, hot reload state and an instant way back to the previous model
+        with st.expander("🧠 Model"):
+            st.json(registry.status())
+            if registry.previous is not None and st.button(f"↩️ Roll back to {registry.previous.version}"):
+                registry.rollback()
+                st.rerun()
+        # Where this page's predictions are audited, so a disabled log is never silent
+        if audit is None:
+            st.caption("Audit log off (ADA442_AUDIT_DIR is empty)")
+        elif SCORING_URL:
+            st.caption(f"Predictions are audited by the scoring service; batch files in `{AUDIT_DIR}/`")
+        else:
+            st.caption(f"Every prediction is audited in `{AUDIT_DIR}/`")
 
     # General styling for the prediction page using custom CSS
-    st.markdown("""
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;500;700&display=swap');
-            html, body, [class*="css"] {
-                font-family: 'Poppins', sans-serif;
-                background-color: #ffe4ec;
-                color: #3d2f1b;
-            }
-            .main-title {
-                font-size: 32px;
-                font-weight: 700;
-                color: #2e230a;
-                text-align: center;
-                margin-bottom: 25px;
-            }
-            .section {
-                background-color: #fddde6;
-                padding: 20px;
-                margin-bottom: 20px;
-                border-radius: 12px;
-                box-shadow: 0px 1px 8px rgba(220, 100, 140, 0.08);
-                border: 1px solid #f7c7d9;
-                max-width: 800px;
-                margin-left: auto;
-                margin-right: auto;
-            }
-            .section h4 {
-                color: #4b3832;
-                font-size: 24px;
-                font-weight: 700;
-                text-align: center;
-                margin-bottom: 18px;
-                border-bottom: 2px dashed #e0c98f;
-                padding-bottom: 6px;
-            }
-            label {
-                font-weight: 500 !important;
-                color: #4e3a1e !important;
-            }
-            .stButton > button {
-                background-color: #ec94b8;
-                color: white;
-                font-size: 16px;
-                font-weight: bold;
-                border-radius: 10px;
-                height: 45px;
-                width: 100%;
-                transition: 0.3s;
-                border: none;
-                box-shadow: 0px 2px 4px rgba(200, 80, 120, 0.2);
-            }
-            .stButton > button:hover {
-                background-color: #e279a5;
-                transform: scale(1.02);
-            }
-            .block-container {
-                max-width: 900px !important;
-                padding-left: 2rem;
-                padding-right: 2rem;
-                margin-left: auto;
-                margin-right: auto;
-            }
-        </style>
-    """, unsafe_allow_html=True)
+    render_html(PREDICTION_PAGE_CSS)
 
     # Title of the form
     st.markdown('<div class="main-title">📈 Bank Term Deposit Prediction</div>', unsafe_allow_html=True)
 
+    # Form and result; pressing Predict reruns only this fragment, so the
+    # sidebar, CSS and title above are not sent again
+    prediction_form()
+
+# === PREDICTION FORM AND RESULT (RERUNS ON ITS OWN) ===
+@st.fragment
+def prediction_form():
+    # The model for this submission; a hot reload only affects the next one
+    model = registry.current
+    encoder = model.encoder
+    prediction_cache = load_prediction_cache(model.version)
+
     # Create the prediction input form
     with st.form("prediction_form"):
         # Section: Personal Info
@@ -143,10 +357,8 @@ def create_interface():
         "cellular", "telephone"
         ])
 
-        month = st.selectbox("Month of Contact", [
-        "jan", "feb", "mar", "apr", "may", "jun", "jul", "aug",
-        "sep", "oct", "nov", "dec"
-        ])
+        # No calls were made in jan or feb, so the model knows nothing about them
+        month = st.selectbox("Month of Contact", CATEGORIES["month"])
 
         day_of_week = st.selectbox("Day of the Week", [
         "mon", "tue", "wed", "thu", "fri"
@@ -184,141 +396,144 @@ def create_interface():
 
         # If form submitted, generate prediction
         if submitted:
-            # Prepare data for prediction
-            data = {
-            'age': [age],
-            'duration': [duration],
-            'campaign': [campaign],
-            'pdays': [pdays],
-            'previous': [previous],
-            'emp.var.rate': [emp_var_rate],
-            'cons.price.idx': [cons_price_idx],
-            'cons.conf.idx': [cons_conf_idx],
-            'euribor3m': [euribor3m],
-            'nr.employed': [nr_employed],
-            'job_blue-collar': [1 if job == 'blue-collar' else 0],
-            'job_entrepreneur': [1 if job == 'entrepreneur' else 0],
-            'job_housemaid': [1 if job == 'housemaid' else 0],
-            'job_management': [1 if job == 'management' else 0],
-            'job_retired': [1 if job == 'retired' else 0],
-            'job_self-employed': [1 if job == 'self-employed' else 0],
-            'job_services': [1 if job == 'services' else 0],
-            'job_student': [1 if job == 'student' else 0],
-            'job_technician': [1 if job == 'technician' else 0],
-            'job_unemployed': [1 if job == 'unemployed' else 0],
-            'job_unknown': [1 if job == 'unknown' else 0],
-            'marital_married': [1 if marital == 'married' else 0],
-            'marital_single': [1 if marital == 'single' else 0],
-            'marital_unknown': [1 if marital == 'unknown' else 0],
-            'education_basic.6y': [1 if education == 'basic.6y' else 0],
-            'education_basic.9y': [1 if education == 'basic.9y' else 0],
-            'education_high.school': [1 if education == 'high.school' else 0],
-            'education_illiterate': [1 if education == 'illiterate' else 0],
-            'education_professional.course': [1 if education == 'professional.course' else 0],
-            'education_university.degree': [1 if education == 'university.degree' else 0],
-            'education_unknown': [1 if education == 'unknown' else 0],
-            'default_unknown': [1 if default == 'unknown' else 0],
-            'default_yes': [1 if default == 'yes' else 0],
-            'housing_unknown': [1 if housing == 'unknown' else 0],
-            'housing_yes': [1 if housing == 'yes' else 0],
-            'loan_unknown': [1 if loan == 'unknown' else 0],
-            'loan_yes': [1 if loan == 'yes' else 0],
-            'contact_telephone': [1 if contact_type == 'telephone' else 0],
-            'month_aug': [1 if month == 'aug' else 0],
-            'month_dec': [1 if month == 'dec' else 0],
-            'month_jul': [1 if month == 'jul' else 0],
-            'month_jun': [1 if month == 'jun' else 0],
-            'month_mar': [1 if month == 'mar' else 0],
-            'month_may': [1 if month == 'may' else 0],
-            'month_nov': [1 if month == 'nov' else 0],
-            'month_oct': [1 if month == 'oct' else 0],
-            'month_sep': [1 if month == 'sep' else 0],
-            'day_of_week_mon': [1 if day_of_week == 'mon' else 0],
-            'day_of_week_thu': [1 if day_of_week == 'thu' else 0],
-            'day_of_week_tue': [1 if day_of_week == 'tue' else 0],
-            'day_of_week_wed': [1 if day_of_week == 'wed' else 0],
-            'poutcome_nonexistent': [1 if poutcome == 'nonexistent' else 0],
-            'poutcome_success': [1 if poutcome == 'success' else 0]
-             }
-
-
-            # Convert data to DataFrame for model
-            input_df = pd.DataFrame(data)
-
-            # Predict using the model
-            prediction = model.predict(input_df)[0]
-
-            # Show result based on prediction
-            if prediction == 1:
-                st.markdown("""
-                    <div style='background-color:#d4edda; padding:20px; border-radius:10px; border: 2px solid #a0d5a0; margin-top:20px;'>
-                        <h3 style='color:#155724; text-align:center; font-size:28px;'>✅ Prediction: Subscribed (Yes). This client is likely to subscribe to a term deposit.</h3>
-                    </div>
-                """, unsafe_allow_html=True)
+            metrics.REQUESTS.inc("app")
+            # Scale and encode the inputs straight into the preallocated feature row
+            record = {
+                'age': age, 'duration': duration, 'campaign': campaign, 'pdays': pdays,
+                'previous': previous, 'emp.var.rate': emp_var_rate,
+                'cons.price.idx': cons_price_idx, 'cons.conf.idx': cons_conf_idx,
+                'euribor3m': euribor3m, 'nr.employed': nr_employed,
+                'job': job, 'marital': marital, 'education': education,
+                'default': default, 'housing': housing, 'loan': loan,
+                'contact': contact_type, 'month': month, 'day_of_week': day_of_week,
+                'poutcome': poutcome,
+            }
+            # Reuse this session's last result when the inputs (and model) did not change.
+            # Remote answers are never reused or cached here: the service serves the model
+            # it was started with, which need not be the local one, and a restart of the
+            # service can change it without this process noticing
+            last = st.session_state.get("last_prediction")
+            if not SCORING_URL and last is not None and last[0] == record and last[1] == model.version:
+                prediction, probability, served_by = last[2:]
             else:
-                st.markdown("""
-                    <div style='background-color:#f8d7da; padding:20px; border-radius:10px; border: 2px solid #e8a4a7; margin-top:20px;'>
-                        <h3 style='color:#721c24; text-align:center; font-size:28px;'>❌ Prediction: Not Subscribed (No). This client is not likely to subscribe. </h3>
-                    </div>
-                """, unsafe_allow_html=True)
+                with metrics.profile_if_slow("predict"):
+                    if SCORING_URL:
+                        with timed("predict"):
+                            prediction, probability, served_by = remote_predict(record)
+                    else:
+                        # One buffer per session, resized if a reloaded model has another layout
+                        if len(st.session_state.get("input_row", ())) != encoder.n_features:
+                            st.session_state.input_row = np.zeros(encoder.n_features)
+                        with timed("encode"):
+                            input_row = encoder.encode_row(record, st.session_state.input_row)
+
+                        # Predict using the model, unless this exact profile was scored before
+                        with timed("predict"):
+                            score = lambda row: local_predict(model, row)
+                            prediction, probability, served_by = prediction_cache.get_or_compute(input_row, score)
+                st.session_state.last_prediction = (record, model.version, prediction, probability, served_by)
+                # A few microseconds: one counter per field
+                if drift is not None:
+                    drift.update_record(record)
+            metrics.record_predictions([prediction])
+            # Only queued here; the audit thread encodes and writes in the background.
+            # Remote answers are already in the scoring service's log
+            if audit is not None and not SCORING_URL:
+                with timed("audit"):
+                    audit.log_one(model, record, prediction, probability)
+
+            show_result(model, record, prediction, served_by)
+
+            if METRICS_FILE:
+                metrics.REGISTRY.write(METRICS_FILE, METRICS_FILE_INTERVAL)
+        elif st.session_state.get("last_prediction") is not None:
+            # A what-if widget reran this fragment: keep the last answer on screen
+            record, _, prediction, _, served_by = st.session_state.last_prediction
+            show_result(model, record, prediction, served_by)
+
+    # What-if sweeps around the last submitted profile
+    whatif_panel(model)
+
+    # Cache counters for tuning PREDICTION_CACHE_SIZE / PREDICTION_CACHE_TTL
+    with st.expander("⚡ Prediction cache statistics"):
+        if SCORING_URL:
+            st.caption("Predictions come from the scoring service and are not cached here")
+        st.json(prediction_cache.stats())
+
+    # PSI per field of the recent inputs against the training data
+    if drift is not None:
+        with st.expander("📉 Input drift"):
+            report = drift.report()
+            st.caption(f"{report['rows']:,} inputs scored; PSI below 0.1 is stable, above 0.25 is drift")
+            st.dataframe(pd.DataFrame.from_dict(report["fields"], orient="index"))
+
+# === RESULT OF ONE PREDICTION ===
+def show_result(model, record, prediction, served_by):
+    if prediction == 1:
+        render_html(RESULT_YES_HTML)
+        # Every "Yes" comes with the fields that raised P(yes) most (tree models),
+        # when the answer came from this model and not another version
+        if model.explainer is not None and served_by == model.version:
+            with timed("explain"):
+                reasons = model.explainer.top_reasons(model.transform(record), [record], EXPLAIN_TOP)[0]
+            st.markdown("**Top contributing features:**\n" +
+                        "".join(f"\n- {format_reason(*reason)}" for reason in reasons))
+    else:
+        render_html(RESULT_NO_HTML)
+    st.caption(f"Scored by model {served_by}")
+
+# === WHAT-IF SWEEPS ===
+# A plain function inside the prediction_form fragment (Streamlit fragments
+# must not nest): moving a slider reruns that fragment, not the page
+def whatif_panel(model):
+    encoder = model.encoder
+    with st.expander("🔍 What-if: sweep one or two fields"):
+        last = st.session_state.get("last_prediction")
+        if last is None:
+            st.info("Submit a client profile first; the sweep starts from it.")
+            return
+        record = last[0]
+        field = st.selectbox("Field to sweep", WHATIF_FIELDS, index=WHATIF_FIELDS.index("campaign"))
+        other = st.selectbox("Second field (optional)", ["—"] + [f for f in WHATIF_FIELDS if f != field])
+        points = st.slider("Points per numeric field", 10, WHATIF_MAX_POINTS, 50)
+        field2 = None if other == "—" else other
+
+        # The whole grid is scored in one batched call
+        values = whatif.sweep_values(encoder, field, points)
+        values2 = whatif.sweep_values(encoder, field2, points) if field2 else None
+        with timed("whatif"):
+            scores = whatif.sweep(model, record, field, values, field2, values2)
+        # P(yes), or the decision score of models without probabilities
+        label = whatif.score_label(model)
+
+        if field2 is None:
+            curve = pd.DataFrame({label: scores}, index=pd.Index(values, name=field))
+            if field in CATEGORICAL_COLUMNS:
+                st.bar_chart(curve)
+            else:
+                st.line_chart(curve)
+        else:
+            grid = pd.DataFrame({
+                field: np.repeat(values, len(values2)),
+                field2: np.tile(values2, len(values)),
+                label: scores.ravel(),
+            })
+            kind = lambda f: ":N" if f in CATEGORICAL_COLUMNS else ":O"
+            scale = (alt.Scale(domain=[0, 1], scheme="redyellowgreen") if label == "P(yes)"
+                     else alt.Scale(domainMid=0, scheme="redyellowgreen"))
+            heatmap = alt.Chart(grid).mark_rect().encode(
+                x=alt.X(field + kind(field), sort=None), y=alt.Y(field2 + kind(field2), sort=None),
+                color=alt.Color(f"{label}:Q", scale=scale),
+                tooltip=[field, field2, alt.Tooltip(f"{label}:Q", format=".3f")])
+            st.altair_chart(heatmap)
+        # Sweeps always run in this process, also when the form is scored remotely
+        st.caption(f"{scores.size:,} variations of the submitted profile, scored in one call "
+                   f"to model {model.version}")
 
 # === FUNCTION FOR THE WELCOME PAGE ===
 def welcome_page(router):
     # Style for welcome page
-    st.markdown("""
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;500;700&display=swap');
-            html, body, [class*="css"] {
-                font-family: 'Poppins', sans-serif;
-                background-color: #e0f0ff;
-                color: #2f2f2f;
-            }
-            .main-title {
-                font-size: 56px;
-                font-weight: 800;
-                color: #1e3a5f;
-                text-align: center;
-                margin-top: 50px;
-                margin-bottom: 20px;
-            }
-            .subtitle {
-                font-size: 28px;
-                color: #315475;
-                text-align: center;
-                margin-bottom: 30px;
-            }
-            .member-list {
-                font-size: 22px;
-                text-align: center;
-                color: #3c3c3c;
-                line-height: 2.2;
-                margin-bottom: 40px;
-            }
-            .predict-instruction {
-                font-size: 20px;
-                text-align: center;
-                color: #555;
-                margin-bottom: 20px;
-            }
-            .stButton > button {
-                background-color: #70b8ff;
-                color: white;
-                font-size: 20px;
-                font-weight: bold;
-                border-radius: 12px;
-                height: 55px;
-                width: 100%;
-                margin-top: 10px;
-                transition: 0.3s;
-                border: none;
-                box-shadow: 0px 3px 6px rgba(80, 120, 180, 0.3);
-            }
-            .stButton > button:hover {
-                background-color: #51a5ec;
-                transform: scale(1.04);
-            }
-        </style>
-    """, unsafe_allow_html=True)
+    render_html(WELCOME_PAGE_CSS)
 
     # Display welcome content
     st.markdown('<div class="main-title">🎓 ADA442 Project</div>', unsafe_allow_html=True)
@@ -330,10 +545,56 @@ def welcome_page(router):
     if st.button("🚀 Begin Prediction"):
         router.redirect("/data_input")
 
+    # Button to navigate to batch scoring of whole campaign files
+    if st.button("📂 Score a Campaign File"):
+        router.redirect("/batch")
+
+# === FUNCTION FOR THE BATCH SCORING PAGE ===
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def batch_page():
+    st.markdown('<div class="main-title">📂 Batch Campaign Scoring</div>', unsafe_allow_html=True)
+    st.write("Upload a call list shaped like bank-additional.csv (semicolon separated) to score every client at once.")
+
+    uploaded = st.file_uploader("Campaign file", type=["csv"])
+    chunksize = st.number_input("Rows per chunk", min_value=1000, value=50000, step=1000)
+    explain_top = st.number_input("Top contributing features per client (0 = none)",
+                                  min_value=0, max_value=5, value=0) if model.explainer is not None else 0
+
+    if uploaded is not None and st.button("🔮 Score File"):
+        # Results are streamed to disk chunk by chunk so memory stays bounded;
+        # the file only gets its final name once it is complete
+        os.makedirs(BATCH_DIR, exist_ok=True)
+        name = f"scored_{time.strftime('%Y%m%d-%H%M%S')}_{os.path.basename(uploaded.name)}"
+        output = os.path.abspath(os.path.join(BATCH_DIR, name))
+        partial = output + ".part"
+        progress = st.empty()
+        try:
+            report = score_file(model, uploaded, partial, int(chunksize),
+                                progress=lambda rows: progress.write(f"Scored {rows:,} rows..."),
+                                explain_top=int(explain_top), audit=audit)
+            os.replace(partial, output)
+        finally:
+            # A failed run leaves no half-written file behind
+            if os.path.exists(partial):
+                os.remove(partial)
+        progress.success(format_report(report))
+        st.write(f"Scored file saved to `{output}`")
+
+        # The file is only read when the button is clicked, never kept in the session
+        if os.path.getsize(output) <= BATCH_DOWNLOAD_MAX_BYTES:
+            st.download_button("⬇️ Download Scored File", lambda: read_file(output),
+                               file_name=name, mime="text/csv")
+        else:
+            st.info("The file is too large to download here; copy it from the path above.")
+
 # === PAGE ROUTER SETUP ===
 router = StreamlitRouter()
 router.register(welcome_page, "/")            # Register welcome page
 router.register(create_interface, "/data_input")  # Register prediction input page
+router.register(batch_page, "/batch")  # Register batch scoring page
 router.serve()  # Start the router
 
 
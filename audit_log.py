@@ -0,0 +1,411 @@
+"""audit_log.py – Non-blocking audit log of every prediction
+--------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Keeps every scored input and output without putting the disk on
+             the predict path. `AuditLogger.log` only appends a tuple to an
+             in-memory queue (about a microsecond); a background thread wakes
+             every `flush_interval` seconds, encodes everything queued into
+             fixed-width rows and appends them to the current log file in one
+             write. Batch scoring queues its raw chunks as they are
+             (`log_frame`), so whole files are logged without a per-row loop.
+
+             Log files are append-only arrays of fixed-width 135-byte records
+             behind a 4 KiB JSON header, so a day of logs is loaded with
+             np.memmap instead of being parsed. Each file holds one UTC day
+             of one process; a new part starts when the day or the size limit
+             changes:
+
+                 audit/audit-20261017-<pid>-000.bin
+                 audit/audit-20261017-<pid>-000.bin.unseen
+
+             Nothing that was scored is lost: numerics are kept as the raw
+             float64 values, categories as codes into features.CATEGORIES
+             (stored in the header), and any value outside that vocabulary
+             goes to the file's `.unseen` side table (one JSON line per value
+             with its row and field), so `decode` gives back exactly the raw
+             field values without the model file.
+
+Usage:
+    python audit_log.py audit/                      # today's rows (UTC)
+    python audit_log.py audit/ --day 2026-10-17 --head 5
+"""
+
+# =============================
+# Imports
+# =============================
+import argparse
+import atexit
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from features import CATEGORICAL_COLUMNS, CATEGORIES, NUMERIC_COLUMNS, UNSEEN_CODE
+
+# =============================
+# Constants
+# =============================
+AUDIT_DIR = "audit"
+MAGIC = b"ADA442-AUDIT\n"
+FORMAT_VERSION = 2
+HEADER_BYTES = 4096
+DEFAULT_FLUSH_INTERVAL = 0.5        # Seconds between background writes
+DEFAULT_MAX_FILE_BYTES = 256 * 2**20
+SECONDS_PER_DAY = 86400
+UNSEEN_SUFFIX = ".unseen"           # Side table of values outside CATEGORIES
+
+# One fixed-width record per prediction: the raw numerics, the category codes
+# (UNSEEN_CODE for values kept in the side table) and the model's answer
+RECORD_DTYPE = np.dtype([
+    ("time", "<f8"),                                    # Unix seconds
+    ("probability", "<f4"),                             # P(yes); NaN for models without probabilities
+    ("prediction", "i1"),
+    ("model_version", "S32"),                           # Room for a tiered "teacher+student" version
+    ("numeric", "<f8", (len(NUMERIC_COLUMNS),)),
+    ("codes", "u1", (len(CATEGORICAL_COLUMNS),)),
+])
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _plain(value):
+    # numpy scalars from a DataFrame column are not JSON serializable
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _day(timestamp):
+    return time.strftime("%Y%m%d", time.gmtime(timestamp))
+
+
+def _header():
+    header = {
+        "format": FORMAT_VERSION,
+        "record_bytes": RECORD_DTYPE.itemsize,
+        "numeric_columns": NUMERIC_COLUMNS,
+        "categorical_columns": CATEGORICAL_COLUMNS,
+        "categories": CATEGORIES,
+    }
+    body = MAGIC + json.dumps(header).encode("utf-8")
+    if len(body) >= HEADER_BYTES:
+        raise ValueError("Audit header does not fit in HEADER_BYTES")
+    return body.ljust(HEADER_BYTES - 1) + b"\n"
+
+
+# =============================
+# Writer
+# =============================
+class AuditLogger:
+    """Queues predictions and appends them to the log from a background thread.
+
+    Safe to call from several threads. Create it in the process that scores
+    (after a fork): the writer thread does not survive fork().
+    """
+
+    def __init__(self, directory=AUDIT_DIR, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 max_file_bytes=DEFAULT_MAX_FILE_BYTES):
+        self.directory = directory
+        self.flush_interval = float(flush_interval)
+        self.max_file_bytes = int(max_file_bytes)
+        os.makedirs(directory, exist_ok=True)
+        self._queue = queue.SimpleQueue()
+        self._closed = threading.Event()
+        self._write_lock = threading.Lock()
+        self._file = None
+        self._unseen = None            # Side table of the open file
+        self._file_day = None
+        self._file_rows = 0
+        self._lookup = [{value: code for code, value in enumerate(CATEGORIES[field])}
+                        for field in CATEGORICAL_COLUMNS]
+        self.rows = 0                  # Rows written
+        self.writes = 0
+        self.errors = 0
+        self.files = []
+        self._thread = threading.Thread(target=self._run, name="audit-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---------- Predict path ----------
+    def log(self, artifact, records, predictions, probabilities):
+        """Queue scored raw records with their labels and P(yes); never touches the disk."""
+        self._queue.put((time.time(), artifact.version, records, predictions, probabilities))
+
+    def log_one(self, artifact, record, prediction, probability):
+        self._queue.put((time.time(), artifact.version, (record,), (prediction,), (probability,)))
+
+    def log_frame(self, artifact, frame, predictions, probabilities):
+        """Queue a scored DataFrame of raw fields (a batch chunk) with its answers."""
+        self._queue.put((time.time(), artifact.version, frame, predictions, probabilities))
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    # ---------- Background writes ----------
+    def _run(self):
+        while not self._closed.is_set():
+            self._closed.wait(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        """Write everything queued so far (the writer thread does this on its own)."""
+        with self._write_lock:
+            items = []
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not items:
+                return
+            try:
+                self._write(items)
+            except Exception as exc:
+                # Losing the log must not take the app down; the count shows up in stats()
+                self.errors += 1
+                print(f"audit_log: write failed: {exc!r}", file=sys.stderr)
+
+    def _write(self, items):
+        rows, unseen = self._rows(items)
+        self._write_rows(rows, unseen)
+
+    def _rows(self, items):
+        # unseen: (row, field index, value) of every category value outside CATEGORIES
+        counts = [len(item[2]) for item in items]
+        rows = np.empty(sum(counts), dtype=RECORD_DTYPE)
+        unseen = []
+        start = 0
+        for item, count in zip(items, counts):
+            data = item[2]
+            if isinstance(data, pd.DataFrame):
+                self._encode_frame(data, rows[start:start + count], start, unseen)
+            else:
+                self._encode_records(data, rows[start:start + count], start, unseen)
+            start += count
+        rows["time"] = np.repeat([item[0] for item in items], counts)
+        rows["model_version"] = np.repeat([item[1].encode("ascii") for item in items], counts)
+        rows["prediction"] = np.concatenate([np.asarray(item[3]) for item in items])
+        rows["probability"] = np.concatenate([np.asarray(item[4], dtype=np.float32) for item in items])
+        return rows, unseen
+
+    def _encode_records(self, records, out, start, unseen):
+        out["numeric"] = [[record[name] for name in NUMERIC_COLUMNS] for record in records]
+        codes = out["codes"]
+        for i, record in enumerate(records):
+            for j, field in enumerate(CATEGORICAL_COLUMNS):
+                value = record[field]
+                code = self._lookup[j].get(value, UNSEEN_CODE) if isinstance(value, str) else UNSEEN_CODE
+                if code == UNSEEN_CODE and not _missing(value):
+                    unseen.append((start + i, j, value))
+                codes[i, j] = code
+
+    def _encode_frame(self, frame, out, start, unseen):
+        out["numeric"] = frame[NUMERIC_COLUMNS].to_numpy(dtype=np.float64)
+        codes = out["codes"]
+        for j, field in enumerate(CATEGORICAL_COLUMNS):
+            column = pd.Categorical(frame[field], categories=CATEGORIES[field]).codes
+            outside = np.flatnonzero(column < 0)
+            codes[:, j] = np.where(column < 0, UNSEEN_CODE, column)
+            values = frame[field].to_numpy()
+            for i in outside:
+                if not _missing(values[i]):
+                    unseen.append((start + int(i), j, values[i]))
+
+    def _write_rows(self, rows, unseen):
+        days = (rows["time"] // SECONDS_PER_DAY).astype(np.int64)
+        for day in np.unique(days):
+            index = np.flatnonzero(days == day)
+            part = rows[index]
+            out = self._open(_day(day * SECONDS_PER_DAY), part.nbytes)
+            if unseen:
+                # Batch row -> row of this file; the side table is written first,
+                # so a row on disk never lacks its values
+                position = dict(zip(index.tolist(), range(self._file_rows, self._file_rows + len(index))))
+                lines = [json.dumps({"row": position[i], "field": CATEGORICAL_COLUMNS[j], "value": _plain(value)})
+                         for i, j, value in unseen if i in position]
+                if lines:
+                    self._side_table().write("\n".join(lines) + "\n")
+                    self._unseen.flush()
+            out.write(part.tobytes())
+            out.flush()
+            self._file_rows += len(part)
+            self.rows += len(part)
+            self.writes += 1
+
+    def _open(self, day, nbytes):
+        # Current file, or a new part for a new day or the size limit
+        if (self._file is not None and self._file_day == day
+                and self._file.tell() + nbytes <= self.max_file_bytes):
+            return self._file
+        self._close_file()
+        prefix = os.path.join(self.directory, f"audit-{day}-{os.getpid()}-")
+        part = 0
+        while os.path.exists(f"{prefix}{part:03d}.bin"):
+            part += 1
+        path = f"{prefix}{part:03d}.bin"
+        self._file = open(path, "xb")
+        self._file.write(_header())
+        self._file_day = day
+        self._file_rows = 0
+        self.files.append(path)
+        return self._file
+
+    def _side_table(self):
+        # Opened on the first unseen value, so most files have none
+        if self._unseen is None:
+            self._unseen = open(self.files[-1] + UNSEEN_SUFFIX, "a", encoding="utf-8")
+        return self._unseen
+
+    def _close_file(self):
+        for f in (self._file, self._unseen):
+            if f is not None:
+                f.close()
+        self._file = self._unseen = None
+
+    def close(self):
+        """Stop the writer thread after a final flush."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._thread.join()
+        self.flush()
+        with self._write_lock:
+            self._close_file()
+
+    def stats(self):
+        return {"rows": self.rows, "writes": self.writes, "pending": self.pending,
+                "errors": self.errors, "file": self.files[-1] if self.files else None}
+
+
+# =============================
+# Reader
+# =============================
+def read_header(path):
+    with open(path, "rb") as f:
+        raw = f.read(HEADER_BYTES)
+    if not raw.startswith(MAGIC):
+        raise ValueError(f"{path} is not an audit log")
+    header = json.loads(raw[len(MAGIC):])
+    if header["format"] != FORMAT_VERSION or header["record_bytes"] != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} has an unsupported audit format")
+    return header
+
+
+def read_unseen(path, n):
+    """Side table entries of one log file that belong to its first n rows."""
+    if not os.path.exists(path + UNSEEN_SUFFIX):
+        return []
+    entries = []
+    with open(path + UNSEEN_SUFFIX, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break            # Partial last line of a crash mid-write
+            if entry["row"] < n:
+                entries.append(entry)
+    return entries
+
+
+def read_log(path):
+    """(rows, header) of one log file; rows is a read-only memmap of RECORD_DTYPE.
+
+    header["unseen"] holds the file's side table, for `decode`.
+    """
+    header = read_header(path)
+    # A crash mid-write can leave a partial last record; it is ignored
+    n = (os.path.getsize(path) - HEADER_BYTES) // RECORD_DTYPE.itemsize
+    header["unseen"] = read_unseen(path, n)
+    if n == 0:
+        return np.empty(0, dtype=RECORD_DTYPE), header
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_BYTES, shape=(n,)), header
+
+
+def day_files(directory=AUDIT_DIR, day=None):
+    """Log files of one UTC day ("2026-10-17" or "20261017"; default today)."""
+    day = _day(time.time()) if day is None else day.replace("-", "")
+    return sorted(glob.glob(os.path.join(directory, f"audit-{day}-*.bin")))
+
+
+def read_day(directory=AUDIT_DIR, day=None):
+    """Every row of one day as one RECORD_DTYPE array, in time order."""
+    parts = [read_log(path)[0] for path in day_files(directory, day)]
+    if not parts:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    rows = parts[0] if len(parts) == 1 else np.concatenate(parts)
+    return rows[np.argsort(rows["time"], kind="stable")]
+
+
+def decode(rows, header):
+    """DataFrame of raw field values plus the logged answer for the rows of one file.
+
+    `rows` and `header` are what read_log returns (the side table rows count
+    from the start of the file).
+    """
+    frame = pd.DataFrame({"time": pd.to_datetime(rows["time"], unit="s", utc=True)})
+    for j, name in enumerate(header["numeric_columns"]):
+        frame[name] = rows["numeric"][:, j]
+    unseen = {}
+    for entry in header.get("unseen", ()):
+        unseen.setdefault(entry["field"], []).append((entry["row"], entry["value"]))
+    for j, field in enumerate(header["categorical_columns"]):
+        categories = list(header["categories"][field])
+        codes = rows["codes"][:, j].astype(np.int32)
+        # UNSEEN_CODE rows are missing values unless the side table has them
+        codes[codes >= len(categories)] = -1
+        if field in unseen:
+            extra = {}
+            for row, value in unseen[field]:
+                codes[row] = len(categories) + extra.setdefault(value, len(extra))
+            categories += list(extra)
+        frame[field] = pd.Categorical.from_codes(codes, categories=categories)
+    frame["model_version"] = rows["model_version"].astype(str)
+    frame["prediction"] = rows["prediction"]
+    frame["probability_yes"] = rows["probability"]
+    return frame
+
+
+def read_day_frame(directory=AUDIT_DIR, day=None):
+    """Decoded DataFrame of one day (each file has its own side table, so each is decoded on its own)."""
+    frames = [decode(*read_log(path)) for path in day_files(directory, day)]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).sort_values("time", kind="stable", ignore_index=True)
+
+
+# =============================
+# CLI entry point
+# =============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a day of the prediction audit log.")
+    parser.add_argument("directory", nargs="?", default=AUDIT_DIR)
+    parser.add_argument("--day", default=None, help="UTC day, e.g. 2026-10-17 (default: today)")
+    parser.add_argument("--head", type=int, default=0, help="Also print the first N decoded rows")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = read_day(args.directory, args.day)
+    elapsed = time.perf_counter() - start
+    files = day_files(args.directory, args.day)
+    print(f"{len(rows):,} predictions in {len(files)} file(s), loaded in {elapsed * 1000:.1f} ms")
+    if len(rows):
+        versions, counts = np.unique(rows["model_version"].astype(str), return_counts=True)
+        print("model versions: " + ", ".join(f"{v} ({c:,})" for v, c in zip(versions, counts)))
+        proba = rows["probability"][np.isfinite(rows["probability"])]
+        # Models without probabilities log NaN
+        mean = f"{proba.mean():.3f}" if len(proba) else "n/a"
+        print(f"predicted yes: {np.mean(rows['prediction'] == 1):.1%}, mean P(yes): {mean}")
+    if args.head:
+        print(read_day_frame(args.directory, args.day).head(args.head).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
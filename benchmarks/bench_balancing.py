@@ -0,0 +1,116 @@
+"""bench_balancing.py – Resampled copies vs class weights for training
+-------------------------------------------------------------------
+The raw rows are split into train and holdout first, so both approaches are
+judged on the same clients they never saw:
+
+    resample   the notebook's balancing on the training rows (half of the
+               majority, minority drawn with replacement to the same count)
+    weights    every training row once, training.balanced_sample_weight
+
+For each estimator, the table reports:
+- the fit time
+- the traced peak memory of building the training matrix and fitting it
+- holdout recall and precision
+
+"notebook" shows the recall the notebook reports: it resamples first and
+splits afterwards, so copies of the same minority rows sit in both halves.
+"search" times training.halving_search on the RandomForest grid (smaller
+forests, cold cache) for both approaches.
+
+Usage (from the repository root):
+    python benchmarks/bench_balancing.py --data bank-additional.csv
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import precision_score, recall_score
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import training  # noqa: E402
+from dataset_cache import balance_indices, notebook_columns, read_raw  # noqa: E402
+from features import FeatureEncoder  # noqa: E402
+from model_artifact import scaling_from_raw_data  # noqa: E402
+
+ESTIMATORS = {
+    "forest": RandomForestClassifier(n_estimators=300, max_depth=10, min_samples_split=5, random_state=0),
+    "logistic": LogisticRegression(max_iter=300),
+}
+
+
+def fit(estimator, X, y, rows, weights):
+    """(fitted estimator, seconds, traced peak MB) of materializing X[rows] and fitting it."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    X_fit, y_fit = X[rows], y[rows]
+    model = clone(estimator).fit(X_fit, y_fit, sample_weight=weights)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return model, seconds, peak
+
+
+def search_seconds(X, y, weights, n_jobs):
+    grid = dict(training.PARAM_GRIDS[RandomForestClassifier], model__n_estimators=[20, 30, 40])
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        training.halving_search(RandomForestClassifier(random_state=0), grid, X, y, n_jobs=n_jobs,
+                                cache_dir=cache_dir, verbose=False, sample_weight=weights)
+        return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data", default="bank-additional.csv")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--no-search", action="store_true", help="Skip the grid search timing")
+    args = parser.parse_args(argv)
+
+    raw = read_raw(args.data)
+    scale, low = scaling_from_raw_data(args.data)
+    X = FeatureEncoder(notebook_columns(raw), scale, low).encode_frame(raw)
+    y = (raw["y"].astype(str) == "yes").to_numpy(dtype=np.int64)
+    train, holdout = train_test_split(np.arange(len(y)), test_size=training.TEST_SIZE,
+                                      random_state=training.SPLIT_RANDOM_STATE, stratify=y)
+
+    resampled = train[balance_indices(y[train])]
+    weights = training.balanced_sample_weight(y[train])
+    print(f"{len(train):,} training rows ({y[train].mean():.1%} yes), holdout {len(holdout):,}; "
+          f"resampled training set {len(resampled):,} rows")
+    print(f"{'model':>9} {'balance':>9} {'rows':>7} {'fit s':>7} {'peak MB':>8} {'recall':>7} {'precision':>10}")
+    for name, estimator in ESTIMATORS.items():
+        for label, rows, w in (("resample", resampled, None), ("weights", train, weights)):
+            model, seconds, peak = fit(estimator, X, y, rows, w)
+            pred = model.predict(X[holdout])
+            print(f"{name:>9} {label:>9} {len(rows):>7,} {seconds:>7.2f} {peak:>8.1f} "
+                  f"{recall_score(y[holdout], pred):>7.3f} {precision_score(y[holdout], pred):>10.3f}")
+
+    # The notebook's order: balance everything, then split the copies
+    everything = balance_indices(y)
+    nb_train, nb_test = train_test_split(everything, test_size=training.TEST_SIZE,
+                                         random_state=training.SPLIT_RANDOM_STATE)
+    model = clone(ESTIMATORS["forest"]).fit(X[nb_train], y[nb_train])
+    seen = np.isin(nb_test, nb_train)
+    print(f"notebook: forest recall on its own test split {recall_score(y[nb_test], model.predict(X[nb_test])):.3f}; "
+          f"{seen.mean():.1%} of those test rows are copies of training rows")
+
+    if not args.no_search:
+        X_train, y_train = X[train], y[train]
+        t_resample = search_seconds(X[resampled], y[resampled], None, args.n_jobs)
+        t_weights = search_seconds(X_train, y_train, weights, args.n_jobs)
+        print(f"search (RF grid, 20-40 trees): resample {t_resample:.1f}s, weights {t_weights:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
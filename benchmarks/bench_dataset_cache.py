@@ -0,0 +1,73 @@
+"""bench_dataset_cache.py – cleaned_data.csv vs the binary columnar cache
+----------------------------------------------------------------------
+Compares file size and load time of the notebook's CSV path against
+dataset_cache.py, optionally on a replicated copy of the data to mimic larger
+extracts. "matrix" is the time until a training-ready float32 feature matrix
+exists.
+
+Usage (from the repository root):
+    python benchmarks/bench_dataset_cache.py --replicate 100
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dataset_cache  # noqa: E402
+from mapped_arrays import write_arrays  # noqa: E402
+
+
+def best_of(fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--raw", default=dataset_cache.RAW_DATA_PATH)
+    parser.add_argument("--replicate", type=int, default=1, help="Stack the data this many times")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        binary = os.path.join(tmp, "cleaned_data.bin")
+        csv = os.path.join(tmp, "cleaned_data.csv")
+        dataset_cache.build_dataset(args.raw, binary)
+
+        if args.replicate > 1:
+            arrays, meta = dataset_cache.open_dataset(binary)
+            arrays = {k: np.tile(v, args.replicate) for k, v in arrays.items()}
+            write_arrays(binary, arrays, meta)
+
+        # The notebook's text format, written the way the notebook writes it
+        X, y = dataset_cache.load_dataset(binary)
+        frame = X.astype({c: np.float64 for c in X.columns if X[c].dtype == np.float32})
+        frame.insert(10, "y", y.to_numpy())
+        frame.to_csv(csv, index=False)
+        del X, y, frame
+
+        t_csv = best_of(lambda: pd.read_csv(csv))
+        t_csv_matrix = best_of(lambda: pd.read_csv(csv).drop(columns="y").to_numpy(np.float32))
+        t_map = best_of(lambda: dataset_cache.open_dataset(binary))
+        t_map_matrix = best_of(lambda: dataset_cache.load_dataset(binary)[0].to_numpy(np.float32))
+
+        rows = len(dataset_cache.open_dataset(binary)[0]["y"])
+        print(f"{rows:,} rows")
+        print(f"{'format':>8} {'size MB':>9} {'open s':>9} {'matrix s':>9}")
+        print(f"{'csv':>8} {os.path.getsize(csv) / 2**20:>9.2f} {t_csv:>9.4f} {t_csv_matrix:>9.4f}")
+        print(f"{'binary':>8} {os.path.getsize(binary) / 2**20:>9.2f} {t_map:>9.4f} {t_map_matrix:>9.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
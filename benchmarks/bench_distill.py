@@ -0,0 +1,73 @@
+"""bench_distill.py – Tiered (student + full model) scoring vs the full model
+-------------------------------------------------------------------------
+Scores every row of bank-additional.csv with the full model and with the
+TieredScorer and reports how often they agree, how many rows escalate, and
+the latency of single rows (as the form and call routing send them) and
+throughput of batches.
+
+Usage (from the repository root):
+    python benchmarks/bench_distill.py --model model_artifact.pkl --student student_model.pkl
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset_cache import read_raw  # noqa: E402
+from distill import TieredScorer  # noqa: E402
+from model_artifact import load_artifact  # noqa: E402
+
+
+def per_row_us(score, X, rows):
+    times = np.empty(len(rows))
+    for i, r in enumerate(rows):
+        start = time.perf_counter()
+        score(X[r:r + 1])
+        times[i] = time.perf_counter() - start
+    return np.percentile(times, [50, 99]) * 1e6
+
+
+def rows_per_s(score, X, batch, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for i in range(0, len(X), batch):
+            score(X[i:i + batch])
+        best = min(best, time.perf_counter() - start)
+    return len(X) / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="model_artifact.pkl")
+    parser.add_argument("--student", default="student_model.pkl")
+    parser.add_argument("--data", default="bank-additional.csv")
+    parser.add_argument("--sample", type=int, default=1000, help="Rows timed one by one")
+    args = parser.parse_args(argv)
+
+    teacher = load_artifact(args.model)
+    tiered = TieredScorer(load_artifact(args.student), teacher)
+    X = teacher.transform(read_raw(args.data))
+
+    full = teacher.predict_encoded(X)
+    fast = tiered.predict_encoded(X)
+    stats = tiered.stats()
+    print(f"{len(X):,} rows; agreement with the full model {np.mean(full == fast):.2%}, "
+          f"escalated {stats['escalation_rate']:.1%} (margin {tiered.margin:.3f})")
+
+    rows = np.random.default_rng(0).choice(len(X), min(args.sample, len(X)), replace=False)
+    print(f"{'':>8} {'p50 us/row':>11} {'p99 us/row':>11} {'rows/s @1':>10} {'rows/s @100':>12} {'rows/s @all':>12}")
+    for name, score in [("full", teacher.predict_proba_encoded), ("tiered", tiered.predict_proba_encoded)]:
+        p50, p99 = per_row_us(score, X, rows)
+        print(f"{name:>8} {p50:>11.1f} {p99:>11.1f} {rows_per_s(score, X[:2000], 1, 1):>10.0f} "
+              f"{rows_per_s(score, X, 100):>12.0f} {rows_per_s(score, X, len(X)):>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
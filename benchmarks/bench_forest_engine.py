@@ -0,0 +1,68 @@
+"""bench_forest_engine.py – sklearn vs CompiledForest
+--------------------------------------------------
+Checks that the compiled engine reproduces sklearn's predict_proba bit for
+bit on real rows from bank-additional.csv, then times both across batch
+sizes from 1 to 100k rows.
+
+Usage (from the repository root):
+    python benchmarks/bench_forest_engine.py --model best_model.pkl
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forest_engine import CompiledForest  # noqa: E402
+from model_artifact import load_artifact  # noqa: E402
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+
+
+def best_time(fn, X, min_seconds=0.5, max_repeats=200):
+    # Best of several repeats; small batches get more repeats
+    best, total, repeats = float("inf"), 0.0, 0
+    while total < min_seconds and repeats < max_repeats:
+        start = time.perf_counter()
+        fn(X)
+        elapsed = time.perf_counter() - start
+        best, total, repeats = min(best, elapsed), total + elapsed, repeats + 1
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default=None, help="Model artifact or estimator pickle")
+    parser.add_argument("--data", default="bank-additional.csv")
+    args = parser.parse_args(argv)
+
+    artifact = load_artifact(args.model)
+    engine = CompiledForest.from_estimator(artifact.estimator)
+    base = artifact.transform(pd.read_csv(args.data, sep=";"))
+
+    # Bit-for-bit check on every real row
+    reference = artifact.estimator.predict_proba(base)
+    compiled = engine.predict_proba(base)
+    identical = np.array_equal(reference, compiled)
+    print(f"{engine.n_trees} trees, max depth {engine.max_depth}, "
+          f"{len(engine.feature):,} nodes; bit-for-bit identical: {identical}")
+    if not identical:
+        return 1
+
+    print(f"{'batch':>8} {'sklearn ms':>12} {'engine ms':>12} {'speedup':>8} {'engine rows/s':>14}")
+    rng = np.random.default_rng(0)
+    for size in BATCH_SIZES:
+        X = base[rng.integers(0, len(base), size)]
+        t_sk = best_time(artifact.estimator.predict_proba, X)
+        t_cf = best_time(engine.predict_proba, X)
+        print(f"{size:>8,} {t_sk * 1e3:>12.3f} {t_cf * 1e3:>12.3f} {t_sk / t_cf:>7.1f}x {size / t_cf:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""bench_incremental.py – Incremental forest updates vs a full rebuild
+-------------------------------------------------------------------
+bank-additional.csv is in contact-date order, so it is split in time: a base
+model is trained on the oldest rows, a number of "daily" batches follow, and
+the newest rows are the holdout. After the batches arrive, three models are
+compared on the holdout:
+
+    base         never updated
+    incremental  incremental.update_artifact after every batch
+    rebuild      refitted from scratch on base + all batches (same
+                 hyperparameters; the grid search of training.py comes on top)
+
+Usage (from the repository root):
+    python benchmarks/bench_incremental.py --model best_model.pkl --batches 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import precision_score, recall_score
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import incremental  # noqa: E402
+from dataset_cache import balance_indices, read_raw  # noqa: E402
+from model_artifact import ModelArtifact, load_artifact  # noqa: E402
+
+
+def fit_full(template, X, y):
+    estimator = clone(template)
+    rows = balance_indices(y)
+    return estimator.fit(X[rows], y[rows])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="best_model.pkl", help="Supplies the hyperparameters and encoder")
+    parser.add_argument("--raw", default="bank-additional.csv")
+    parser.add_argument("--base-fraction", type=float, default=0.6)
+    parser.add_argument("--batches", type=int, default=5)
+    parser.add_argument("--batch-fraction", type=float, default=0.04)
+    parser.add_argument("--trees", type=int, default=incremental.NEW_TREES)
+    parser.add_argument("--window", type=int, default=incremental.WINDOW_ROWS)
+    args = parser.parse_args(argv)
+
+    template = load_artifact(args.model)
+    raw = read_raw(args.raw)
+    X_all = template.transform(raw)
+    y_all = incremental.target_vector(raw)
+
+    n = len(raw)
+    base_end = int(n * args.base_fraction)
+    bounds = [base_end + int(n * args.batch_fraction) * i for i in range(args.batches + 1)]
+    holdout = slice(bounds[-1], n)
+
+    start = time.perf_counter()
+    base = ModelArtifact(template.encoder, fit_full(template.estimator, X_all[:base_end], y_all[:base_end]))
+    t_base = time.perf_counter() - start
+
+    current, update_times = base, []
+    for i in range(args.batches):
+        # What the history window holds after this batch has been appended
+        window = raw.iloc[max(0, bounds[i + 1] - args.window):bounds[i + 1]]
+        start = time.perf_counter()
+        current = incremental.update_artifact(current, window, args.trees, random_state=i)
+        update_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    rebuilt = ModelArtifact(template.encoder,
+                            fit_full(template.estimator, X_all[:bounds[-1]], y_all[:bounds[-1]]))
+    t_rebuild = time.perf_counter() - start
+
+    X_hold, y_hold = X_all[holdout], y_all[holdout]
+    print(f"base {base_end:,} rows, {args.batches} batches of {bounds[1] - bounds[0]:,}, "
+          f"holdout {len(y_hold):,} rows ({y_hold.mean():.1%} yes)")
+    print(f"{'model':>12} {'fit s':>8} {'recall':>8} {'precision':>10}")
+    for name, artifact, seconds in [("base", base, t_base),
+                                    ("incremental", current, float(np.mean(update_times))),
+                                    ("rebuild", rebuilt, t_rebuild)]:
+        pred = artifact.predict_encoded(X_hold)
+        print(f"{name:>12} {seconds:>8.2f} {recall_score(y_hold, pred):>8.3f} "
+              f"{precision_score(y_hold, pred, zero_division=0):>10.3f}")
+    print("(incremental: mean time per update)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""bench_model_load.py – Pickle vs memory-mapped model loading
+-----------------------------------------------------------
+Loads the same model from the pickled artifact and from the memory-mapped
+format, each in a fresh interpreter, and reports load time and resident
+memory (total RSS, plus the private anonymous part that every worker process
+pays again versus the file-backed part the OS shares between processes).
+
+Usage (from the repository root, Linux only because of /proc):
+    python benchmarks/bench_model_load.py --model best_model.pkl
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Runs in a child interpreter so every measurement starts from a cold process
+PROBE = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+import numpy as np
+from model_artifact import load_artifact
+
+def memory():
+    fields = {{}}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                fields[key] = int(value.split()[0]) / 1024
+    return fields
+
+before = memory()
+start = time.perf_counter()
+artifact = load_artifact({path!r})
+load_seconds = time.perf_counter() - start
+loaded = memory()
+start = time.perf_counter()
+artifact.predict_proba_encoded(np.zeros((1, artifact.encoder.n_features)))
+first_predict = time.perf_counter() - start
+after = memory()
+print(json.dumps({{"load_s": load_seconds, "first_predict_s": first_predict,
+                  "before": before, "loaded": loaded, "after": after}}))
+"""
+
+
+def probe(path):
+    out = subprocess.run([sys.executable, "-c", PROBE.format(root=ROOT, path=path)],
+                         check=True, capture_output=True, text=True, cwd=ROOT)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="best_model.pkl", help="Model artifact or estimator pickle")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    from model_artifact import load_artifact
+
+    artifact = load_artifact(os.path.abspath(args.model))
+    with tempfile.TemporaryDirectory() as tmp:
+        pickled = os.path.join(tmp, "model_artifact.pkl")
+        mapped = os.path.join(tmp, "model.forest")
+        if artifact.estimator is not None:
+            artifact.save(pickled)
+        artifact.save_mapped(mapped)
+
+        print(f"{'format':>8} {'size MB':>8} {'load ms':>9} {'1st pred ms':>12} "
+              f"{'RSS MB':>8} {'anon MB':>8} {'file MB':>8}")
+        for label, path in (("pickle", pickled), ("mapped", mapped)):
+            if not os.path.exists(path):
+                continue
+            runs = [probe(path) for _ in range(args.repeats)]
+            best = min(runs, key=lambda r: r["load_s"])
+            mem = best["after"]
+            grown = {k: mem[k] - best["before"][k] for k in mem}
+            print(f"{label:>8} {os.path.getsize(path) / 2**20:>8.1f} {best['load_s'] * 1e3:>9.1f} "
+                  f"{best['first_predict_s'] * 1e3:>12.2f} {grown['VmRSS']:>8.1f} "
+                  f"{grown['RssAnon']:>8.1f} {grown['RssFile']:>8.1f}")
+    print("Memory columns are growth over the interpreter with numpy/pandas imported; "
+          "the pickle load also pays the sklearn import it triggers.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""bench_reruns.py – Streamlit rerun latency of the prediction form under load
+---------------------------------------------------------------------------
+Starts `streamlit run app.py` and drives N concurrent browser sessions over
+Streamlit's websocket protocol: each session opens the welcome page, clicks
+"Begin Prediction", then presses "Predict" repeatedly with varying inputs.
+Reports the time from sending a rerun to the server's script_finished, the
+bytes sent back and the server CPU time per rerun (Linux /proc), i.e. what a
+user waits for, what is re-rendered and what each click costs the server.
+
+Usage (from the repository root):
+    python benchmarks/bench_reruns.py --sessions 1 8 32 --submits 20
+    # Compare against an older app.py, run from a directory with its files:
+    python benchmarks/bench_reruns.py --app /tmp/old/app.py --cwd /tmp/old
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetStates
+from websockets.asyncio.client import connect
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_service import wait_for_port  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FINISHED_EARLY_FOR_RERUN = 2
+
+
+class Session:
+    """One simulated browser tab."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets = {}      # widget id -> (element type, label, fragment id)
+
+    async def rerun(self, states=None, fragment_id=""):
+        """Send a rerun and wait for it (and any st.rerun it triggers) to finish."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        if states is not None:
+            msg.rerun_script.widget_states.CopyFrom(states)
+        msg.rerun_script.fragment_id = fragment_id
+        if not fragment_id:
+            self.widgets = {}  # A full rerun may switch pages
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        received = 0
+        while True:
+            raw = await self.ws.recv()
+            received += len(raw)
+            fm = ForwardMsg()
+            fm.ParseFromString(raw)
+            kind = fm.WhichOneof("type")
+            if kind == "delta" and fm.delta.WhichOneof("type") == "new_element":
+                element = fm.delta.new_element
+                sub = getattr(element, element.WhichOneof("type"))
+                if getattr(sub, "id", ""):
+                    self.widgets[sub.id] = (element.WhichOneof("type"), sub.label, fm.delta.fragment_id)
+            elif kind == "script_finished" and fm.script_finished != FINISHED_EARLY_FOR_RERUN:
+                return time.perf_counter() - start, received
+
+    def find(self, wanted):
+        for wid, (kind, label, fragment) in self.widgets.items():
+            if label == wanted:
+                return wid, kind, fragment
+        raise KeyError(f"No widget labelled {wanted!r}; the app may not have loaded")
+
+    def click(self, button_label, values=()):
+        """Widget states for pressing a button, plus (label, int value) inputs."""
+        states = WidgetStates()
+        button, _, fragment = self.find(button_label)
+        state = states.widgets.add()
+        state.id = button
+        state.trigger_value = True
+        for label, value in values:
+            state = states.widgets.add()
+            state.id = self.find(label)[0]
+            state.int_value = value
+        return states, fragment
+
+
+async def run_session(url, submits, distinct, seed):
+    rng = random.Random(seed)
+    async with connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        session = Session(ws)
+        await session.rerun()
+        await session.rerun(*session.click("🚀 Begin Prediction"))
+        timings = []
+        for _ in range(submits):
+            # A handful of distinct profiles, so repeats exercise the memo/cache
+            duration = 60 * rng.randrange(distinct)
+            states, fragment = session.click("🔮 Predict", [("Duration of Last Contact (seconds)", duration)])
+            timings.append(await session.rerun(states, fragment))
+        return timings
+
+
+def cpu_seconds(pid):
+    # utime + stime of the server process, in clock ticks
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def run_level(url, sessions, submits, distinct, server_pid):
+    start = time.perf_counter()
+    cpu_start = cpu_seconds(server_pid)
+    results = await asyncio.gather(*(run_session(url, submits, distinct, i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    cpu = cpu_seconds(server_pid) - cpu_start
+    seconds = np.array([t for r in results for t, _ in r]) * 1000.0
+    sizes = np.array([b for r in results for _, b in r])
+    return {
+        "sessions": sessions,
+        "reruns": len(seconds),
+        "reruns_per_s": len(seconds) / elapsed,
+        "p50_ms": float(np.percentile(seconds, 50)),
+        "p95_ms": float(np.percentile(seconds, 95)),
+        "p99_ms": float(np.percentile(seconds, 99)),
+        "kb_per_rerun": float(sizes.mean() / 1024),
+        # Includes the two page-opening runs per session
+        "server_cpu_ms_per_rerun": cpu * 1000.0 / len(seconds),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--cwd", default=ROOT, help="Directory to run the app from (model files)")
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--submits", type=int, default=20, help="Predict clicks per session")
+    parser.add_argument("--distinct", type=int, default=5, help="Distinct input profiles per session")
+    args = parser.parse_args(argv)
+
+    cmd = [sys.executable, "-m", "streamlit", "run", os.path.abspath(args.app),
+           "--server.port", str(args.port), "--server.headless", "true",
+           "--browser.gatherUsageStats", "false"]
+    server = subprocess.Popen(cmd, cwd=args.cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port("127.0.0.1", args.port)
+        url = f"ws://127.0.0.1:{args.port}/_stcore/stream"
+        asyncio.run(run_level(url, 1, 2, 1, server.pid))   # Warm-up: loads the model
+        print(f"{'sessions':>8} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'KB/rerun':>9} {'CPU ms/rerun':>13}")
+        for n in args.sessions:
+            r = asyncio.run(run_level(url, n, args.submits, args.distinct, server.pid))
+            print(f"{n:>8} {r['reruns_per_s']:>9.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+                  f"{r['p99_ms']:>8.1f} {r['kb_per_rerun']:>9.1f} {r['server_cpu_ms_per_rerun']:>13.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
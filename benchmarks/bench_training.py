@@ -0,0 +1,73 @@
+"""bench_training.py – Serial grid search vs training.halving_search
+-----------------------------------------------------------------
+Times the notebook's serial GridSearchCV against the parallel successive-
+halving search in training.py (cold cache), a rerun of it (warm cache), and
+the parallel search without halving, on the RandomForest grid.
+
+Usage (from the repository root):
+    python benchmarks/bench_training.py            # full notebook grid
+    python benchmarks/bench_training.py --quick    # smaller forests, same grid shape
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.ensemble import RandomForestClassifier  # noqa: E402
+from sklearn.model_selection import GridSearchCV, StratifiedKFold  # noqa: E402
+from sklearn.pipeline import Pipeline  # noqa: E402
+
+import training  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data", default=training.CLEANED_DATA_PATH)
+    parser.add_argument("--quick", action="store_true", help="Use 20/30/40 trees instead of 200/300/400")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args(argv)
+
+    X, y = training.load_cleaned_data(args.data)
+    x_train, _, y_train, _ = training.split_data(X, y)
+    grid = dict(training.PARAM_GRIDS[RandomForestClassifier])
+    if args.quick:
+        grid["model__n_estimators"] = [20, 30, 40]
+    model = RandomForestClassifier(random_state=0)
+    n_candidates = len(training.expand_grid(grid))
+    print(f"{n_candidates} candidates x {training.N_SPLITS} folds, {len(x_train):,} training rows, "
+          f"{os.cpu_count()} CPUs")
+
+    results = []
+
+    start = time.perf_counter()
+    cv = StratifiedKFold(n_splits=training.N_SPLITS, random_state=training.CV_RANDOM_STATE, shuffle=True)
+    search = GridSearchCV(Pipeline(steps=[("model", model)]), grid, cv=cv, scoring="recall")
+    search.fit(x_train, y_train)
+    results.append(("serial GridSearchCV (notebook)", time.perf_counter() - start, search.best_params_))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label, halving in (("parallel halving, cold cache", True),
+                               ("parallel halving, warm cache", True)):
+            start = time.perf_counter()
+            best, _ = training.halving_search(model, grid, x_train, y_train, halving=halving,
+                                              n_jobs=args.n_jobs, cache_dir=cache_dir, verbose=False)
+            results.append((label, time.perf_counter() - start, best))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        best, _ = training.halving_search(model, grid, x_train, y_train, halving=False,
+                                          n_jobs=args.n_jobs, cache_dir=cache_dir, verbose=False)
+        results.append(("parallel full grid", time.perf_counter() - start, best))
+
+    baseline = results[0][1]
+    for label, seconds, best in results:
+        print(f"{label:<32} {seconds:>8.1f}s {baseline / seconds:>6.1f}x  {best}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
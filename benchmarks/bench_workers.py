@@ -0,0 +1,99 @@
+"""bench_workers.py – Scoring service throughput and memory vs worker count
+----------------------------------------------------------------------
+Starts `scoring_service.py --workers N` for every N, drives it with
+concurrent keep-alive clients (spread over several client processes so the
+load generator is not the bottleneck), and reports throughput, latency and
+the memory of the workers (Linux /proc): rss counts the shared model pages
+in every worker, pss splits them, private is what each extra worker costs.
+"independent" is one standalone service process for comparison, i.e. the
+cost of a full model copy per process.
+
+Usage (from the repository root):
+    python benchmarks/bench_workers.py --model model_artifact.pkl --workers 1 2 4 8 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import load_service  # noqa: E402
+from worker_pool import memory_usage  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(p) for p in f.read().split()]
+
+
+def client_process(job):
+    port, data, concurrency, duration = job
+    bodies = load_service.load_bodies(data)
+    return asyncio.run(load_service.run_load("127.0.0.1", port, bodies, concurrency, duration))
+
+
+def run_level(args, workers, port):
+    cmd = [sys.executable, os.path.join(ROOT, "scoring_service.py"), "--port", str(port),
+           "--workers", str(workers)] + (["--model", args.model] if args.model else [])
+    server = subprocess.Popen(cmd, cwd=args.cwd, stderr=subprocess.DEVNULL)
+    try:
+        load_service.wait_for_port("127.0.0.1", port, timeout=120.0)
+        per_proc = max(1, args.concurrency // args.client_procs)
+        jobs = [(port, args.data, per_proc, args.duration)] * args.client_procs
+        with Pool(args.client_procs) as pool:
+            pool.map(client_process, [(port, args.data, per_proc, 1.0)] * args.client_procs)  # Warm-up
+            results = pool.map(client_process, jobs)
+        pids = children(server.pid) if workers > 1 else [server.pid]
+        memory = [memory_usage(pid) for pid in pids]
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        "workers": workers,
+        "throughput_rps": sum(r["throughput_rps"] for r in results),
+        "p50_ms": float(np.mean([r["p50_ms"] for r in results])),
+        "p99_ms": max(r["p99_ms"] for r in results),
+        "errors": sum(r["errors"] for r in results),
+        "rss_mb": float(np.mean([m["rss_mb"] for m in memory])),
+        "pss_mb": float(np.mean([m["pss_mb"] for m in memory])),
+        "private_mb": float(np.mean([m["private_mb"] for m in memory])),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default=None, help="Model file passed to the service")
+    parser.add_argument("--data", default=os.path.join(ROOT, "bank-additional.csv"))
+    parser.add_argument("--cwd", default=ROOT, help="Directory to run the service from (model files)")
+    parser.add_argument("--port", type=int, default=8650)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent connections in total")
+    parser.add_argument("--client-procs", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    print(f"{os.cpu_count()} CPUs, {args.concurrency} connections from {args.client_procs} client process(es)")
+    print(f"{'workers':>10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} "
+          f"{'rss MB':>8} {'pss MB':>8} {'private MB':>11}")
+    for i, workers in enumerate(args.workers):
+        r = run_level(args, workers, args.port + i)
+        name = "independent" if workers == 1 else str(workers)
+        print(f"{name:>10} {r['throughput_rps']:>9.0f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+              f"{r['errors']:>7} {r['rss_mb']:>8.1f} {r['pss_mb']:>8.1f} {r['private_mb']:>11.1f}")
+        time.sleep(0.5)
+    print("(memory columns: mean per worker)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
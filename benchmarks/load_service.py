@@ -0,0 +1,148 @@
+"""load_service.py – Concurrent load generator for scoring_service.py
+------------------------------------------------------------------
+Opens N keep-alive connections, each sending single-client /predict requests
+built from bank-additional.csv rows back to back for a fixed duration, and
+reports throughput and p50/p95/p99 latency.
+
+Usage (from the repository root):
+    python benchmarks/load_service.py --spawn --concurrency 1 8 32 --max-wait-ms 0 2 5
+    python benchmarks/load_service.py --url http://127.0.0.1:8502 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_bodies(path, n=2000):
+    frame = pd.read_csv(path, sep=";", nrows=n).drop(columns=["y"], errors="ignore")
+    return [json.dumps(record).encode("utf-8") for record in frame.to_dict("records")]
+
+
+async def client(host, port, bodies, offset, stop_at, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = offset
+    try:
+        while time.perf_counter() < stop_at:
+            body = bodies[i % len(bodies)]
+            i += 1
+            request = (f"POST /predict HTTP/1.1\r\nHost: {host}\r\n"
+                       f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if b" 200 " not in status:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, bodies, concurrency, duration):
+    latencies, errors = [], []
+    start = time.perf_counter()
+    stop_at = start + duration
+    await asyncio.gather(*(client(host, port, bodies, k * 97, stop_at, latencies, errors)
+                           for k in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    lat = np.array(latencies) * 1e3
+    return {
+        "concurrency": concurrency,
+        "requests": len(lat),
+        "errors": len(errors),
+        "throughput_rps": len(lat) / elapsed,
+        "p50_ms": float(np.percentile(lat, 50)) if len(lat) else float("nan"),
+        "p95_ms": float(np.percentile(lat, 95)) if len(lat) else float("nan"),
+        "p99_ms": float(np.percentile(lat, 99)) if len(lat) else float("nan"),
+    }
+
+
+def wait_for_port(host, port, timeout=30.0):
+    async def attempt():
+        _, writer = await asyncio.open_connection(host, port)
+        writer.close()
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            asyncio.run(attempt())
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Service on {host}:{port} did not come up")
+
+
+def format_row(label, r):
+    return (f"{label:>14} {r['concurrency']:>6} {r['requests']:>9,} {r['errors']:>6} "
+            f"{r['throughput_rps']:>10,.0f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+
+
+HEADER = (f"{'setting':>14} {'conc':>6} {'requests':>9} {'errors':>6} "
+          f"{'req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8502")
+    parser.add_argument("--spawn", action="store_true", help="Start scoring_service.py for every --max-wait-ms setting")
+    parser.add_argument("--model", default=None, help="Model passed to the spawned service")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, nargs="+", default=[2.0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per measurement")
+    parser.add_argument("--data", default=os.path.join(ROOT, "bank-additional.csv"))
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    url = urlparse(args.url)
+    bodies = load_bodies(args.data)
+    results = []
+    print(HEADER)
+    settings = args.max_wait_ms if args.spawn else [None]
+    for wait in settings:
+        proc = None
+        if args.spawn:
+            cmd = [sys.executable, os.path.join(ROOT, "scoring_service.py"), "--host", url.hostname,
+                   "--port", str(url.port), "--max-batch-size", str(args.max_batch_size),
+                   "--max-wait-ms", str(wait)]
+            if args.model:
+                cmd += ["--model", args.model]
+            proc = subprocess.Popen(cmd, cwd=ROOT, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(url.hostname, url.port)
+            for concurrency in args.concurrency:
+                r = asyncio.run(run_load(url.hostname, url.port, bodies, concurrency, args.duration))
+                r["max_wait_ms"] = wait
+                results.append(r)
+                print(format_row("external" if wait is None else f"wait={wait:g}ms", r))
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""run_benchmarks.py – Prediction path benchmark suite
+---------------------------------------------------
+Measures the whole prediction path and writes the results as flat JSON
+metrics, then checks them against regression thresholds:
+
+    cold_start.*    model load time and memory in a fresh interpreter
+    single_row.*    per-stage latency of one form submission, for the
+                    original path (53-key dict -> pd.DataFrame -> sklearn
+                    predict) and the current one (encoder -> engine -> cache)
+    batch.*         encode and predict throughput across batch sizes, one-hot
+                    and compact category codes (bytes per row included)
+    whatif.*        latency of a 100 x 100 what-if sweep (whatif.py)
+    explain.*       feature contributions of one row and of a batch (explain.py)
+    drift.*         cost of counting one row / a chunk in the drift monitor
+                    (drift_monitor.py), added to every prediction
+    audit.*         cost of queueing one prediction for the audit log on the
+                    predict path, and the background writer's rows/s
+                    (audit_log.py)
+    service.*       p50/p95/p99 and req/s of N concurrent clients against a
+                    locally started scoring_service.py
+    memory.*        peak RSS of this benchmark process
+
+Usage (from the repository root):
+    python benchmarks/run_benchmarks.py --model best_model.pkl --output bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json   # also flag >20% slowdowns
+
+Exit status is 1 when any threshold (benchmarks/thresholds.json) or baseline
+comparison fails.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import bench_model_load  # noqa: E402
+import load_service  # noqa: E402
+from audit_log import AuditLogger  # noqa: E402
+from drift_monitor import DriftMonitor, build_reference  # noqa: E402
+from features import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS  # noqa: E402
+from model_artifact import load_artifact, resolve_model_path  # noqa: E402
+from prediction_cache import PredictionCache  # noqa: E402
+import whatif  # noqa: E402
+
+THRESHOLDS_PATH = os.path.join(HERE, "thresholds.json")
+BATCH_SIZES = [1, 100, 10_000, 100_000]
+
+
+# =============================
+# Timing helpers
+# =============================
+def per_call(fn, min_seconds=0.3, max_calls=100_000):
+    """Median seconds per call over repeated timed groups."""
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed > 0.02 or calls >= max_calls:
+            break
+        calls *= 4
+    samples = []
+    deadline = time.perf_counter() + min_seconds
+    while time.perf_counter() < deadline or len(samples) < 5:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter() - start) / calls)
+    return float(np.median(samples))
+
+
+def legacy_dict(record, columns):
+    # The original create_interface(): one single-element list per training column
+    data = {name: [record[name]] for name in NUMERIC_COLUMNS}
+    for name in columns:
+        for field in CATEGORICAL_COLUMNS:
+            if name.startswith(field + "_"):
+                data[name] = [1 if record[field] == name[len(field) + 1:] else 0]
+    return data
+
+
+# =============================
+# Benchmark sections
+# =============================
+def bench_cold_start(artifact, metrics):
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"mapped": os.path.join(tmp, "model.forest")}
+        if artifact.engine is not None:
+            artifact.save_mapped(paths["mapped"])
+        else:
+            del paths["mapped"]
+        if artifact.estimator is not None:
+            paths["pickle"] = os.path.join(tmp, "model_artifact.pkl")
+            artifact.save(paths["pickle"])
+        for label, path in paths.items():
+            run = min((bench_model_load.probe(path) for _ in range(3)), key=lambda r: r["load_s"])
+            metrics[f"cold_start.{label}_load_ms"] = run["load_s"] * 1e3
+            metrics[f"cold_start.{label}_first_predict_ms"] = run["first_predict_s"] * 1e3
+            metrics[f"cold_start.{label}_rss_mb"] = run["after"]["VmRSS"] - run["before"]["VmRSS"]
+            metrics[f"cold_start.{label}_private_mb"] = run["after"]["RssAnon"] - run["before"]["RssAnon"]
+
+
+def bench_single_row(artifact, record, metrics):
+    encoder = artifact.encoder
+    row = encoder.encode_row(record)
+    X = row.reshape(1, -1)
+
+    if artifact.estimator is not None:
+        data = legacy_dict(record, encoder.columns)
+        frame = pd.DataFrame(data)[encoder.columns]
+        metrics["single_row.legacy_dict_us"] = per_call(lambda: legacy_dict(record, encoder.columns)) * 1e6
+        metrics["single_row.legacy_dataframe_us"] = per_call(lambda: pd.DataFrame(data)) * 1e6
+        metrics["single_row.legacy_sklearn_predict_ms"] = per_call(lambda: artifact.estimator.predict(frame)) * 1e3
+
+    buffer = np.zeros(encoder.n_features)
+    metrics["single_row.encode_us"] = per_call(lambda: encoder.encode_row(record, buffer)) * 1e6
+    metrics["single_row.predict_ms"] = per_call(lambda: artifact.predict_encoded(X)) * 1e3
+    cache = PredictionCache()
+    cache.get_or_compute(row, lambda r: artifact.predict_encoded(r.reshape(1, -1))[0])
+    metrics["single_row.cache_hit_us"] = per_call(
+        lambda: cache.get_or_compute(row, lambda r: artifact.predict_encoded(r.reshape(1, -1))[0])) * 1e6
+    metrics["single_row.total_ms"] = per_call(
+        lambda: artifact.predict_encoded(encoder.encode_row(record, buffer).reshape(1, -1))) * 1e3
+
+
+def bench_batches(artifact, raw, metrics):
+    rng = np.random.default_rng(0)
+    for size in BATCH_SIZES:
+        frame = raw.iloc[rng.integers(0, len(raw), size)].reset_index(drop=True)
+        X = artifact.transform(frame)
+        t_encode = per_call(lambda: artifact.transform(frame), min_seconds=0.2)
+        t_predict = per_call(lambda: artifact.predict_proba_encoded(X), min_seconds=0.2)
+        metrics[f"batch.{size}.encode_rows_per_s"] = size / t_encode
+        metrics[f"batch.{size}.predict_rows_per_s"] = size / t_predict
+        # Compact category-code path (batch_score.py)
+        block = artifact.transform_coded(frame)
+        t_encode = per_call(lambda: artifact.transform_coded(frame), min_seconds=0.2)
+        t_predict = per_call(lambda: artifact.predict_proba_coded(block), min_seconds=0.2)
+        metrics[f"batch.{size}.coded_encode_rows_per_s"] = size / t_encode
+        metrics[f"batch.{size}.coded_predict_rows_per_s"] = size / t_predict
+        metrics[f"batch.{size}.coded_bytes_per_row"] = block.nbytes / size
+
+
+def bench_whatif(artifact, record, metrics):
+    values = np.linspace(*whatif.field_range(artifact.encoder, "duration"), 100).round()
+    values2 = np.linspace(*whatif.field_range(artifact.encoder, "euribor3m"), 100)
+    metrics["whatif.100x100_ms"] = per_call(
+        lambda: whatif.sweep(artifact, record, "duration", values, "euribor3m", values2)) * 1e3
+
+
+def bench_explain(artifact, raw, record, metrics):
+    explainer = artifact.explainer
+    if explainer is None:
+        return
+    x = artifact.transform(record)
+    metrics["explain.single_row_ms"] = per_call(lambda: explainer.top_reasons(x, [record])) * 1e3
+    X = artifact.transform(raw.iloc[:10_000])
+    metrics["explain.batch_rows_per_s"] = len(X) / per_call(lambda: explainer.contributions(X), min_seconds=0.2)
+
+
+def bench_drift(data_path, raw, record, metrics):
+    monitor = DriftMonitor(build_reference(data_path))
+    metrics["drift.update_us"] = per_call(lambda: monitor.update_record(record)) * 1e6
+    metrics["drift.frame_rows_per_s"] = len(raw) / per_call(lambda: monitor.update_frame(raw), min_seconds=0.2)
+    metrics["drift.report_ms"] = per_call(monitor.report) * 1e3
+
+
+def bench_audit(artifact, raw, record, metrics):
+    with tempfile.TemporaryDirectory() as directory:
+        audit = AuditLogger(directory, flush_interval=3600)   # Writes only when flushed below
+        metrics["audit.log_us"] = per_call(lambda: audit.log_one(artifact, record, 1, 0.5)) * 1e6
+        audit.flush()
+        records = raw.drop(columns="y", errors="ignore").to_dict("records")
+        for r in records:
+            audit.log_one(artifact, r, 0, 0.0)
+        start = time.perf_counter()
+        audit.flush()
+        metrics["audit.write_rows_per_s"] = len(records) / (time.perf_counter() - start)
+        audit.close()
+
+
+def bench_service(model_path, concurrency, duration, metrics):
+    port = 8600 + os.getpid() % 1000
+    cmd = [sys.executable, os.path.join(ROOT, "scoring_service.py"), "--port", str(port), "--model", model_path]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        load_service.wait_for_port("127.0.0.1", port)
+        bodies = load_service.load_bodies(os.path.join(ROOT, "bank-additional.csv"))
+        for n in concurrency:
+            r = asyncio.run(load_service.run_load("127.0.0.1", port, bodies, n, duration))
+            for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "errors"):
+                metrics[f"service.c{n}.{key}"] = r[key]
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+# =============================
+# Regression checks
+# =============================
+def check(metrics, thresholds, baseline=None, tolerance=0.2):
+    """List of human-readable failures; empty when everything passes.
+
+    thresholds: {metric: {"max": x} or {"min": x}}. With a baseline, metrics
+    named *_ms/*_us/*_mb may not grow and *_per_s/*_rps may not shrink by
+    more than `tolerance`.
+    """
+    failures = []
+    for name, limit in thresholds.items():
+        if name not in metrics:
+            continue
+        value = metrics[name]
+        if "max" in limit and value > limit["max"]:
+            failures.append(f"{name} = {value:.4g} exceeds max {limit['max']}")
+        if "min" in limit and value < limit["min"]:
+            failures.append(f"{name} = {value:.4g} below min {limit['min']}")
+    for name, old in (baseline or {}).items():
+        new = metrics.get(name)
+        if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or old <= 0:
+            continue
+        if name.endswith(("_ms", "_us", "_mb")) and new > old * (1 + tolerance):
+            failures.append(f"{name} regressed {old:.4g} -> {new:.4g}")
+        if name.endswith(("_per_s", "_rps")) and new < old * (1 - tolerance):
+            failures.append(f"{name} regressed {old:.4g} -> {new:.4g}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default=None, help="Model file (default: what the app would load)")
+    parser.add_argument("--data", default=os.path.join(ROOT, "bank-additional.csv"))
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH)
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown vs baseline")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per load-test level")
+    parser.add_argument("--skip", nargs="*", default=[], choices=["cold_start", "single_row", "batch", "whatif", "explain", "drift", "audit", "service"])
+    args = parser.parse_args(argv)
+
+    model_path = os.path.abspath(args.model or os.path.join(ROOT, resolve_model_path()))
+    artifact = load_artifact(model_path)
+    raw = pd.read_csv(args.data, sep=";")
+    record = raw.iloc[0].to_dict()
+
+    metrics = {}
+    sections = [
+        ("cold_start", lambda: bench_cold_start(artifact, metrics)),
+        ("single_row", lambda: bench_single_row(artifact, record, metrics)),
+        ("batch", lambda: bench_batches(artifact, raw, metrics)),
+        ("whatif", lambda: bench_whatif(artifact, record, metrics)),
+        ("explain", lambda: bench_explain(artifact, raw, record, metrics)),
+        ("drift", lambda: bench_drift(args.data, raw, record, metrics)),
+        ("audit", lambda: bench_audit(artifact, raw, record, metrics)),
+        ("service", lambda: bench_service(model_path, args.concurrency, args.duration, metrics)),
+    ]
+    for name, run in sections:
+        if name in args.skip:
+            continue
+        start = time.perf_counter()
+        run()
+        print(f"{name} done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    metrics["memory.peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "model_version": artifact.version,
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "metrics": metrics,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+    for name in sorted(metrics):
+        print(f"{name:<44} {metrics[name]:>14.4f}")
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["metrics"]
+    failures = check(metrics, thresholds, baseline, args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION: {failure}", file=sys.stderr)
+    print(f"Results written to {args.output}; {len(failures)} regression(s)", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
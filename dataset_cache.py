@@ -0,0 +1,175 @@
+"""dataset_cache.py – Binary columnar cache of the cleaned training data
+---------------------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: The notebook writes the preprocessed data to cleaned_data.csv as
+             text and every training run parses it again. This stage reads
+             bank-additional.csv with explicit dtypes, runs the same encoding,
+             scaling and class balancing as the notebook, and stores every
+             column as a raw array in a memory-mappable file (see
+             mapped_arrays.py): float32 scaled numerics, a uint8 target and
+             one uint8 category code per categorical field instead of the
+             notebook's 43 one-hot columns. The one-hot layout sklearn
+             trains on is expanded from the codes when the data is loaded.
+
+Usage:
+    python dataset_cache.py bank-additional.csv cleaned_data.bin
+"""
+
+# =============================
+# Imports
+# =============================
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from features import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, CodedBlock, FeatureEncoder
+from mapped_arrays import is_mapped_file, open_arrays, write_arrays
+
+# =============================
+# Constants
+# =============================
+RAW_DATA_PATH = "bank-additional.csv"
+DATASET_PATH = "cleaned_data.bin"
+TARGET = "y"
+RESAMPLE_RANDOM_STATE = 123   # Same seed as the notebook's balancing step
+
+# Explicit dtypes for the raw file: no type inference, small integers, float32
+RAW_DTYPES = {
+    **{c: "category" for c in CATEGORICAL_COLUMNS + [TARGET]},
+    "age": np.int16, "duration": np.int32, "campaign": np.int16,
+    "pdays": np.int16, "previous": np.int16,
+    "emp.var.rate": np.float32, "cons.price.idx": np.float32, "cons.conf.idx": np.float32,
+    "euribor3m": np.float32, "nr.employed": np.float32,
+}
+
+
+# =============================
+# Preprocessing
+# =============================
+def read_raw(path=RAW_DATA_PATH):
+    # The floats are parsed as float64 first so scaling sees the exact same
+    # values as the notebook; they are stored as float32 only after scaling
+    dtypes = {c: (np.float64 if d == np.float32 else d) for c, d in RAW_DTYPES.items()}
+    return pd.read_csv(path, sep=";", dtype=dtypes)
+
+
+def notebook_columns(raw):
+    """The column order the notebook's get_dummies(drop_first=True) produces."""
+    columns = list(NUMERIC_COLUMNS)
+    for field in CATEGORICAL_COLUMNS:
+        values = sorted(raw[field].astype(str).unique())
+        columns += [f"{field}_{v}" for v in values[1:]]
+    return columns
+
+
+def balance_indices(y, random_state=RESAMPLE_RANDOM_STATE):
+    """Row order of the notebook's data_resampled, as indices into the raw rows.
+
+    Half of the majority class without replacement, followed by the minority
+    class oversampled with replacement to the same size.
+    """
+    from sklearn.utils import resample
+
+    majority = np.flatnonzero(y == 0)
+    minority = np.flatnonzero(y == 1)
+    n = int(len(majority) * 0.5)
+    minority_over = resample(minority, replace=True, n_samples=n, random_state=random_state)
+    majority_under = resample(majority, replace=False, n_samples=n, random_state=random_state)
+    return np.concatenate([majority_under, minority_over])
+
+
+def build_dataset(raw_path=RAW_DATA_PATH, out_path=DATASET_PATH, balance=True):
+    """Encode, scale and (optionally) balance the raw data and write the cache."""
+    from model_artifact import scaling_from_raw_data
+
+    raw = read_raw(raw_path)
+    columns = notebook_columns(raw)
+    scale, low = scaling_from_raw_data(raw_path)
+    encoder = FeatureEncoder(columns, scale, low)
+    block = encoder.encode_codes(raw)
+    y = (raw[TARGET].astype(str) == "yes").to_numpy(dtype=np.uint8)
+
+    rows = balance_indices(y) if balance else np.arange(len(raw))
+    arrays = {name: block.numeric[rows, j] for j, name in enumerate(NUMERIC_COLUMNS)}
+    arrays.update({field: block.codes[rows, j] for j, field in enumerate(CATEGORICAL_COLUMNS)})
+    arrays[TARGET] = y[rows]
+
+    write_arrays(out_path, arrays, {
+        "columns": columns,
+        "categories": encoder.category_codes,
+        "target": TARGET,
+        "numeric_scale": scale.tolist(),
+        "numeric_min": low.tolist(),
+        "balanced": bool(balance),
+        "source": raw_path,
+    })
+    return len(rows)
+
+
+# =============================
+# Loading
+# =============================
+def open_dataset(path=DATASET_PATH):
+    """Memory-map the cache: returns ({column: array view}, meta)."""
+    return open_arrays(path)
+
+
+def load_dataset(path=DATASET_PATH):
+    """(X, y) like load_cleaned_data, built from the mapped columns.
+
+    X is a DataFrame with the training column order. Its float32 numerics
+    train the tree models exactly like the float64 CSV values, because trees
+    split on float32 anyway. The linear models (LogisticRegression,
+    LinearSVC) see the values rounded to float32 (relative error below 6e-8),
+    so their coefficients can differ from a CSV run in the last digits; train
+    from cleaned_data.csv to reproduce those bit for bit. sklearn's
+    estimators have no categorical splits, so the one-hot columns are
+    expanded from the codes here, as uint8.
+    """
+    arrays, meta = open_dataset(path)
+    columns = {}
+    for name in meta["columns"]:
+        if name in arrays or "categories" not in meta:   # Numerics, or a one-hot cache
+            columns[name] = arrays[name]
+            continue
+        field = next(f for f in CATEGORICAL_COLUMNS if name.startswith(f + "_"))
+        code = meta["categories"][field].index(name[len(field) + 1:])
+        columns[name] = (arrays[field] == code).view(np.uint8)
+    X = pd.DataFrame(columns, copy=False)
+    y = pd.Series(arrays[meta["target"]], name=meta["target"])
+    return X, y
+
+
+def load_coded(path=DATASET_PATH):
+    """(CodedBlock, y) of the cache: the compact layout, for scoring and evaluation."""
+    arrays, meta = open_dataset(path)
+    if "categories" not in meta:
+        raise ValueError(f"{path} stores one-hot columns; rebuild it with dataset_cache.py")
+    numeric = np.column_stack([arrays[name] for name in NUMERIC_COLUMNS])
+    codes = np.column_stack([arrays[field] for field in CATEGORICAL_COLUMNS])
+    return CodedBlock(numeric, codes), arrays[meta["target"]]
+
+
+def is_dataset_file(path):
+    return is_mapped_file(path)
+
+
+# =============================
+# CLI entry point
+# =============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the binary columnar training data cache.")
+    parser.add_argument("raw", nargs="?", default=RAW_DATA_PATH, help="Raw data (bank-additional.csv)")
+    parser.add_argument("out", nargs="?", default=DATASET_PATH, help="Output file (default: cleaned_data.bin)")
+    parser.add_argument("--no-balance", action="store_true", help="Keep every raw row once, unbalanced")
+    args = parser.parse_args(argv)
+
+    n = build_dataset(args.raw, args.out, balance=not args.no_balance)
+    print(f"Wrote {n:,} rows to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
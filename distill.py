@@ -0,0 +1,320 @@
+"""distill.py – Distilled student model and tiered scoring
+-------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: A compact "student" (a shallow decision tree or a logistic
+             model on the SelectFromModel-selected features) is trained to
+             reproduce the full forest's probabilities. The TieredScorer
+             answers with the student when its probability is far enough
+             from the decision boundary and escalates only the uncertain rows
+             to the full model. The confidence margin is calibrated on held
+             out rows so that confident answers agree with the full model at
+             least `--agreement` of the time.
+
+Usage:
+    python distill.py --model model_artifact.pkl --out student_model.pkl
+    python scoring_service.py --student student_model.pkl
+"""
+
+# =============================
+# Imports
+# =============================
+import argparse
+import sys
+
+import numpy as np
+from sklearn.feature_selection import SelectFromModel
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeClassifier
+
+from dataset_cache import read_raw
+from model_artifact import ARTIFACT_PATH, RAW_DATA_PATH, ModelArtifact, load_artifact
+
+# =============================
+# Constants
+# =============================
+STUDENT_PATH = "student_model.pkl"
+STUDENT_DEPTH = 8            # Eight comparisons per row; deeper escalates less
+TARGET_AGREEMENT = 0.995     # Confident student answers must match the teacher this often
+AUGMENT_FACTOR = 4           # Synthetic rows per real row, labelled by the teacher
+CALIBRATION_FRACTION = 0.25  # Real rows held out to calibrate the margin
+RANDOM_STATE = 0
+
+
+# =============================
+# Student model
+# =============================
+class FeatureMask:
+    """Fixed column selection as a pipeline step (SelectFromModel without the model).
+
+    Has get_support, so forest_engine folds it into the compiled tree.
+    """
+
+    def __init__(self, support):
+        self.support = np.asarray(support, dtype=bool)
+        self.n_features_in_ = len(self.support)
+
+    def get_support(self, indices=False):
+        return np.flatnonzero(self.support) if indices else self.support
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return np.asarray(X)[:, self.support]
+
+
+def selected_features(estimator):
+    """Support mask of the teacher's SelectFromModel step, or an equivalent one.
+
+    The notebook's tuned model has no selector, so the notebook's
+    SelectFromModel default (importance above the mean) is applied to the
+    fitted forest itself.
+    """
+    steps = estimator.steps if isinstance(estimator, Pipeline) else [("model", estimator)]
+    for _, step in steps[:-1]:
+        if hasattr(step, "get_support"):
+            return step.get_support()
+    final = steps[-1][1]
+    if not hasattr(final, "feature_importances_"):
+        raise ValueError(f"Cannot select features for {type(final).__name__}; it has no importances")
+    return SelectFromModel(final, prefit=True).get_support()
+
+
+def augment_records(frame, n_rows, rng):
+    """Synthetic rows: every column sampled independently from its observed values.
+
+    Covers value combinations the real rows never show (e.g. what a user can
+    type into the form), so the student also matches the teacher there.
+    """
+    picks = {name: frame[name].to_numpy()[rng.integers(0, len(frame), n_rows)] for name in frame.columns}
+    return frame.__class__(picks)
+
+
+def fit_student(X, p_yes, support, kind="tree", depth=STUDENT_DEPTH, random_state=RANDOM_STATE):
+    """Fit a student to the teacher's P(yes) on the selected columns.
+
+    sklearn classifiers do not take soft labels, so every row is given twice,
+    as "yes" with weight p and as "no" with weight 1 - p: the weighted loss is
+    then exactly the cross-entropy against the teacher's probabilities.
+    """
+    n = len(X)
+    Xs = np.concatenate([X, X])
+    ys = np.concatenate([np.ones(n, dtype=np.int64), np.zeros(n, dtype=np.int64)])
+    weights = np.concatenate([p_yes, 1.0 - p_yes])
+    if kind == "tree":
+        model = DecisionTreeClassifier(max_depth=depth, min_samples_leaf=20, random_state=random_state)
+    elif kind == "linear":
+        model = LogisticRegression(max_iter=2000)
+    else:
+        raise ValueError(f"Unknown student kind {kind!r}; use 'tree' or 'linear'")
+    mask = FeatureMask(support)
+    model.fit(mask.transform(Xs), ys, sample_weight=weights)
+    return Pipeline([("select", mask), ("model", model)])
+
+
+def calibrate_margin(p_student, p_teacher, target=TARGET_AGREEMENT):
+    """Smallest |p - 0.5| above which the student agrees with the teacher >= target.
+
+    Returns 0.5 (nothing is confident) if no margin reaches the target.
+    """
+    margin = np.abs(p_student - 0.5)
+    agree = (p_student > 0.5) == (p_teacher > 0.5)
+    order = np.argsort(-margin, kind="stable")
+    rate = np.cumsum(agree[order]) / np.arange(1, len(order) + 1)
+    # Only cut between distinct margins: tree students give many rows the same one
+    sorted_margin = margin[order]
+    boundary = np.append(sorted_margin[1:] != sorted_margin[:-1], True)
+    ok = np.flatnonzero((rate >= target) & boundary)
+    if len(ok) == 0:
+        return 0.5
+    return float(margin[order[ok[-1]]])
+
+
+# =============================
+# Tiered scoring
+# =============================
+class TieredScorer:
+    """Student first, full model for the rows the student is unsure about.
+
+    Has the whole ModelArtifact interface the scoring service, batch scorer
+    and app use: one-hot and coded rows are both scored tiered, while
+    estimator, engine and explainer are the full model's (explanations and
+    what-if margins describe the model the student imitates).
+    """
+
+    def __init__(self, student, teacher):
+        expected = student.metadata.get("teacher_version")
+        if expected != teacher.version:
+            raise ValueError(f"Student was distilled from model {expected}, not {teacher.version}")
+        self.student = student
+        self.teacher = teacher
+        self.encoder = teacher.encoder
+        self.classes_ = teacher.classes_
+        self.version = f"{teacher.version}+{student.version}"
+        self.margin = float(student.metadata["confidence_margin"])
+        self.rows = 0
+        self.escalated = 0
+
+        # Linear students are a single dot product over the full feature row
+        final = student.estimator.steps[-1][1] if student.estimator is not None else None
+        self._linear = None
+        if student.engine is None and hasattr(final, "coef_"):
+            weights = np.zeros(self.encoder.n_features)
+            weights[student.estimator.steps[0][1].support] = final.coef_[0]
+            self._linear = (weights, float(final.intercept_[0]))
+
+    has_proba = True
+
+    @property
+    def columns(self):
+        return self.encoder.columns
+
+    @property
+    def estimator(self):
+        return self.teacher.estimator
+
+    @property
+    def engine(self):
+        return self.teacher.engine
+
+    @property
+    def coded_engine(self):
+        return self.teacher.coded_engine
+
+    @property
+    def explainer(self):
+        return self.teacher.explainer
+
+    def transform(self, data, out=None):
+        return self.teacher.transform(data, out)
+
+    def transform_coded(self, data):
+        return self.teacher.transform_coded(data)
+
+    def student_proba_yes(self, X):
+        if self._linear is not None:
+            weights, bias = self._linear
+            return 1.0 / (1.0 + np.exp(-(X @ weights + bias)))
+        return self.student.predict_proba_encoded(X)[:, 1]
+
+    def _tiered(self, p_yes, escalate):
+        # escalate(rows) gives the teacher's probabilities for those rows
+        proba = np.empty((len(p_yes), 2))
+        proba[:, 1] = p_yes
+        proba[:, 0] = 1.0 - p_yes
+        uncertain = np.flatnonzero(np.abs(p_yes - 0.5) < self.margin)
+        if len(uncertain):
+            proba[uncertain] = escalate(uncertain)
+        self.rows += len(p_yes)
+        self.escalated += len(uncertain)
+        return proba
+
+    def predict_proba_encoded(self, X):
+        return self._tiered(self.student_proba_yes(X), lambda rows: self.teacher.predict_proba_encoded(X[rows]))
+
+    def predict_encoded(self, X):
+        return self.classes_[self.predict_proba_encoded(X).argmax(axis=1)]
+
+    def predict_proba_coded(self, block):
+        p_yes = self.student.predict_proba_coded(block)[:, 1]
+        return self._tiered(p_yes, lambda rows: self.teacher.predict_proba_coded(block[rows]))
+
+    def predict_coded(self, block):
+        return self.classes_[self.predict_proba_coded(block).argmax(axis=1)]
+
+    def predict_proba(self, data):
+        return self.predict_proba_encoded(self.transform(data))
+
+    def predict(self, data):
+        return self.predict_encoded(self.transform(data))
+
+    def stats(self):
+        return {"rows": self.rows, "escalated": self.escalated,
+                "escalation_rate": self.escalated / self.rows if self.rows else 0.0}
+
+
+def load_tiered(student_path=STUDENT_PATH, teacher_path=None):
+    return TieredScorer(load_artifact(student_path), load_artifact(teacher_path))
+
+
+# =============================
+# Distillation
+# =============================
+def distill(teacher, raw, kind="tree", depth=STUDENT_DEPTH, target=TARGET_AGREEMENT,
+            augment=AUGMENT_FACTOR, random_state=RANDOM_STATE):
+    """Train and calibrate a student; returns (student artifact, report dict)."""
+    if teacher.estimator is None:
+        raise ValueError("Distillation needs the teacher's estimator (not the mapped format)")
+    rng = np.random.default_rng(random_state)
+    order = rng.permutation(len(raw))
+    n_calib = int(len(raw) * CALIBRATION_FRACTION)
+    calib, train = raw.iloc[order[:n_calib]], raw.iloc[order[n_calib:]]
+
+    # Real training rows plus synthetic ones, all labelled by the teacher
+    train_frame = train.drop(columns="y", errors="ignore")
+    X_train = np.concatenate([teacher.transform(train_frame),
+                              teacher.transform(augment_records(train_frame, augment * len(train), rng))])
+    p_train = teacher.predict_proba_encoded(X_train)[:, 1]
+
+    support = selected_features(teacher.estimator)
+    estimator = fit_student(X_train, p_train, support, kind, depth, random_state)
+
+    X_calib = teacher.transform(calib)
+    p_teacher = teacher.predict_proba_encoded(X_calib)[:, 1]
+    probe = ModelArtifact(teacher.encoder, estimator)
+    p_student = probe.predict_proba_encoded(X_calib)[:, 1]
+    margin = calibrate_margin(p_student, p_teacher, target)
+
+    confident = np.abs(p_student - 0.5) >= margin
+    student_label = p_student > 0.5
+    teacher_label = p_teacher > 0.5
+    report = {
+        "kind": kind,
+        "selected_features": int(support.sum()),
+        "training_rows": int(len(X_train)),
+        "calibration_rows": int(len(X_calib)),
+        "student_agreement": float((student_label == teacher_label).mean()),
+        "confident_agreement": float((student_label == teacher_label)[confident].mean()) if confident.any() else None,
+        "escalation_fraction": float(1.0 - confident.mean()),
+        "confidence_margin": margin,
+    }
+    student = ModelArtifact(teacher.encoder, estimator, metadata={
+        "teacher_version": teacher.version,
+        "confidence_margin": margin,
+        "selected_columns": [c for c, s in zip(teacher.columns, support) if s],
+        **{k: v for k, v in report.items() if k != "confidence_margin"},
+    })
+    return student, report
+
+
+# =============================
+# CLI entry point
+# =============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Distill the model into a compact student for tiered scoring.")
+    parser.add_argument("--model", default=ARTIFACT_PATH, help="Teacher (model_artifact.pkl or best_model.pkl)")
+    parser.add_argument("--data", default=RAW_DATA_PATH, help="Raw rows to distill on")
+    parser.add_argument("--out", default=STUDENT_PATH)
+    parser.add_argument("--kind", choices=["tree", "linear"], default="tree")
+    parser.add_argument("--depth", type=int, default=STUDENT_DEPTH, help="Depth of a tree student")
+    parser.add_argument("--agreement", type=float, default=TARGET_AGREEMENT,
+                        help="Required agreement of confident student answers with the full model")
+    parser.add_argument("--augment", type=int, default=AUGMENT_FACTOR, help="Synthetic rows per real row")
+    args = parser.parse_args(argv)
+
+    teacher = load_artifact(args.model)
+    student, report = distill(teacher, read_raw(args.data), args.kind, args.depth,
+                              args.agreement, args.augment)
+    student.save(args.out)
+    for key, value in report.items():
+        print(f"{key:>22}: {value}")
+    print(f"Student {student.version} for teacher {teacher.version} saved to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    # Run through the importable module so the pickled student refers to
+    # distill.FeatureMask rather than __main__.FeatureMask
+    import distill
+    sys.exit(distill.main())
@@ -0,0 +1,254 @@
+"""drift_monitor.py – Streaming input-drift monitor
+-----------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Watches whether the clients being scored still look like the
+             training data. A reference profile is computed once from
+             bank-additional.csv (at training time): decile bin edges and bin
+             shares for every numeric field, value shares for every
+             categorical field. Every scored row then increments one
+             counter per field in a fixed-size array, so an update costs a
+             few microseconds and the memory never grows with traffic. The
+             counts are halved whenever `window` rows have been seen (also
+             in the middle of a batch chunk), so the live profile follows
+             roughly the last `window` rows.
+
+             Each field gets a Population Stability Index against the
+             reference: below 0.1 is stable, 0.1 to 0.25 a moderate shift,
+             above 0.25 drift worth a look (and likely a retrain).
+
+Usage:
+    python drift_monitor.py build bank-additional.csv        # writes drift_reference.json
+    python drift_monitor.py check new_calls.csv              # PSI per field for a file
+"""
+
+# =============================
+# Imports
+# =============================
+import argparse
+import bisect
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from features import CATEGORICAL_COLUMNS, CATEGORIES, NUMERIC_COLUMNS
+
+# =============================
+# Constants
+# =============================
+REFERENCE_PATH = "drift_reference.json"
+RAW_DATA_PATH = "bank-additional.csv"
+QUANTILES = 10             # Numeric fields are binned at the reference deciles
+DEFAULT_WINDOW = 10000     # Counts are halved every `window` rows
+SMOOTHING = 1e-4           # Floor for empty bins in the PSI
+PSI_MODERATE = 0.1
+PSI_DRIFT = 0.25
+MIN_ROWS = 100             # Fewer rows than this give no meaningful PSI
+
+
+# =============================
+# Reference profile
+# =============================
+def build_reference(path=RAW_DATA_PATH):
+    """Bin edges and shares of every field in the raw training data (JSON-serialisable)."""
+    frame = pd.read_csv(path, sep=";")
+    numeric = {}
+    for field in NUMERIC_COLUMNS:
+        values = frame[field].to_numpy(dtype=np.float64)
+        # Repeated values (e.g. euribor3m) collapse quantiles, so keep distinct edges
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, QUANTILES + 1)[1:-1]))
+        bins = np.searchsorted(edges, values, side="right")
+        counts = np.bincount(bins, minlength=len(edges) + 1)
+        numeric[field] = {"edges": edges.tolist(), "shares": (counts / counts.sum()).tolist()}
+    categorical = {}
+    for field in CATEGORICAL_COLUMNS:
+        values = CATEGORIES[field]
+        counts = frame[field].astype(str).value_counts()
+        shares = [int(counts.get(v, 0)) for v in values]
+        shares.append(int(len(frame) - sum(shares)))      # Anything outside the vocabulary
+        categorical[field] = {"values": values, "shares": (np.array(shares) / len(frame)).tolist()}
+    return {"source": path, "rows": int(len(frame)), "numeric": numeric, "categorical": categorical}
+
+
+def save_reference(reference, path=REFERENCE_PATH):
+    with open(path, "w") as f:
+        json.dump(reference, f, indent=1)
+
+
+def load_reference(path=REFERENCE_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def psi(live, reference):
+    """Population Stability Index of two share vectors."""
+    live = np.maximum(live, SMOOTHING)
+    reference = np.maximum(reference, SMOOTHING)
+    return float(np.sum((live - reference) * np.log(live / reference)))
+
+
+def status(score, rows=MIN_ROWS):
+    if rows < MIN_ROWS:
+        return "too few rows"
+    if score >= PSI_DRIFT:
+        return "drift"
+    return "moderate" if score >= PSI_MODERATE else "stable"
+
+
+# =============================
+# Streaming monitor
+# =============================
+class DriftMonitor:
+    """Fixed-size per-field counts of scored rows, compared with a reference.
+
+    All fields share one flat list of counts; field i owns the slice
+    counts[offsets[i]:offsets[i + 1]]. A plain list, since bumping 20 Python
+    floats is cheaper than one numpy fancy-index update. Safe to update from
+    several threads.
+    """
+
+    def __init__(self, reference, window=DEFAULT_WINDOW):
+        self.reference = reference
+        self.window = int(window)
+        self.fields = NUMERIC_COLUMNS + CATEGORICAL_COLUMNS
+        self.edges = [reference["numeric"][f]["edges"] for f in NUMERIC_COLUMNS]
+        self.vocabulary = [{v: k for k, v in enumerate(reference["categorical"][f]["values"])}
+                           for f in CATEGORICAL_COLUMNS]
+        sizes = [len(e) + 1 for e in self.edges] + [len(v) + 1 for v in self.vocabulary]
+        self.offsets = [0] + np.cumsum(sizes).tolist()
+        self.expected = [np.asarray(reference["numeric"][f]["shares"]) for f in NUMERIC_COLUMNS] + \
+                        [np.asarray(reference["categorical"][f]["shares"]) for f in CATEGORICAL_COLUMNS]
+        base = len(NUMERIC_COLUMNS)
+        self._numeric = list(zip(NUMERIC_COLUMNS, self.offsets, self.edges))
+        self._categorical = [(field, self.offsets[base + j], vocabulary, len(vocabulary))
+                             for j, (field, vocabulary) in enumerate(zip(CATEGORICAL_COLUMNS, self.vocabulary))]
+        self.counts = [0.0] * self.offsets[-1]
+        self.rows = 0            # Rows ever seen
+        self.pending = 0         # Rows since the counts were last halved
+        self._lock = threading.Lock()
+
+    # ---------- Updates ----------
+    def _slots(self, record):
+        # Flat count index of every field of one record
+        slots = [offset + bisect.bisect_right(edges, record[field]) for field, offset, edges in self._numeric]
+        slots += [offset + vocabulary.get(record[field], other) for field, offset, vocabulary, other in self._categorical]
+        return slots
+
+    def update_record(self, record):
+        """Count one raw record (the form's dict)."""
+        slots = self._slots(record)
+        with self._lock:
+            counts = self.counts
+            for slot in slots:
+                counts[slot] += 1.0
+            self._advance(1)
+
+    def update_records(self, records):
+        for record in records:
+            self.update_record(record)
+
+    def update_frame(self, frame):
+        """Count a raw DataFrame (a batch file chunk) with vectorized binning.
+
+        The rows are added in pieces that end where the counts are due to be
+        halved, so a frame larger than the window decays exactly as if its
+        rows had been counted one at a time.
+        """
+        n = len(frame)
+        if n == 0:
+            return
+        # Flat count index of every field of every row, as _slots() gives for one record
+        slots = np.empty((n, len(self.fields)), dtype=np.intp)
+        for i, (field, offset, edges) in enumerate(self._numeric):
+            slots[:, i] = offset + np.searchsorted(edges, frame[field].to_numpy(dtype=np.float64), side="right")
+        base = len(NUMERIC_COLUMNS)
+        for j, (field, offset, vocabulary, other) in enumerate(self._categorical):
+            codes = pd.Categorical(frame[field], categories=list(vocabulary)).codes.astype(np.intp)
+            slots[:, base + j] = offset + np.where(codes < 0, other, codes)
+        with self._lock:
+            start = 0
+            while start < n:
+                stop = min(n, start + self.window - self.pending)
+                totals = np.bincount(slots[start:stop].ravel(), minlength=len(self.counts))
+                self.counts = (np.asarray(self.counts) + totals).tolist()
+                self._advance(stop - start)
+                start = stop
+
+    def _advance(self, n):
+        self.rows += n
+        self.pending += n
+        if self.pending >= self.window:
+            # Older traffic fades out; memory stays the same
+            self.counts = [c * 0.5 for c in self.counts]
+            self.pending = 0
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0.0] * len(self.counts)
+            self.rows = self.pending = 0
+
+    # ---------- Scores ----------
+    def scores(self):
+        """PSI per field (0.0 for every field before any row was seen)."""
+        with self._lock:
+            counts = np.array(self.counts)
+        result = {}
+        for i, field in enumerate(self.fields):
+            live = counts[self.offsets[i]:self.offsets[i + 1]]
+            total = live.sum()
+            result[field] = psi(live / total, self.expected[i]) if total else 0.0
+        return result
+
+    def report(self):
+        """Fields by PSI, highest first, with their status."""
+        scores = self.scores()
+        fields = sorted(scores, key=scores.get, reverse=True)
+        return {
+            "rows": self.rows,
+            "window": self.window,
+            "fields": {f: {"psi": round(scores[f], 4), "status": status(scores[f], self.rows)} for f in fields},
+        }
+
+
+def load_monitor(path=REFERENCE_PATH, window=DEFAULT_WINDOW):
+    """DriftMonitor for the saved reference, or None when there is none."""
+    if not os.path.exists(path):
+        return None
+    return DriftMonitor(load_reference(path), window)
+
+
+# =============================
+# CLI entry point
+# =============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Input drift against the training distribution.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Compute the reference profile from the training data")
+    build.add_argument("data", nargs="?", default=RAW_DATA_PATH)
+    build.add_argument("--out", default=REFERENCE_PATH)
+    check = sub.add_parser("check", help="PSI per field of a file of calls")
+    check.add_argument("data")
+    check.add_argument("--reference", default=REFERENCE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        reference = build_reference(args.data)
+        save_reference(reference, args.out)
+        print(f"Reference profile of {reference['rows']:,} rows written to {args.out}")
+        return 0
+
+    monitor = DriftMonitor(load_reference(args.reference), window=sys.maxsize)
+    for chunk in pd.read_csv(args.data, sep=";", chunksize=50_000):
+        monitor.update_frame(chunk)
+    report = monitor.report()
+    print(f"{report['rows']:,} rows")
+    for field, entry in report["fields"].items():
+        print(f"{field:>16} {entry['psi']:>8.4f}  {entry['status']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""explain.py – Per-prediction feature contributions for tree models
+-----------------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Exact tree path attributions (Saabas) computed from the compiled
+             forest's node arrays. Every node's expected P(yes) is already
+             stored in the engine (`value`), so the gain of each edge, the
+             child's expectation minus the parent's, is precomputed once per
+             model. Explaining a batch is then one level-by-level walk of all
+             trees at once, adding each edge's gain to the feature its parent
+             split on:
+
+                 P(yes) = bias + sum of the contributions of every feature
+
+             where bias is the forest's mean root expectation (the training
+             base rate). Contributions of the one-hot columns of a field are
+             added up, so "job = student" is reported as one reason.
+
+Usage:
+    python explain.py --model model_artifact.pkl --row 0 --top 5
+"""
+
+# =============================
+# Imports
+# =============================
+import argparse
+import sys
+
+import numpy as np
+
+from features import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS
+from forest_engine import BLOCK_ELEMENTS
+
+# =============================
+# Constants
+# =============================
+FIELDS = NUMERIC_COLUMNS + CATEGORICAL_COLUMNS   # Order of field_contributions columns
+DEFAULT_TOP = 3
+
+
+# =============================
+# Explainer
+# =============================
+class TreeExplainer:
+    """Path contributions to P(classes_[class_index]) for a CompiledForest."""
+
+    def __init__(self, engine, encoder, class_index=1):
+        expected = engine.value[:, class_index]
+        # children[2 * node + went_left] is the next node, so the gain of
+        # taking that edge sits at the same position
+        parent = np.repeat(np.arange(len(expected)), 2)
+        self.edge_gain = expected[engine.children] - expected[parent]
+        self.bias = float(expected[engine.roots].mean())
+        self.engine = engine
+        self.encoder = encoder
+
+        # field -> one-hot layout columns, for the per-field totals
+        self.field_columns = np.zeros((encoder.n_features, len(FIELDS)))
+        for j, name in enumerate(NUMERIC_COLUMNS):
+            self.field_columns[encoder.numeric_index[j], j] = 1.0
+        for j, field in enumerate(CATEGORICAL_COLUMNS):
+            for column in encoder.category_index[field].values():
+                self.field_columns[column, len(NUMERIC_COLUMNS) + j] = 1.0
+
+    def contributions(self, X):
+        """(n_rows, n_features) contributions of every one-hot layout column."""
+        engine = self.engine
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != engine.n_features_in_:
+            raise ValueError(f"Expected rows with {engine.n_features_in_} features, got shape {X.shape}")
+        n_rows, n_features = X.shape
+        out = np.empty((n_rows, n_features))
+        block = max(1, BLOCK_ELEMENTS // engine.n_trees)
+        for start in range(0, n_rows, block):
+            stop = min(start + block, n_rows)
+            out[start:stop] = self._walk(X[start:stop])
+        return out
+
+    def _walk(self, X):
+        # Same traversal as CompiledForest._walk, collecting the edge gains
+        engine = self.engine
+        n_rows, n_features = X.shape
+        values = np.ascontiguousarray(X.T).ravel()
+        offset = engine.feature * n_rows
+        rows = np.arange(n_rows)[np.newaxis, :]
+        slot = rows * n_features                    # Start of each row in the flat result
+        node = np.repeat(engine.roots[:, np.newaxis], n_rows, axis=1)
+        total = np.zeros(n_rows * n_features)
+        for _ in range(engine.max_depth):
+            go_left = values[offset[node] + rows] <= engine.threshold[node]
+            edge = 2 * node + go_left
+            total += np.bincount((slot + engine.feature[node]).ravel(), weights=self.edge_gain[edge].ravel(),
+                                 minlength=total.size)
+            node = engine.children[edge]
+        return total.reshape(n_rows, n_features) / engine.n_trees
+
+    def field_contributions(self, X):
+        """(n_rows, len(FIELDS)) contributions summed per raw field."""
+        return self.contributions(X) @ self.field_columns
+
+    def top_reasons(self, X, records, top=DEFAULT_TOP):
+        """Per row, the `top` fields that raised P(yes) most: [(field, value, contribution), ...].
+
+        `records` are the raw rows of X: a list of records or a DataFrame.
+        """
+        per_field = self.field_contributions(X)
+        order = np.argsort(-per_field, axis=1, kind="stable")[:, :top]
+        if hasattr(records, "columns"):
+            columns = {field: records[field].to_numpy() for field in FIELDS}
+            value = lambda i, field: columns[field][i]
+        else:
+            value = lambda i, field: records[i][field]
+        return [[(FIELDS[j], value(i, FIELDS[j]), float(per_field[i, j])) for j in order[i] if per_field[i, j] > 0]
+                for i in range(len(per_field))]
+
+
+def explainer_for(artifact, class_index=1):
+    """TreeExplainer for a compiled tree artifact, None for other models."""
+    if getattr(artifact, "engine", None) is None:
+        return None
+    return TreeExplainer(artifact.engine, artifact.encoder, class_index)
+
+
+def format_reason(field, value, contribution):
+    return f"{field} = {value} ({contribution:+.3f})"
+
+
+# =============================
+# CLI entry point
+# =============================
+def main(argv=None):
+    from dataset_cache import read_raw
+    from model_artifact import load_artifact
+
+    parser = argparse.ArgumentParser(description="Explain predictions with tree path contributions.")
+    parser.add_argument("--model", default=None, help="Model file (default: model.forest, model_artifact.pkl, best_model.pkl)")
+    parser.add_argument("--data", default="bank-additional.csv")
+    parser.add_argument("--row", type=int, default=0)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    artifact = load_artifact(args.model)
+    explainer = artifact.explainer
+    if explainer is None:
+        print("Only tree models can be explained", file=sys.stderr)
+        return 1
+    record = read_raw(args.data).drop(columns="y", errors="ignore").iloc[args.row].to_dict()
+    X = artifact.transform(record)
+    p_yes = artifact.predict_proba_encoded(X)[0, 1]
+    print(f"P(yes) = {p_yes:.3f} = base rate {explainer.bias:.3f} "
+          f"+ contributions {explainer.contributions(X).sum():+.3f}")
+    per_field = explainer.field_contributions(X)[0]
+    for j in np.argsort(-np.abs(per_field), kind="stable")[:args.top]:
+        print("  " + format_reason(FIELDS[j], record[FIELDS[j]], per_field[j]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
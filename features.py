@@ -0,0 +1,324 @@
+"""features.py – Precompiled feature encoder
+-----------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Turns raw client records (the bank-additional.csv vocabulary)
+             into the one-hot feature layout the model was trained on.
+             The encoder is built once from the training column order and
+             maps every categorical value straight to a column index, so a
+             request only writes a handful of numbers into a preallocated
+             NumPy row instead of building a dict of one-hot lists and a
+             DataFrame.
+
+             Large blocks can also be encoded compactly as a CodedBlock: the
+             ten scaled numerics as float32 plus one uint8 category code per
+             categorical field, 50 bytes per row instead of 53 float64
+             one-hot features (424 bytes). The compiled forest evaluates its
+             one-hot splits on the codes directly (see forest_engine.py).
+"""
+
+# =============================
+# Imports
+# =============================
+import warnings
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# =============================
+# Constants – training vocabulary
+# =============================
+TRAINING_DATA_PATH = "cleaned_data.csv"   # Only the header is read (column order)
+
+NUMERIC_COLUMNS = [
+    "age", "duration", "campaign", "pdays", "previous",
+    "emp.var.rate", "cons.price.idx", "cons.conf.idx", "euribor3m", "nr.employed",
+]
+
+# Every value seen in bank-additional.csv, in display order. The first value
+# in alphabetical order of each field was dropped by get_dummies(drop_first=True)
+# in the notebook, so it encodes to all zeros.
+CATEGORIES = {
+    "job": [
+        "admin.", "blue-collar", "entrepreneur", "housemaid", "management", "retired",
+        "self-employed", "services", "student", "technician", "unemployed", "unknown",
+    ],
+    "marital": ["single", "married", "divorced", "unknown"],
+    "education": [
+        "basic.4y", "basic.6y", "basic.9y", "high.school", "illiterate",
+        "professional.course", "university.degree", "unknown",
+    ],
+    "default": ["no", "yes", "unknown"],
+    "housing": ["no", "yes", "unknown"],
+    "loan": ["no", "yes", "unknown"],
+    "contact": ["cellular", "telephone"],
+    "month": ["mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"],
+    "day_of_week": ["mon", "tue", "wed", "thu", "fri"],
+    "poutcome": ["nonexistent", "failure", "success"],
+}
+CATEGORICAL_COLUMNS = list(CATEGORIES)
+CODED_COLUMNS = NUMERIC_COLUMNS + CATEGORICAL_COLUMNS   # Column order of a CodedBlock
+UNSEEN_CODE = 255   # Code of values outside the vocabulary; matches no one-hot column
+
+
+@contextmanager
+def unnamed_features():
+    """Silence sklearn's "X does not have valid feature names" inside the block.
+
+    Rows are handed to the model as plain arrays whose column order is checked
+    once against the fitted model (see FeatureEncoder.check_model), so that
+    per-call warning is only noise for these calls, and only for these.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="X does not have valid feature names")
+        yield
+
+
+# =============================
+# Compact coded rows
+# =============================
+class CodedBlock:
+    """Rows as scaled float32 numerics plus uint8 category codes.
+
+    `numeric` is (n_rows, len(NUMERIC_COLUMNS)) and `codes` is
+    (n_rows, len(CATEGORICAL_COLUMNS)); code k of a field is the k-th value
+    of FeatureEncoder.category_codes[field]. Supports len() and row indexing
+    like the one-hot blocks do.
+    """
+
+    def __init__(self, numeric, codes):
+        if len(numeric) != len(codes):
+            raise ValueError("numeric and codes must have the same number of rows")
+        self.numeric = numeric
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.numeric)
+
+    def __getitem__(self, rows):
+        return CodedBlock(self.numeric[rows], self.codes[rows])
+
+    @property
+    def nbytes(self):
+        return self.numeric.nbytes + self.codes.nbytes
+
+    @classmethod
+    def concatenate(cls, blocks):
+        return cls(np.concatenate([b.numeric for b in blocks]), np.concatenate([b.codes for b in blocks]))
+
+
+# =============================
+# Encoder
+# =============================
+class FeatureEncoder:
+    """Maps raw records onto the training one-hot layout.
+
+    `columns` is the exact feature order the model was fitted on. Values that
+    have no column (the dropped baseline category, or anything unseen during
+    training) encode to all zeros, the same as the notebook's get_dummies.
+    `numeric_scale`/`numeric_min` are the fitted MinMaxScaler parameters
+    (scale_ and min_, in NUMERIC_COLUMNS order); when given, the numeric
+    fields are scaled in the same pass that writes the one-hot columns.
+    """
+
+    def __init__(self, columns, numeric_scale=None, numeric_min=None):
+        self.columns = list(columns)
+        self.n_features = len(self.columns)
+        n_numeric = len(NUMERIC_COLUMNS)
+        self.numeric_scale = np.ones(n_numeric) if numeric_scale is None else np.asarray(numeric_scale, dtype=np.float64)
+        self.numeric_min = np.zeros(n_numeric) if numeric_min is None else np.asarray(numeric_min, dtype=np.float64)
+        if self.numeric_scale.shape != (n_numeric,) or self.numeric_min.shape != (n_numeric,):
+            raise ValueError(f"Scaling parameters must have one value per numeric column ({n_numeric})")
+        position = {name: i for i, name in enumerate(self.columns)}
+
+        missing = [c for c in NUMERIC_COLUMNS if c not in position]
+        if missing:
+            raise ValueError(f"Training columns are missing numeric features: {missing}")
+        self.numeric_index = np.array([position[c] for c in NUMERIC_COLUMNS], dtype=np.intp)
+        # Python floats for the per-row path (same IEEE doubles, no NumPy scalar overhead)
+        self._numeric_plan = list(zip(NUMERIC_COLUMNS, self.numeric_index.tolist(),
+                                      self.numeric_scale.tolist(), self.numeric_min.tolist()))
+
+        # field -> {value -> column index}; baseline values are simply absent
+        self.category_index = {field: {} for field in CATEGORICAL_COLUMNS}
+        for name, i in position.items():
+            for field in CATEGORICAL_COLUMNS:
+                if name.startswith(field + "_"):
+                    self.category_index[field][name[len(field) + 1:]] = i
+                    break
+
+        covered = len(NUMERIC_COLUMNS) + sum(len(v) for v in self.category_index.values())
+        if covered != self.n_features:
+            raise ValueError("Training columns contain features the encoder does not know about")
+
+        # field -> code vocabulary: the known values in display order, then any
+        # value that only the training columns have; code_columns maps each
+        # code back to its one-hot column (-1 for the dropped baseline)
+        self.category_codes = {}
+        self.code_columns = {}
+        for field, index in self.category_index.items():
+            values = CATEGORIES[field] + [v for v in index if v not in CATEGORIES[field]]
+            if len(values) >= UNSEEN_CODE:
+                raise ValueError(f"Too many categories in {field!r} for uint8 codes")
+            self.category_codes[field] = values
+            self.code_columns[field] = np.array([index.get(v, -1) for v in values], dtype=np.intp)
+
+    @classmethod
+    def from_training_data(cls, path=TRAINING_DATA_PATH, scaler=None):
+        header = pd.read_csv(path, nrows=0).columns
+        return cls.with_scaler([c for c in header if c != "y"], scaler)
+
+    @classmethod
+    def with_scaler(cls, columns, scaler=None):
+        # `scaler` is the MinMaxScaler fitted on NUMERIC_COLUMNS in notebook Step 6
+        if scaler is None:
+            return cls(columns)
+        return cls(columns, scaler.scale_, scaler.min_)
+
+    @classmethod
+    def for_model(cls, model, training_data_path=TRAINING_DATA_PATH):
+        # Use the column order stored on the fitted model when there is one,
+        # otherwise the training data header, and make sure it is the order
+        # the model expects before any row is ever predicted
+        names = getattr(model, "feature_names_in_", None)
+        if names is not None:
+            encoder = cls(names)
+        else:
+            encoder = cls.from_training_data(training_data_path)
+        encoder.check_model(model)
+        return encoder
+
+    def check_model(self, model):
+        names = getattr(model, "feature_names_in_", None)
+        if names is not None and list(names) != self.columns:
+            raise ValueError("Encoder column order does not match the model's training columns")
+        n = getattr(model, "n_features_in_", self.n_features)
+        if n != self.n_features:
+            raise ValueError(f"Model expects {n} features, encoder produces {self.n_features}")
+
+    # ---------- Single rows ----------
+    def encode_row(self, record, out=None):
+        """Encode one record (a mapping of raw field -> value) into `out`."""
+        if out is None:
+            out = np.zeros(self.n_features, dtype=np.float64)
+        else:
+            out[:] = 0.0
+        for name, i, scale, low in self._numeric_plan:
+            out[i] = record[name] * scale + low
+        for field, index in self.category_index.items():
+            i = index.get(record[field])
+            if i is not None:
+                out[i] = 1.0
+        return out
+
+    def encode_records(self, records, out=None):
+        """Encode a sequence of records into a (n_rows, n_features) block."""
+        n = len(records)
+        if out is None:
+            out = np.empty((n, self.n_features), dtype=np.float64)
+        for r, record in enumerate(records):
+            self.encode_row(record, out[r])
+        return out[:n]
+
+    # ---------- Blocks of rows ----------
+    def encode_frame(self, frame, out=None):
+        """Vectorized encoding of a raw DataFrame (e.g. a bank-additional.csv chunk)."""
+        n = len(frame)
+        if out is None:
+            out = np.zeros((n, self.n_features), dtype=np.float64)
+        else:
+            out = out[:n]
+            out[:] = 0.0
+        # Same arithmetic as MinMaxScaler.transform (X *= scale_; X += min_)
+        numeric = frame[NUMERIC_COLUMNS].to_numpy(dtype=np.float64)
+        numeric *= self.numeric_scale
+        numeric += self.numeric_min
+        out[:, self.numeric_index] = numeric
+
+        rows = np.arange(n)
+        for field, index in self.category_index.items():
+            cols = frame[field].map(index).to_numpy(dtype=np.float64, na_value=-1)
+            hit = cols >= 0
+            out[rows[hit], cols[hit].astype(np.intp)] = 1.0
+        return out
+
+    # ---------- Compact coded blocks ----------
+    def encode_codes(self, frame):
+        """CodedBlock of a raw DataFrame; no one-hot matrix is built."""
+        # Scaled in float64 like encode_frame, then stored as the float32 the trees compare
+        numeric = frame[NUMERIC_COLUMNS].to_numpy(dtype=np.float64)
+        numeric *= self.numeric_scale
+        numeric += self.numeric_min
+        codes = np.empty((len(frame), len(CATEGORICAL_COLUMNS)), dtype=np.uint8)
+        for j, field in enumerate(CATEGORICAL_COLUMNS):
+            # Hash lookup of every value; unseen values (and NaN) get code -1
+            found = pd.Categorical(frame[field], categories=self.category_codes[field]).codes
+            codes[:, j] = np.where(found < 0, UNSEEN_CODE, found)
+        return CodedBlock(numeric.astype(np.float32), codes)
+
+    def encode_records_codes(self, records):
+        """CodedBlock of a sequence of records (the per-row path of encode_codes)."""
+        n = len(records)
+        numeric = np.empty((n, len(NUMERIC_COLUMNS)), dtype=np.float64)
+        codes = np.empty((n, len(CATEGORICAL_COLUMNS)), dtype=np.uint8)
+        lookup = [(j, field, {v: k for k, v in enumerate(self.category_codes[field])})
+                  for j, field in enumerate(CATEGORICAL_COLUMNS)]
+        for r, record in enumerate(records):
+            for j, (name, _, scale, low) in enumerate(self._numeric_plan):
+                numeric[r, j] = record[name] * scale + low
+            for j, field, vocabulary in lookup:
+                codes[r, j] = vocabulary.get(record[field], UNSEEN_CODE)
+        return CodedBlock(numeric.astype(np.float32), codes)
+
+    def expand_codes(self, block, out=None, dtype=np.float64):
+        """One-hot matrix of a CodedBlock, for estimators that need the full layout."""
+        n = len(block)
+        if out is None:
+            out = np.zeros((n, self.n_features), dtype=dtype)
+        else:
+            out = out[:n]
+            out[:] = 0
+        out[:, self.numeric_index] = block.numeric
+        rows = np.arange(n)
+        for j, field in enumerate(CATEGORICAL_COLUMNS):
+            # UNSEEN_CODE indexes past the vocabulary, so pad the lookup with -1
+            lookup = np.full(256, -1, dtype=np.intp)
+            lookup[:len(self.code_columns[field])] = self.code_columns[field]
+            cols = lookup[block.codes[:, j]]
+            hit = cols >= 0
+            out[rows[hit], cols[hit]] = 1
+        return out
+
+    def coded_position(self, column):
+        """(position in a CodedBlock row, code or None) of a one-hot layout column."""
+        name = self.columns[column]
+        if name in NUMERIC_COLUMNS:
+            return NUMERIC_COLUMNS.index(name), None
+        for j, field in enumerate(CATEGORICAL_COLUMNS):
+            if name.startswith(field + "_"):
+                code = self.category_codes[field].index(name[len(field) + 1:])
+                return len(NUMERIC_COLUMNS) + j, code
+        raise ValueError(f"Unknown column {name!r}")
+
+    def state(self):
+        # Plain-Python description of the encoder, stored in model artifacts
+        return {
+            "columns": list(self.columns),
+            "numeric_columns": list(NUMERIC_COLUMNS),
+            "numeric_scale": self.numeric_scale.tolist(),
+            "numeric_min": self.numeric_min.tolist(),
+            "category_index": {f: dict(v) for f, v in self.category_index.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        if list(state["numeric_columns"]) != NUMERIC_COLUMNS:
+            raise ValueError("Artifact was built with a different numeric column layout")
+        encoder = cls(state["columns"], state["numeric_scale"], state["numeric_min"])
+        if encoder.category_index != state["category_index"]:
+            raise ValueError("Artifact category vocabulary does not match its columns")
+        return encoder
+
+    def to_frame(self, block):
+        # Only needed for models that insist on DataFrame input
+        return pd.DataFrame(block, columns=self.columns)
@@ -0,0 +1,250 @@
+"""forest_engine.py – Compiled tree-ensemble inference
+---------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Flattens the fitted RandomForest (or single decision tree) from
+             best_model.pkl, together with an optional SelectFromModel mask,
+             into contiguous NumPy node arrays. A batch is then evaluated for
+             all trees at once by walking the trees level by level, which
+             avoids sklearn's per-call validation and per-tree dispatch that
+             dominate small batches. Results are bit-for-bit identical to
+             sklearn's predict_proba / predict.
+
+             A CodedForest scores CodedBlock rows (uint8 category codes, see
+             features.py): one-hot splits are evaluated as "code == k"
+             tests block by block, so large batches never need a one-hot
+             matrix.
+"""
+
+# =============================
+# Imports
+# =============================
+import numpy as np
+
+# =============================
+# Constants
+# =============================
+BLOCK_ELEMENTS = 1 << 16   # trees x rows walked at once; keeps the working set in cache
+
+
+class CompiledForest:
+    """Node arrays for every tree of a fitted forest, concatenated.
+
+    feature/threshold/children/value are indexed by a global node id, with
+    children[2 * node + went_left] giving the next node; leaves point to
+    themselves so a finished row simply stays put while deeper trees keep
+    walking. `value` holds each node's class distribution normalised the
+    way DecisionTreeClassifier.predict_proba does it.
+
+    The engine wins by a wide margin on the small batches the form and the
+    scoring service send; for very large batches sklearn's compiled loop is
+    on par or faster, see benchmarks/bench_forest_engine.py.
+    """
+
+    # Arrays saved by to_arrays() and accepted back by from_arrays()
+    ARRAYS = ("feature", "threshold", "children", "value", "roots", "classes")
+
+    def __init__(self, feature, threshold, children, value, roots, max_depth,
+                 classes, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features)
+        self.n_trees = len(roots)
+
+    @property
+    def left(self):
+        return self.children[1::2]
+
+    @property
+    def right(self):
+        return self.children[0::2]
+
+    # ---------- Building ----------
+    @classmethod
+    def from_estimator(cls, estimator):
+        """Compile a fitted forest, tree or Pipeline ending in one.
+
+        Pipeline steps before the final estimator may only be feature
+        selectors (anything with get_support, e.g. SelectFromModel); their
+        mask is folded into the node feature indices so scoring reads the
+        full feature row directly.
+        """
+        support = None
+        n_features = getattr(estimator, "n_features_in_", None)
+        if hasattr(estimator, "steps"):
+            for name, step in estimator.steps[:-1]:
+                if step is None or step == "passthrough":
+                    continue
+                if not hasattr(step, "get_support"):
+                    raise ValueError(f"Cannot compile pipeline step {name!r} ({type(step).__name__})")
+                selected = np.flatnonzero(step.get_support())
+                support = selected if support is None else support[selected]
+            estimator = estimator.steps[-1][1]
+        if n_features is None:
+            n_features = estimator.n_features_in_
+
+        trees = getattr(estimator, "estimators_", None)
+        if trees is None:
+            if not hasattr(estimator, "tree_"):
+                raise ValueError(f"{type(estimator).__name__} is not a tree model")
+            trees = [estimator]
+        if getattr(estimator, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output classifiers can be compiled")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for tree in trees:
+            t = tree.tree_
+            n = t.node_count
+            ids = np.arange(n)
+            leaf = t.children_left == -1
+
+            feature = np.where(leaf, 0, t.feature)
+            if support is not None:
+                feature = np.where(leaf, 0, support[feature])
+            features.append(feature)
+            thresholds.append(t.threshold)
+            lefts.append(np.where(leaf, ids, t.children_left) + offset)
+            rights.append(np.where(leaf, ids, t.children_right) + offset)
+
+            # DecisionTreeClassifier.predict_proba: proba /= proba.sum(axis=1), 0 -> 1
+            value = t.value[:, 0, :len(estimator.classes_)].astype(np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(value / normalizer)
+
+            roots.append(offset)
+            max_depth = max(max_depth, t.max_depth)
+            offset += n
+
+        children = np.stack([np.concatenate(rights), np.concatenate(lefts)], axis=1)
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            children=np.ascontiguousarray(children.ravel(), dtype=np.intp),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            classes=np.asarray(estimator.classes_),
+            n_features=n_features,
+        )
+
+    # ---------- Persistence ----------
+    def to_arrays(self):
+        arrays = {name: getattr(self, name) for name in self.ARRAYS if name != "classes"}
+        arrays["classes"] = self.classes_
+        meta = {"max_depth": self.max_depth, "n_features": self.n_features_in_}
+        return arrays, meta
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        # The arrays are used as given (e.g. read-only views onto a mapped file)
+        if arrays["feature"].dtype != np.intp or arrays["children"].dtype != np.intp:
+            raise ValueError("Node index arrays were written on a platform with a different pointer size")
+        return cls(arrays["feature"], arrays["threshold"], arrays["children"], arrays["value"],
+                   arrays["roots"], meta["max_depth"], arrays["classes"], meta["n_features"])
+
+    # ---------- Traversal ----------
+    def apply(self, X):
+        """Global leaf id reached in every tree, shape (n_trees, n_rows)."""
+        # sklearn evaluates splits on float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected rows with {self.n_features_in_} features, got shape {X.shape}")
+        n_rows = X.shape[0]
+        leaves = np.empty((self.n_trees, n_rows), dtype=np.intp)
+        block = max(1, BLOCK_ELEMENTS // self.n_trees)
+        for start in range(0, n_rows, block):
+            stop = min(start + block, n_rows)
+            leaves[:, start:stop] = self._walk(X[start:stop])
+        return leaves
+
+    def _walk(self, X):
+        # Column-major copy of the block so a node's feature value is at
+        # feature * n_rows + row
+        return self._walk_values(np.ascontiguousarray(X.T).ravel(), X.shape[0])
+
+    def _walk_values(self, values, n_rows):
+        offset = self.feature * n_rows
+        rows = np.arange(n_rows)[np.newaxis, :]
+        node = np.repeat(self.roots[:, np.newaxis], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            go_left = values[offset[node] + rows] <= self.threshold[node]
+            node = self.children[2 * node + go_left]
+        return node
+
+    # ---------- sklearn-compatible scoring ----------
+    def predict_proba(self, X):
+        leaves = self.apply(X)
+        # RandomForestClassifier adds the trees' probabilities one after the
+        # other and divides once at the end; summing over axis 0 of a C-ordered
+        # array accumulates in that same order
+        proba = self.value[leaves].sum(axis=0)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1), axis=0)
+
+
+class CodedForest(CompiledForest):
+    """A CompiledForest that reads CodedBlock rows instead of one-hot rows.
+
+    Every split on a one-hot column "field_value" is a split on
+    (code == k). Within each cache-sized block the engine evaluates those
+    tests straight from the code array, once per row and column, and walks
+    the unchanged node arrays; the one-hot matrix of the whole batch never
+    exists. Results are bit-for-bit identical to the one-hot forest.
+    """
+
+    def __init__(self, forest, numeric_columns, numeric_source, code_columns, code_field, code_value):
+        super().__init__(forest.feature, forest.threshold, forest.children, forest.value,
+                         forest.roots, forest.max_depth, forest.classes_, forest.n_features_in_)
+        self.numeric_columns = numeric_columns   # one-hot column <- CodedBlock.numeric column
+        self.numeric_source = numeric_source
+        self.code_columns = code_columns         # one-hot column <- (CodedBlock.codes field == value)
+        self.code_field = code_field
+        self.code_value = code_value[:, np.newaxis]
+
+    @classmethod
+    def from_compiled(cls, forest, encoder):
+        """Wrap `forest` (fitted on encoder.columns) to score the encoder's CodedBlocks."""
+        if forest.n_features_in_ != encoder.n_features:
+            raise ValueError("Forest and encoder have different one-hot layouts")
+        numeric, codes = [], []
+        for column in range(encoder.n_features):
+            position, code = encoder.coded_position(column)
+            if code is None:
+                numeric.append((column, position))
+            else:
+                codes.append((column, position - len(encoder.numeric_index), code))
+        numeric, codes = np.array(numeric, dtype=np.intp), np.array(codes, dtype=np.intp)
+        return cls(forest, numeric[:, 0], numeric[:, 1], codes[:, 0], codes[:, 1],
+                   codes[:, 2].astype(np.uint8))
+
+    def apply(self, block):
+        """Global leaf id reached in every tree for a CodedBlock, shape (n_trees, n_rows)."""
+        n_rows = len(block)
+        leaves = np.empty((self.n_trees, n_rows), dtype=np.intp)
+        step = max(1, BLOCK_ELEMENTS // self.n_trees)
+        values = np.empty((self.n_features_in_, min(step, n_rows)), dtype=np.float32)
+        for start in range(0, n_rows, step):
+            stop = min(start + step, n_rows)
+            # Column-major feature values of this block only
+            view = values[:, :stop - start]
+            view[self.numeric_columns] = block.numeric[start:stop, self.numeric_source].T
+            view[self.code_columns] = block.codes[start:stop, self.code_field].T == self.code_value
+            leaves[:, start:stop] = self._walk_values(np.ascontiguousarray(view).ravel(), stop - start)
+        return leaves
+
+
+def compile_model(estimator):
+    """CompiledForest for tree models, None for anything else (e.g. LogisticRegression)."""
+    try:
+        return CompiledForest.from_estimator(estimator)
+    except (AttributeError, ValueError):
+        return None
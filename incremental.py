@@ -0,0 +1,242 @@
+"""incremental.py – Incremental model updates from new campaign outcomes
+--------------------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: New labelled outcomes arrive every day, but a full retrain
+             (resampling, model selection and the grid search) takes minutes
+             to hours. This stage appends the new rows to an outcome history
+             and updates the current model in place of a rebuild:
+
+             - random forests get `--trees` new trees fitted on the most
+               recent `--window` rows (balanced like the notebook does), and
+               the same number of the oldest trees are retired, so the
+               forest keeps its size and slowly follows the data;
+             - logistic regression and LinearSVC models are refined by a few
+               epochs of SGD on the window (the same loss and penalty),
+               warm-started from their own coefficients, which are then
+               written back, so the model keeps its type and predict_proba;
+             - other estimators with partial_fit (e.g. SGDClassifier) are
+               updated with one partial_fit pass over the new rows.
+
+             The result is a new model artifact with the same encoder and the
+             base version recorded in its metadata. The new rows are added
+             to the outcome history only once the updated model is saved, so
+             a failed update can simply be run again.
+
+Usage:
+    python incremental.py new_outcomes.csv --model model_artifact.pkl --out model_artifact.pkl
+"""
+
+# =============================
+# Imports
+# =============================
+import argparse
+import copy
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+
+from dataset_cache import TARGET, balance_indices, read_raw
+from features import unnamed_features
+from model_artifact import ARTIFACT_PATH, MAPPED_MODEL_PATH, ModelArtifact, load_artifact
+
+# =============================
+# Constants
+# =============================
+HISTORY_PATH = "campaign_outcomes.csv"   # Every labelled outcome appended so far (raw format)
+WINDOW_ROWS = 10000                      # "Recent data" the new trees are fitted on
+NEW_TREES = 50                           # Trees added (and retired) per update
+LINEAR_EPOCHS = 5                        # SGD passes over the window for linear models
+LINEAR_STEP = 0.01                       # SGD step size; small, the start is already fitted
+
+
+# =============================
+# Outcome history
+# =============================
+def target_vector(frame):
+    return (frame[TARGET].astype(str) == "yes").to_numpy(dtype=np.int64)
+
+
+def recent_outcomes(new, history_path=HISTORY_PATH, window=WINDOW_ROWS):
+    """The last `window` rows of the history followed by `new` (the history is not changed)."""
+    frames = [read_raw(history_path), new] if history_path and os.path.exists(history_path) else [new]
+    return pd.concat(frames, ignore_index=True).tail(window).reset_index(drop=True)
+
+
+def append_outcomes(new, history_path=HISTORY_PATH):
+    """Append `new` raw rows to the history file."""
+    exists = os.path.exists(history_path)
+    new.to_csv(history_path, sep=";", index=False, mode="a", header=not exists)
+
+
+# =============================
+# Model updates
+# =============================
+def _split_pipeline(estimator):
+    """(preprocessing steps or None, final estimator)."""
+    if isinstance(estimator, Pipeline):
+        head = estimator[:-1] if len(estimator.steps) > 1 else None
+        return head, estimator.steps[-1][1]
+    return None, estimator
+
+
+def _final_copy(estimator):
+    updated = copy.deepcopy(estimator)
+    return updated, _split_pipeline(updated)[1]
+
+
+def extend_forest(estimator, X, y, n_trees=NEW_TREES, retire=None, balance=True, random_state=None):
+    """Copy of `estimator` with `n_trees` trees fitted on (X, y) and the `retire` oldest dropped.
+
+    The new trees use the forest's own hyperparameters. Earlier pipeline
+    steps (e.g. SelectFromModel) are reused as fitted, so the new trees see
+    the same features as the old ones.
+    """
+    head, forest = _split_pipeline(estimator)
+    if not isinstance(forest, RandomForestClassifier):
+        raise ValueError(f"Expected a random forest, got {type(forest).__name__}")
+    retire = n_trees if retire is None else retire
+    if not 0 <= retire < len(forest.estimators_):
+        raise ValueError(f"retire must be between 0 and {len(forest.estimators_) - 1} "
+                         f"(the forest has {len(forest.estimators_)} trees), got {retire}")
+
+    with unnamed_features():
+        Xt = np.asarray(head.transform(X) if head is not None else X, dtype=np.float64)
+    rows = balance_indices(y) if balance else np.arange(len(y))
+    if len(np.unique(y[rows])) < len(forest.classes_):
+        raise ValueError("The update window must contain every class")
+
+    fresh = clone(forest).set_params(n_estimators=n_trees, random_state=random_state, warm_start=False)
+    fresh.fit(Xt[rows], y[rows])
+
+    updated, target = _final_copy(estimator)
+    target.estimators_ = list(target.estimators_[retire:]) + list(fresh.estimators_)
+    target.n_estimators = len(target.estimators_)
+    return updated
+
+
+def linear_update(estimator, X, y, epochs=LINEAR_EPOCHS, balance=True, random_state=None):
+    """Copy of a LogisticRegression / LinearSVC `estimator` refined by SGD on (X, y).
+
+    SGDClassifier minimizes the same loss with the same penalty (alpha =
+    1 / (C * rows)), starting from the model's coefficients; the result is
+    written back into a copy of the original model.
+    """
+    head, model = _split_pipeline(estimator)
+    if isinstance(model, LogisticRegression):
+        loss, penalty = "log_loss", model.penalty or None
+    elif isinstance(model, LinearSVC):
+        loss, penalty = model.loss, model.penalty
+    else:
+        raise ValueError(f"Expected a linear model, got {type(model).__name__}")
+
+    with unnamed_features():
+        Xt = np.asarray(head.transform(X) if head is not None else X, dtype=np.float64)
+    rows = balance_indices(y) if balance else np.arange(len(y))
+    if len(np.unique(y[rows])) < len(model.classes_):
+        raise ValueError("The update window must contain every class")
+
+    sgd = SGDClassifier(loss=loss, penalty=penalty, alpha=1.0 / (model.C * len(rows)),
+                        l1_ratio=getattr(model, "l1_ratio", None) or 0.15,
+                        fit_intercept=model.fit_intercept, class_weight=model.class_weight,
+                        learning_rate="constant", eta0=LINEAR_STEP, max_iter=epochs, tol=None,
+                        random_state=random_state)
+    # Copies: SGD updates the initial arrays in place
+    sgd.fit(Xt[rows], y[rows], coef_init=model.coef_.copy(), intercept_init=model.intercept_.copy())
+
+    updated, target = _final_copy(estimator)
+    target.coef_ = sgd.coef_.copy()
+    target.intercept_ = sgd.intercept_.copy()
+    return updated
+
+
+def partial_fit_update(estimator, X, y):
+    """Copy of `estimator` after one partial_fit pass over (X, y)."""
+    updated, target = _final_copy(estimator)
+    head, _ = _split_pipeline(updated)
+    with unnamed_features():
+        Xt = head.transform(X) if head is not None else X
+        target.partial_fit(Xt, y, classes=target.classes_)
+    return updated
+
+
+def update_artifact(artifact, frame, n_trees=NEW_TREES, retire=None, balance=True, random_state=None,
+                    epochs=LINEAR_EPOCHS):
+    """New ModelArtifact updated on the raw labelled rows in `frame`."""
+    if artifact.estimator is None:
+        raise ValueError("Mapped (model.forest) artifacts carry no estimator; update the pickled artifact")
+    X = artifact.transform(frame)
+    y = target_vector(frame)
+    _, final = _split_pipeline(artifact.estimator)
+
+    start = time.perf_counter()
+    if isinstance(final, RandomForestClassifier):
+        estimator = extend_forest(artifact.estimator, X, y, n_trees, retire, balance, random_state)
+        method = "forest"
+    elif isinstance(final, (LogisticRegression, LinearSVC)):
+        estimator = linear_update(artifact.estimator, X, y, epochs, balance, random_state)
+        method = "linear"
+    elif hasattr(final, "partial_fit"):
+        estimator = partial_fit_update(artifact.estimator, X, y)
+        method = "partial_fit"
+    else:
+        raise ValueError(f"{type(final).__name__} cannot be updated incrementally; retrain with training.py")
+
+    metadata = {
+        **artifact.metadata,
+        "base_version": artifact.version,
+        "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "update_method": method,
+        "update_rows": int(len(frame)),
+        "update_seconds": time.perf_counter() - start,
+    }
+    return ModelArtifact(artifact.encoder, estimator, metadata=metadata)
+
+
+# =============================
+# CLI entry point
+# =============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the model with new campaign outcomes.")
+    parser.add_argument("outcomes", help="New labelled rows, shaped like bank-additional.csv")
+    parser.add_argument("--model", default=ARTIFACT_PATH, help="Model to update (model_artifact.pkl or best_model.pkl)")
+    parser.add_argument("--out", default=ARTIFACT_PATH, help="Where to write the updated artifact")
+    parser.add_argument("--mapped", help="Also write the memory-mapped format (e.g. model.forest)")
+    parser.add_argument("--history", default=HISTORY_PATH, help="Outcome history the new rows are appended to")
+    parser.add_argument("--window", type=int, default=WINDOW_ROWS, help="Most recent rows the update sees")
+    parser.add_argument("--trees", type=int, default=NEW_TREES, help="Trees to add")
+    parser.add_argument("--retire", type=int, default=None, help="Oldest trees to drop (default: --trees)")
+    parser.add_argument("--epochs", type=int, default=LINEAR_EPOCHS, help="SGD passes for linear models")
+    parser.add_argument("--no-balance", action="store_true", help="Fit on the window as is")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    artifact = load_artifact(args.model)
+    new = pd.read_csv(args.outcomes, sep=";")
+    frame = recent_outcomes(new, args.history, args.window)
+    updated = update_artifact(artifact, frame, args.trees, args.retire, not args.no_balance, args.seed,
+                              args.epochs)
+    updated.save(args.out)
+    if args.mapped:
+        updated.save_mapped(args.mapped)
+    if args.history:
+        # Only now: a failed update leaves the history as it was
+        append_outcomes(new, args.history)
+    elif os.path.exists(MAPPED_MODEL_PATH) and os.path.abspath(args.out) != os.path.abspath(MAPPED_MODEL_PATH):
+        print(f"Note: {MAPPED_MODEL_PATH} exists and is loaded first; rewrite it with --mapped", file=sys.stderr)
+
+    print(f"Updated {artifact.version} -> {updated.version} on {len(frame):,} rows "
+          f"({updated.metadata['update_method']}, {time.perf_counter() - start:.1f}s), saved to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""mapped_arrays.py – Memory-mappable array container
+--------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: A tiny single-file format for named NumPy arrays plus a JSON
+             header. Arrays are stored raw and 64-byte aligned, so opening a
+             file only maps it: nothing is parsed or copied, pages are read
+             lazily when first touched, and processes that open the same file
+             share those pages through the OS page cache.
+
+Layout:
+    8 bytes  magic b"ADA442MA"
+    8 bytes  little-endian header length
+    N bytes  UTF-8 JSON header {"meta": ..., "arrays": {name: {dtype, shape, offset}}}
+    ...      raw array data, each block starting on a 64-byte boundary
+
+Replacing a file that is in use: write the new file next to it and
+os.replace() it into place (write_arrays does this, through atomic_write,
+which the pickled model savers use as well). Processes that mapped
+the old file keep reading the old inode. Never overwrite a mapped file in
+place (`cp new.forest model.forest`, truncation, an editor's save): the
+mapped arrays of every running process change under them, or their pages
+disappear and the next read dies with SIGBUS. Open with copy=True when the
+file may be rewritten in place anyway.
+"""
+
+# =============================
+# Imports
+# =============================
+import json
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+# =============================
+# Constants
+# =============================
+MAGIC = b"ADA442MA"
+ALIGNMENT = 64
+
+
+def _align(n):
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def is_mapped_file(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+# =============================
+# Writing
+# =============================
+@contextmanager
+def atomic_write(path):
+    """Binary file to write `path` through: a temporary file next to it that
+    is fsynced and renamed over `path` once the block completes.
+
+    Readers see the old file or the whole new one, never a partial write, and
+    the path gets a new inode (see model_registry.py). If the block raises,
+    the temporary file is removed and `path` is left alone.
+    """
+    tmp_path = f"{path}.tmp{os.getpid()}-{threading.get_ident()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_arrays(path, arrays, meta=None):
+    """Write `arrays` (name -> ndarray) and a JSON-serialisable `meta` to `path`.
+
+    The file is written next to the target and renamed into place, so readers
+    never see a half-written file.
+    """
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+
+    # Offsets depend on the header size, which depends on the offsets; this
+    # settles after a second pass because the header only grows by a few digits
+    layout = {}
+    header_size = 0
+    while True:
+        offset = _align(16 + header_size)
+        for name, a in arrays.items():
+            layout[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+            offset = _align(offset + a.nbytes)
+        header = json.dumps({"meta": meta or {}, "arrays": layout}).encode("utf-8")
+        if len(header) <= header_size:
+            break
+        header_size = len(header) + 64
+    header = header.ljust(header_size, b" ")
+
+    with atomic_write(path) as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", header_size))
+        f.write(header)
+        for name, a in arrays.items():
+            f.seek(layout[name]["offset"])
+            f.write(a.tobytes())
+
+
+# =============================
+# Reading
+# =============================
+def open_arrays(path, copy=False):
+    """Map `path` read-only and return (arrays, meta).
+
+    The arrays are read-only views straight onto the mapping; the mapping
+    stays open for as long as any of them is alive. They are only as stable
+    as the file: replace it with os.replace(), never in place (see the
+    module docstring). With copy=True the arrays are read into private
+    memory and the mapping is closed, so later writes to the file cannot
+    reach them (at the cost of page sharing between processes).
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a mapped array file")
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        if count == 0:
+            arrays[name] = np.empty(spec["shape"], dtype=dtype)
+            continue
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                     offset=spec["offset"]).reshape(spec["shape"])
+        if copy:
+            arrays[name] = arrays[name].copy()
+            arrays[name].flags.writeable = False   # Same contract as the mapped views
+    if copy:
+        buffer.close()
+    return arrays, header["meta"]
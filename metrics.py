@@ -0,0 +1,276 @@
+"""metrics.py – Latency histograms, counters and Prometheus text export
+--------------------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Low-overhead instrumentation for the prediction flow. Each stage
+             (model load, encoding, predict, rendering) is timed with
+             `timed(stage)` into a latency histogram, next to counters for
+             requests, predictions by class and errors. The values live in
+             process memory and are exported in the Prometheus text format,
+             either from a small HTTP endpoint or by writing a file.
+
+Environment switches:
+    ADA442_METRICS_PORT     serve /metrics on this port (Streamlit app)
+    ADA442_METRICS_FILE     write the metrics to this file after predictions
+    ADA442_PROFILE_SLOW_MS  profile requests and keep the profile of every
+                            request slower than this many milliseconds
+    ADA442_PROFILE_DIR      where slow-request profiles go (default: profiles)
+"""
+
+# =============================
+# Imports
+# =============================
+import bisect
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# =============================
+# Constants
+# =============================
+# Seconds; fine-grained at the bottom because a cached prediction takes microseconds
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# =============================
+# Metric types
+# =============================
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{n}="{v}"' for (n, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self.lock:
+            self.values[labelvalues] = self.values.get(labelvalues, 0) + amount
+
+    def get(self, *labelvalues):
+        return self.values.get(labelvalues, 0)
+
+    def lines(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        for labelvalues, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination (Prometheus semantics)."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.values = {}   # labelvalues -> [per-bucket counts (+Inf last), sum]
+        self.lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(labelvalues)
+            if state is None:
+                state = self.values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, *labelvalues):
+        state = self.values.get(labelvalues)
+        return sum(state[0]) if state else 0
+
+    def lines(self):
+        with self.lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self.values.items())
+        for labelvalues, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                labels = _format_labels(self.labelnames, labelvalues, [("le", _format_value(float(bound)))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+# =============================
+# Registry and export
+# =============================
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self._last_write = 0.0
+
+    def _register(self, cls, name, *args, **kwargs):
+        # Get-or-create, so re-executed scripts (Streamlit reruns) reuse the same series
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram, name, help_text, labelnames, buckets)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        out = []
+        for metric in list(self.metrics.values()):
+            out.append(f"# HELP {metric.name} {metric.help}")
+            out.append(f"# TYPE {metric.name} {metric.kind}")
+            out.extend(metric.lines())
+        return "\n".join(out) + "\n"
+
+    def write(self, path, min_interval=0.0):
+        """Atomically write render() to `path`, at most once per `min_interval` seconds."""
+        now = time.monotonic()
+        if now - self._last_write < min_interval:
+            return False
+        self._last_write = now
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+        return True
+
+
+def serve_metrics(port, host="127.0.0.1", registry=None):
+    """Serve GET /metrics from a daemon thread; returns the server."""
+    registry = registry or REGISTRY
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+# =============================
+# Default metrics of the prediction flow
+# =============================
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter("ada442_requests_total", "Prediction requests received", ("source",))
+PREDICTIONS = REGISTRY.counter("ada442_predictions_total", "Predictions made, by predicted class",
+                               ("source", "outcome"))
+ERRORS = REGISTRY.counter("ada442_errors_total", "Failed requests or stages", ("source", "stage"))
+STAGE_SECONDS = REGISTRY.histogram("ada442_stage_seconds", "Time spent per stage of the prediction flow",
+                                   ("source", "stage"))
+MODEL_SWAPS = REGISTRY.counter("ada442_model_swaps_total", "Models swapped in by hot reload or rollback",
+                               ("source", "kind"))
+BATCH_ROWS = REGISTRY.histogram("ada442_batch_rows", "Rows per model call", ("source",),
+                                buckets=BATCH_SIZE_BUCKETS)
+
+
+class timed:
+    """Record the duration of the block in STAGE_SECONDS; exceptions count as ERRORS.
+
+    A plain class rather than @contextmanager: it is entered on every request.
+    """
+
+    __slots__ = ("stage", "source", "start")
+
+    def __init__(self, stage, source="app"):
+        self.stage = stage
+        self.source = source
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        STAGE_SECONDS.observe(time.perf_counter() - self.start, self.source, self.stage)
+        if exc_type is not None:
+            ERRORS.inc(self.source, self.stage)
+        return False
+
+
+def record_predictions(labels, source="app"):
+    """Count predicted classes (1 -> "yes", anything else -> "no")."""
+    yes = int(sum(1 for label in labels if label == 1))
+    if yes:
+        PREDICTIONS.inc(source, "yes", amount=yes)
+    if len(labels) - yes:
+        PREDICTIONS.inc(source, "no", amount=len(labels) - yes)
+
+
+# =============================
+# Slow-request profiling
+# =============================
+_profile_lock = threading.Lock()
+
+
+@contextmanager
+def profile_if_slow(name, threshold_ms=None, directory=None):
+    """Profile the block and keep the profile if it took longer than `threshold_ms`.
+
+    Off (no overhead beyond an environment lookup) unless a threshold is given
+    or ADA442_PROFILE_SLOW_MS is set. Only one request is profiled at a time;
+    concurrent requests run unprofiled. Profiles are pstats files, readable
+    with `python -m pstats` or snakeviz.
+    """
+    if threshold_ms is None:
+        threshold_ms = os.environ.get("ADA442_PROFILE_SLOW_MS")
+    if threshold_ms is None or not _profile_lock.acquire(blocking=False):
+        yield
+        return
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        if elapsed_ms > float(threshold_ms):
+            directory = directory or os.environ.get("ADA442_PROFILE_DIR", "profiles")
+            os.makedirs(directory, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            profiler.dump_stats(os.path.join(directory, f"{stamp}-{name}-{elapsed_ms:.0f}ms.prof"))
+    finally:
+        _profile_lock.release()
@@ -0,0 +1,313 @@
+"""model_artifact.py – Fused preprocessing + model artifact
+--------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: The notebook trains on Min-Max scaled numerics (Step 6) but only
+             pickled the estimator, so serving fed raw values like `duration`
+             and `nr.employed` straight into the model. A ModelArtifact keeps
+             everything scoring needs in one versioned file: the scaling
+             parameters, category vocabularies, column order and estimator.
+             Its transform scales and one-hot encodes in a single pass over a
+             NumPy buffer, so the form, the batch scorer and any other caller
+             produce identical numbers. Large batches can stay in the compact
+             coded form (uint8 category codes) end to end, see
+             transform_coded() / predict_proba_coded().
+"""
+
+# =============================
+# Imports
+# =============================
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from features import NUMERIC_COLUMNS, FeatureEncoder, unnamed_features
+from forest_engine import CodedForest, CompiledForest, compile_model
+from mapped_arrays import atomic_write, is_mapped_file, open_arrays, write_arrays
+
+# =============================
+# Constants
+# =============================
+ARTIFACT_FORMAT = 1                       # Bump when the stored layout changes
+ARTIFACT_PATH = "model_artifact.pkl"
+MAPPED_MODEL_PATH = "model.forest"        # Memory-mapped engine arrays, see save_mapped()
+LEGACY_MODEL_PATH = "best_model.pkl"      # Bare estimator pickled by older notebooks
+RAW_DATA_PATH = "bank-additional.csv"
+ENGINE_MAX_ROWS = 512                     # Larger batches go to sklearn's own compiled loop
+EXPAND_ROWS = 32768                       # Coded rows expanded to one-hot at a time for sklearn
+
+
+# =============================
+# Artifact
+# =============================
+class ModelArtifact:
+    """Encoder (with scaling) + estimator, loaded and used as one unit.
+
+    Tree models are also compiled into a CompiledForest. It answers the
+    small batches (up to ENGINE_MAX_ROWS rows) where sklearn's per-call
+    overhead dominates, with the same numbers the sklearn estimator gives.
+    Artifacts opened from the memory-mapped format carry only the engine
+    (estimator is None) and use it for every batch.
+    """
+
+    def __init__(self, encoder, estimator, version=None, metadata=None, compiled=True, engine=None):
+        if estimator is None and engine is None:
+            raise ValueError("An artifact needs an estimator or a compiled engine")
+        if engine is None and compiled:
+            engine = compile_model(estimator)
+        encoder.check_model(estimator if estimator is not None else engine)
+        self.encoder = encoder
+        self.estimator = estimator
+        self.engine = engine
+        self.version = version or _estimator_version(estimator)
+        self.metadata = dict(metadata or {})
+        self.classes_ = getattr(estimator, "classes_", None) if engine is None else engine.classes_
+        self._coded_engine = None
+        self._explainer = None
+
+    @property
+    def columns(self):
+        return self.encoder.columns
+
+    @property
+    def has_proba(self):
+        return self.engine is not None or hasattr(self.estimator, "predict_proba")
+
+    # ---------- Transform ----------
+    def transform(self, data, out=None):
+        """Scale + encode a DataFrame, a list of records or a single record."""
+        if isinstance(data, pd.DataFrame):
+            return self.encoder.encode_frame(data, out)
+        if isinstance(data, dict):
+            return self.encoder.encode_row(data, out).reshape(1, -1)
+        return self.encoder.encode_records(data, out)
+
+    # ---------- Scoring on already encoded rows ----------
+    def predict_proba_encoded(self, X):
+        if self.engine is not None and (self.estimator is None or len(X) <= ENGINE_MAX_ROWS):
+            return self.engine.predict_proba(X)
+        with unnamed_features():
+            return self.estimator.predict_proba(X)
+
+    def predict_encoded(self, X):
+        if self.has_proba:
+            return self.classes_[self.predict_proba_encoded(X).argmax(axis=1)]
+        with unnamed_features():
+            return self.estimator.predict(X)
+
+    # ---------- Compact coded rows ----------
+    @property
+    def coded_engine(self):
+        """The engine rewritten for CodedBlocks (built on first use), or None."""
+        if self._coded_engine is None and self.engine is not None:
+            self._coded_engine = CodedForest.from_compiled(self.engine, self.encoder)
+        return self._coded_engine
+
+    @property
+    def explainer(self):
+        """Tree path explainer (explain.py), built on first use; None for non-tree models."""
+        if self._explainer is None and self.engine is not None:
+            from explain import explainer_for
+            self._explainer = explainer_for(self)
+        return self._explainer
+
+    def transform_coded(self, data):
+        """CodedBlock of a DataFrame or a list of records (no one-hot matrix)."""
+        if isinstance(data, pd.DataFrame):
+            return self.encoder.encode_codes(data)
+        return self.encoder.encode_records_codes([data] if isinstance(data, dict) else data)
+
+    def _expanded(self, block, score):
+        # sklearn wants the one-hot layout: expand a slice at a time, as the
+        # float32 its trees compare, so the batch never exists as one-hot
+        with unnamed_features():
+            parts = [score(self.encoder.expand_codes(block[i:i + EXPAND_ROWS], dtype=np.float32))
+                     for i in range(0, len(block), EXPAND_ROWS)]
+        return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+    def predict_proba_coded(self, block):
+        if self.engine is not None and (self.estimator is None or len(block) <= ENGINE_MAX_ROWS):
+            return self.coded_engine.predict_proba(block)
+        return self._expanded(block, self.estimator.predict_proba)
+
+    def predict_coded(self, block):
+        if self.has_proba:
+            return self.classes_[self.predict_proba_coded(block).argmax(axis=1)]
+        return self._expanded(block, self.estimator.predict)
+
+    # ---------- Scoring on raw records ----------
+    def predict_proba(self, data):
+        return self.predict_proba_encoded(self.transform(data))
+
+    def predict(self, data):
+        return self.predict_encoded(self.transform(data))
+
+    # ---------- Persistence ----------
+    def to_dict(self):
+        return {
+            "format": ARTIFACT_FORMAT,
+            "version": self.version,
+            "metadata": self.metadata,
+            "encoder": self.encoder.state(),
+            "estimator": self.estimator,
+        }
+
+    @classmethod
+    def from_dict(cls, payload):
+        if payload.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"Unsupported artifact format {payload.get('format')!r}, expected {ARTIFACT_FORMAT}")
+        return cls(FeatureEncoder.from_state(payload["encoder"]), payload["estimator"],
+                   payload["version"], payload["metadata"])
+
+    def save(self, path=ARTIFACT_PATH):
+        """Pickle the artifact to `path`, replacing any file there by rename.
+
+        A running app or service (model_registry.py) picks up the new file
+        without ever reading it half-written.
+        """
+        if self.estimator is None:
+            raise ValueError("Artifacts without an estimator can only be saved with save_mapped()")
+        with atomic_write(path) as f:
+            pickle.dump(self.to_dict(), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def save_mapped(self, path=MAPPED_MODEL_PATH):
+        """Write the compiled engine as raw node arrays that open with mmap.
+
+        Loading such a file is near-instant, its pages are shared by every
+        process that maps it, and only the nodes a prediction touches are
+        ever read from disk.
+        """
+        if self.engine is None:
+            raise ValueError("Only tree models can be saved in the mapped format")
+        arrays, engine_meta = self.engine.to_arrays()
+        write_arrays(path, arrays, {
+            "format": ARTIFACT_FORMAT,
+            "version": self.version,
+            "metadata": self.metadata,
+            "encoder": self.encoder.state(),
+            "engine": engine_meta,
+        })
+
+
+def _estimator_version(estimator):
+    # Content hash of the fitted estimator: identical models get identical versions
+    return hashlib.sha256(pickle.dumps(estimator, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()[:12]
+
+
+# =============================
+# Building artifacts
+# =============================
+def export_artifact(estimator, scaler, columns, path=ARTIFACT_PATH, **metadata):
+    """Called at the end of training: bundle the fitted scaler, columns and estimator."""
+    encoder = FeatureEncoder.with_scaler(list(columns), scaler)
+    artifact = ModelArtifact(encoder, estimator,
+                             metadata={"created": time.strftime("%Y-%m-%d %H:%M:%S"), **metadata})
+    artifact.save(path)
+    return artifact
+
+
+def scaling_from_raw_data(raw_data_path=RAW_DATA_PATH):
+    """Recompute the notebook's MinMaxScaler parameters (Step 6).
+
+    The scaler was fitted on every row of bank-additional.csv, so its
+    scale_/min_ can be rebuilt exactly from the raw file for estimators that
+    were pickled without it.
+    """
+    numeric = pd.read_csv(raw_data_path, sep=";", usecols=NUMERIC_COLUMNS)[NUMERIC_COLUMNS]
+    low = numeric.min().to_numpy(dtype=np.float64)
+    high = numeric.max().to_numpy(dtype=np.float64)
+    span = high - low
+    span[span == 0.0] = 1.0                # Same guard as MinMaxScaler
+    scale = 1.0 / span
+    return scale, 0.0 - low * scale
+
+
+def from_legacy_model(estimator, raw_data_path=RAW_DATA_PATH, version=None):
+    scale, low = scaling_from_raw_data(raw_data_path)
+    encoder = FeatureEncoder.for_model(estimator)
+    encoder = FeatureEncoder(encoder.columns, scale, low)
+    return ModelArtifact(encoder, estimator, version, metadata={"source": "legacy estimator pickle"})
+
+
+# =============================
+# Loading
+# =============================
+def resolve_model_path():
+    """The file load_artifact() uses when no path is given."""
+    for candidate in (MAPPED_MODEL_PATH, ARTIFACT_PATH):
+        if os.path.exists(candidate):
+            return candidate
+    return LEGACY_MODEL_PATH
+
+
+def model_fingerprint(path=None):
+    """(path, mtime, size, inode) of the model file.
+
+    Any change to the file changes the fingerprint; only a replacement by
+    rename (os.replace) also changes the inode.
+    """
+    path = path or resolve_model_path()
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def load_mapped(path=MAPPED_MODEL_PATH, copy=False):
+    """Artifact of a model.forest file; copy=True detaches it from the file (see open_arrays).
+
+    The mapped engine reads the file's pages for as long as it is served, so
+    replace a live model.forest only with os.replace() (save_mapped() does),
+    never by copying over it.
+    """
+    arrays, meta = open_arrays(path, copy)
+    if meta.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"Unsupported artifact format {meta.get('format')!r}, expected {ARTIFACT_FORMAT}")
+    engine = CompiledForest.from_arrays(arrays, meta["engine"])
+    return ModelArtifact(FeatureEncoder.from_state(meta["encoder"]), None,
+                         meta["version"], meta["metadata"], engine=engine)
+
+
+def load_artifact(path=None, copy=False):
+    """Load a ModelArtifact from any of the supported files.
+
+    Accepts the memory-mapped format, a pickled artifact or a bare estimator
+    pickle. With no path, model.forest, model_artifact.pkl and best_model.pkl
+    are tried in that order; a bare estimator is wrapped with scaling
+    parameters rebuilt from the raw data. `copy` applies to the mapped
+    format only: the arrays are copied out of the file (see load_mapped).
+    """
+    if path is None:
+        path = resolve_model_path()
+    if is_mapped_file(path):
+        return load_mapped(path, copy)
+    with open(path, "rb") as f:
+        data = f.read()
+    payload = pickle.loads(data)
+    if isinstance(payload, dict) and "format" in payload:
+        return ModelArtifact.from_dict(payload)
+    # Re-pickling a loaded estimator is not byte-stable, so version a bare
+    # estimator by the file it came from
+    return from_legacy_model(payload, version=hashlib.sha256(data).hexdigest()[:12])
+
+
+# =============================
+# CLI: convert to the mapped format
+# =============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a model pickle to the memory-mapped format.")
+    parser.add_argument("source", help="model_artifact.pkl or a bare estimator pickle (best_model.pkl)")
+    parser.add_argument("target", nargs="?", default=MAPPED_MODEL_PATH, help="Output file (default: model.forest)")
+    args = parser.parse_args(argv)
+
+    artifact = load_artifact(args.source)
+    artifact.save_mapped(args.target)
+    print(f"Wrote model {artifact.version} ({artifact.engine.n_trees} trees) to {args.target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
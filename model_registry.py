@@ -0,0 +1,245 @@
+"""model_registry.py – Hot model reload with pre-warming and rollback
+-----------------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Lets a running app pick up a replaced model file without a
+             restart. A background thread polls the model file's fingerprint
+             (path, mtime, size, inode) and loads the new model as soon as
+             the file has been replaced. It then warms it on a validation
+             batch of raw rows: this builds the lazy engines and pages the
+             trees in, and it checks that the probabilities are sane. Only
+             then are the (current, previous) models swapped in one
+             reference assignment. Requests keep using the old model until
+             that moment, and none of them pays the unpickle.
+
+             Deploy a model by writing it to a new file next to the live
+             one and renaming it over it (os.replace, `mv`). The repo's
+             savers all do: ModelArtifact.save and save_mapped write through
+             mapped_arrays.atomic_write, so the files of training.py,
+             incremental.py, distill.py and the notebook are picked up. A
+             rename is atomic and gives the path a new inode, while the old
+             model's (possibly mapped) file lives on until it is no longer
+             used. A file rewritten in place (`cp` over it) keeps its inode:
+             it is refused rather than loaded half-written, and for the
+             mapped format the rewrite has already changed the pages the
+             current model reads.
+
+             A model that fails to load or validate is logged and skipped;
+             the current one keeps serving. The previous model stays in
+             memory, so rollback() is an instant swap back. A rollback pins
+             the registry to that model until a new file is deployed.
+
+Usage:
+    python model_registry.py --model model_artifact.pkl    # load and warm once, print the timings
+"""
+
+# =============================
+# Imports
+# =============================
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import metrics
+from metrics import timed
+from model_artifact import RAW_DATA_PATH, load_artifact, model_fingerprint
+
+# =============================
+# Constants
+# =============================
+DEFAULT_POLL_INTERVAL = 2.0     # Seconds between checks of the model file
+WARMUP_ROWS = 256               # Validation batch scored before a model goes live
+
+
+def validation_batch(path=RAW_DATA_PATH, rows=WARMUP_ROWS):
+    """First `rows` raw rows of the training data, or None when the file is missing."""
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, sep=";", nrows=rows).drop(columns="y", errors="ignore")
+
+
+def warm_up(artifact, batch):
+    """Score `batch` the ways the app does and check the answers; raises ValueError if they are off."""
+    if batch is None or len(batch) == 0:
+        return
+    # One row through the single-row path, then the whole batch at once
+    artifact.predict_encoded(artifact.transform(batch.iloc[0].to_dict()))
+    if not artifact.has_proba:
+        artifact.predict(batch)
+        return
+    proba = artifact.predict_proba(batch)
+    if proba.shape != (len(batch), 2) or not np.all(np.isfinite(proba)):
+        raise ValueError(f"Model {artifact.version} returned invalid probabilities")
+    if np.any(proba < 0) or np.any(proba > 1) or not np.allclose(proba.sum(axis=1), 1.0, atol=1e-6):
+        raise ValueError(f"Model {artifact.version} probabilities are not a distribution")
+    artifact.explainer  # Built lazily; the first "Yes" should not pay for it
+
+
+# =============================
+# Registry
+# =============================
+class ModelRegistry:
+    """The model serving requests, swapped atomically when the file changes.
+
+    Read `current` once per request and use that object throughout, so one
+    request never mixes two models.
+    """
+
+    def __init__(self, path=None, poll_interval=DEFAULT_POLL_INTERVAL, batch=None, source="app"):
+        self.path = path                 # None: whatever load_artifact() would pick
+        self.poll_interval = float(poll_interval)
+        self.batch = batch
+        self.source = source
+        self._swap_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        fingerprint = model_fingerprint(path)
+        self._disk = fingerprint         # Last file on disk acted on (loaded, failed or refused)
+        self.last_error = None
+        self.swaps = 0
+        self.pinned = False              # True after a rollback, until a new file goes live
+        current, self.warm_ms = self._load(fingerprint)
+        # (current, previous) and the files they came from: each pair is
+        # replaced as a whole, so readers never see half a swap
+        self._models = (current, None)
+        self._files = (fingerprint, None)
+        self.loaded_at = time.time()
+
+    @property
+    def current(self):
+        return self._models[0]
+
+    @property
+    def previous(self):
+        return self._models[1]
+
+    @property
+    def fingerprint(self):
+        """Fingerprint of the file the current model was loaded from."""
+        return self._files[0]
+
+    # ---------- Loading ----------
+    def _load(self, fingerprint):
+        # (artifact, warm-up milliseconds)
+        with timed("load", self.source):
+            artifact = load_artifact(fingerprint[0])
+        start = time.perf_counter()
+        with timed("warmup", self.source):
+            warm_up(artifact, self.batch)
+        return artifact, (time.perf_counter() - start) * 1000.0
+
+    def check(self):
+        """Load, warm and swap in a model file replaced by rename; True when a new model went live.
+
+        Each file is acted on once: a file that fails to load, or that was
+        rewritten in place (same path and inode), is reported in last_error
+        and skipped until the next replacement.
+        """
+        try:
+            fingerprint = model_fingerprint(self.path)
+        except OSError:
+            return False                 # The file is briefly missing
+        if fingerprint == self._disk:
+            return False
+        in_place = fingerprint[0] == self._disk[0] and fingerprint[3] == self._disk[3]
+        self._disk = fingerprint
+        if in_place:
+            self._skip(f"{fingerprint[0]} was rewritten in place; deploy models by "
+                       f"renaming a complete file over it (os.replace)")
+            return False
+        try:
+            artifact, warm_ms = self._load(fingerprint)
+        except Exception as exc:
+            self._skip(f"{fingerprint[0]}: {exc!r}")
+            return False
+        with self._swap_lock:
+            self._models = (artifact, self.current)
+            self._files = (fingerprint, self.fingerprint)
+            self.loaded_at = time.time()
+            self.warm_ms = warm_ms
+            self.swaps += 1
+            self.pinned = False
+            self.last_error = None
+        metrics.MODEL_SWAPS.inc(self.source, "reload")
+        return True
+
+    def _skip(self, error):
+        self.last_error = error
+        print(f"model_registry: keeping model {self.current.version}; {error}", file=sys.stderr)
+
+    def rollback(self):
+        """Serve the previous model again (and keep the current one as the new previous).
+
+        The registry stays pinned to it: the file rolled back from is not
+        reloaded, only a newly deployed file replaces the model again.
+        """
+        with self._swap_lock:
+            current, previous = self._models
+            if previous is None:
+                raise ValueError("No previous model to roll back to")
+            self._models = (previous, current)
+            self._files = self._files[::-1]
+            self.loaded_at = time.time()
+            self.swaps += 1
+            self.pinned = True
+        metrics.MODEL_SWAPS.inc(self.source, "rollback")
+        return previous
+
+    # ---------- Watching ----------
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+            self._thread.start()
+        return self
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.check()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def status(self):
+        current, previous = self._models
+        fingerprint = self.fingerprint
+        return {
+            "model_version": current.version,
+            "previous_version": previous.version if previous is not None else None,
+            # The file the served model came from, as it was when loaded
+            "file": fingerprint[0],
+            "file_modified": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(fingerprint[1] / 1e9)),
+            "pinned": self.pinned,
+            "loaded_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.loaded_at)),
+            "warmup_ms": self.warm_ms,
+            "swaps": self.swaps,
+            "last_error": self.last_error,
+        }
+
+
+# =============================
+# CLI entry point
+# =============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load and warm a model the way the hot reload does.")
+    parser.add_argument("--model", default=None, help="Model file (default: model.forest, model_artifact.pkl, best_model.pkl)")
+    parser.add_argument("--data", default=RAW_DATA_PATH, help="Raw rows for the validation batch")
+    parser.add_argument("--rows", type=int, default=WARMUP_ROWS)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    registry = ModelRegistry(args.model, batch=validation_batch(args.data, args.rows))
+    total = (time.perf_counter() - start) * 1000.0
+    print(f"Model {registry.current.version} from {registry.fingerprint[0]}: "
+          f"ready in {total:.0f} ms, of which warm-up {registry.warm_ms:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
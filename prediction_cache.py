@@ -0,0 +1,114 @@
+"""prediction_cache.py – Bounded prediction cache
+----------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Agents resubmit the same client profile many times while they
+             tweak one field. This LRU cache sits in front of the model call
+             and is keyed on a compact hash of the encoded feature row, so a
+             repeated profile is answered without running the forest.
+
+             The key is the exact float64 bytes of the encoded row, with no
+             rounding. A hit therefore returns what the model returned for
+             this very row. That equals a fresh call as long as the model is
+             a deterministic function of the encoded row (true for every
+             fitted sklearn estimator the repo serves: forests, logistic
+             regression, LinearSVC) and the cache belongs to one model
+             version (the app keeps one cache per version). Rows that differ
+             only in the last bits are separate entries.
+"""
+
+# =============================
+# Imports
+# =============================
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# =============================
+# Constants
+# =============================
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_TTL_SECONDS = None   # Entries never expire unless a TTL is set
+
+
+def row_key(row):
+    """16-byte digest of the exact (float64) encoded row."""
+    return hashlib.blake2b(np.ascontiguousarray(row, dtype=np.float64).tobytes(), digest_size=16).digest()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with a size cap, optional TTL and counters.
+
+    Streamlit serves every session from its own thread, so all access goes
+    through one lock. `model_version` records which model the cached values
+    belong to; create a new cache when the model changes.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS, model_version=None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = int(max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.model_version = model_version
+        self._entries = OrderedDict()   # key -> (value, stored_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, stored_at = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, row, compute):
+        """Return the cached value for `row`, or compute(row), cache and return it."""
+        key = row_key(row)
+        value = self.get(key)
+        if value is None:
+            value = compute(row)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "model_version": self.model_version,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
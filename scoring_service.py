@@ -0,0 +1,375 @@
+"""scoring_service.py – JSON scoring service with micro-batching
+-------------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: A small asyncio HTTP server (standard library only) so the CRM
+             can score clients without going through the Streamlit UI.
+             Concurrent requests are queued for a few milliseconds and sent
+             to the model as one batched predict_proba call, which costs
+             little more than scoring a single row. The model is loaded once
+             at startup: restart the service to serve a new model file (the
+             app's hot reload, model_registry.py, does not run here).
+
+Endpoints:
+    POST /predict   one record, a list of records, or {"records": [...]},
+                    using the raw bank-additional.csv field names;
+                    probability_yes is null for models without
+                    probabilities (LinearSVC)
+    GET  /health    model version and batching settings
+    GET  /metrics   request, prediction and latency metrics (Prometheus text)
+    GET  /drift     PSI per input field against the training profile (drift_monitor.py)
+
+Usage:
+    python scoring_service.py --port 8502 --max-batch-size 64 --max-wait-ms 2
+    python scoring_service.py --student student_model.pkl   # tiered scoring, see distill.py
+    python scoring_service.py --workers 4    # pre-forked processes sharing one model, see worker_pool.py
+    python scoring_service.py --audit-dir ""    # no audit log (default: audit/, see audit_log.py)
+"""
+
+# =============================
+# Imports
+# =============================
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import metrics
+from audit_log import AUDIT_DIR, AuditLogger
+from drift_monitor import REFERENCE_PATH, load_monitor
+from metrics import timed
+from model_artifact import load_artifact
+
+# =============================
+# Constants
+# =============================
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8502
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 2.0
+MAX_BODY_BYTES = 16 * 2**20
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+# =============================
+# Micro-batching
+# =============================
+class MicroBatcher:
+    """Collects encoded rows from concurrent requests into batched model calls.
+
+    A batch is sent as soon as it holds `max_batch_size` rows or the first
+    queued request has waited `max_wait_ms`. The model runs on one worker
+    thread so the event loop keeps accepting and queueing requests meanwhile.
+    """
+
+    def __init__(self, artifact, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.artifact = artifact
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+        self.batches = 0
+        self.rows = 0
+
+    async def score(self, rows):
+        """Queue an encoded (n, n_features) block and wait for its scores.
+
+        The scores are (n, 2) probabilities, or (n,) labels for models
+        without predict_proba (LinearSVC).
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout > 0:
+                        item = await asyncio.wait_for(self.queue.get(), timeout)
+                    else:
+                        # Out of time: still take whatever is already waiting
+                        item = self.queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                pending.append(item)
+                size += len(item[0])
+            await self._score(loop, pending)
+
+    async def _score(self, loop, pending):
+        block = np.concatenate([rows for rows, _ in pending]) if len(pending) > 1 else pending[0][0]
+        metrics.BATCH_ROWS.observe(len(block), "service")
+        try:
+            scores = await loop.run_in_executor(self.executor, self._score_block, block)
+        except Exception as exc:  # noqa: BLE001 - handed back to every waiting request
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self.batches += 1
+        self.rows += len(block)
+        start = 0
+        for rows, future in pending:
+            if not future.done():
+                future.set_result(scores[start:start + len(rows)])
+            start += len(rows)
+
+    def _score_block(self, block):
+        with timed("model", "service"):
+            if self.artifact.has_proba:
+                return self.artifact.predict_proba_encoded(block)
+            return self.artifact.predict_encoded(block)
+
+
+# =============================
+# Request handling
+# =============================
+def parse_records(payload):
+    if isinstance(payload, dict) and "records" in payload:
+        payload = payload["records"]
+    if isinstance(payload, dict):
+        payload = [payload]
+    if not isinstance(payload, list) or not payload or not all(isinstance(r, dict) for r in payload):
+        raise ValueError("Expected a record object, a non-empty list of records or {\"records\": [...]}")
+    return payload
+
+
+class ScoringService:
+    def __init__(self, artifact, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                 drift=None, audit=None):
+        self.artifact = artifact
+        self.batcher = MicroBatcher(artifact, max_batch_size, max_wait_ms)
+        self.drift = drift       # DriftMonitor counting every scored record, or None
+        self.audit = audit       # AuditLogger queueing every answered record, or None
+
+    async def predict(self, payload):
+        records = parse_records(payload)
+        try:
+            with timed("encode", "service"):
+                rows = self.artifact.encoder.encode_records(records)
+        except KeyError as exc:
+            raise ValueError(f"Missing field {exc.args[0]!r}") from None
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid field value: {exc}") from None
+        if self.drift is not None:
+            self.drift.update_records(records)
+        # Queueing plus the batched model call
+        with timed("predict", "service"):
+            scores = await self.batcher.score(rows)
+        if scores.ndim == 2:
+            labels = self.artifact.classes_[scores.argmax(axis=1)]
+            p_yes = scores[:, 1]
+        else:
+            # No predict_proba (LinearSVC): labels only, probability null like the app's NaN
+            labels, p_yes = scores, np.full(len(scores), np.nan)
+        metrics.record_predictions(labels, "service")
+        if self.audit is not None:
+            self.audit.log(self.artifact, records, labels, p_yes)
+        return {
+            "model_version": self.artifact.version,
+            "predictions": [
+                {"prediction": int(label), "probability_yes": None if np.isnan(p) else float(p)}
+                for label, p in zip(labels, p_yes)
+            ],
+        }
+
+    def health(self):
+        return {
+            "status": "ok",
+            "model_version": self.artifact.version,
+            "pid": os.getpid(),
+            "max_batch_size": self.batcher.max_batch_size,
+            "max_wait_ms": self.batcher.max_wait * 1000.0,
+            "batches": self.batcher.batches,
+            "rows": self.batcher.rows,
+            **({"tiered": self.artifact.stats()} if hasattr(self.artifact, "stats") else {}),
+            **({"audit": self.audit.stats()} if self.audit is not None else {}),
+        }
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "Use GET"}
+            return 200, self.health()
+        if path == "/metrics":
+            if method != "GET":
+                return 405, {"error": "Use GET"}
+            return 200, metrics.REGISTRY.render()
+        if path == "/drift":
+            if method != "GET":
+                return 405, {"error": "Use GET"}
+            if self.drift is None:
+                return 404, {"error": "No drift reference loaded"}
+            return 200, {"pid": os.getpid(), **self.drift.report()}
+        if path == "/predict":
+            if method != "POST":
+                return 405, {"error": "Use POST"}
+            metrics.REQUESTS.inc("service")
+            start = time.perf_counter()
+            try:
+                # The profile covers everything the event loop does while this request is in flight
+                with metrics.profile_if_slow("service-predict"):
+                    payload = json.loads(body or b"null")
+                    return 200, await self.predict(payload)
+            except ValueError as exc:   # also covers json.JSONDecodeError
+                metrics.ERRORS.inc("service", "request")
+                return 400, {"error": str(exc)}
+            finally:
+                metrics.STAGE_SECONDS.observe(time.perf_counter() - start, "service", "request")
+        return 404, {"error": f"Unknown path {path}"}
+
+    # ---------- Minimal HTTP/1.1 with keep-alive ----------
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, close=True)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "Malformed Content-Length"}, close=True)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Request body too large"}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                close = headers.get("connection", "").lower() == "close"
+
+                try:
+                    status, result = await self.route(method, target.split("?", 1)[0], body)
+                except Exception as exc:  # noqa: BLE001 - reported to the client as a 500
+                    metrics.ERRORS.inc("service", "internal")
+                    status, result = 500, {"error": f"{type(exc).__name__}: {exc}"}
+                await self._respond(writer, status, result, close)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, result, close=False):
+        # Text results (the /metrics page) are sent as they are, everything else as JSON
+        if isinstance(result, str):
+            body, content_type = result.encode("utf-8"), metrics.CONTENT_TYPE
+        else:
+            body, content_type = json.dumps(result).encode("utf-8"), "application/json"
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None, sock=None):
+        # `sock`: an already listening socket, e.g. the one a worker pool shares
+        batcher = asyncio.create_task(self.batcher.run())
+        if sock is not None:
+            server = await asyncio.start_server(self.handle_connection, sock=sock)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self.batcher.executor.shutdown(wait=False)
+
+
+def audit_logger(directory):
+    return AuditLogger(directory) if directory else None
+
+
+def run_service(service, **serve_kwargs):
+    # SIGTERM unwinds like Ctrl+C, so the rows still queued for the audit log are written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        asyncio.run(service.serve(**serve_kwargs))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if service.audit is not None:
+            service.audit.close()
+
+
+# =============================
+# CLI entry point
+# =============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the model as a JSON scoring endpoint.")
+    parser.add_argument("--model", default=None, help="Model file (default: model.forest, model_artifact.pkl, best_model.pkl)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="Rows per model call at most")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="How long the first queued request may wait for company")
+    parser.add_argument("--student", default=None,
+                        help="Distilled student (distill.py): answer confident rows with it, escalate the rest")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Scoring processes forked from one loaded model (see worker_pool.py)")
+    parser.add_argument("--drift-reference", default=REFERENCE_PATH,
+                        help="Training input profile for GET /drift (skipped when the file is missing)")
+    parser.add_argument("--audit-dir", default=AUDIT_DIR,
+                        help="Where to append the prediction audit log (empty: no log)")
+    args = parser.parse_args(argv)
+
+    artifact = load_artifact(args.model)
+    if args.student:
+        from distill import TieredScorer
+        artifact = TieredScorer(load_artifact(args.student), artifact)
+    if args.workers > 1:
+        from worker_pool import WorkerPool, bind_socket
+        sock = bind_socket(args.host, args.port)
+
+        def worker():
+            # Built after the fork: the batcher's thread and event loop belong to one worker
+            # Each worker counts the traffic it serves; /drift reports that worker's share
+            service = ScoringService(artifact, args.max_batch_size, args.max_wait_ms,
+                                     load_monitor(args.drift_reference), audit_logger(args.audit_dir))
+            run_service(service, sock=sock)
+
+        print(f"Serving model {artifact.version} on http://{args.host}:{args.port} "
+              f"with {args.workers} workers", file=sys.stderr)
+        WorkerPool(worker, args.workers).run()
+        return 0
+
+    service = ScoringService(artifact, args.max_batch_size, args.max_wait_ms,
+                             load_monitor(args.drift_reference), audit_logger(args.audit_dir))
+    print(f"Serving model {service.artifact.version} on http://{args.host}:{args.port}", file=sys.stderr)
+    run_service(service, host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,42 +15,38 @@ Description: Streamlit web application that loads a pickled ML model and
 # Imports
 # =============================
 import streamlit as st
-import pandas as pd
-import pickle
 from streamlit_router import StreamlitRouter
+from features import CATEGORIES
+from model_registry import ModelRegistry, validation_batch
 
 # =============================
 # Constants – categorical vocab
 # =============================
-JOB_OPTIONS = [
-    "admin.", "blue-collar", "entrepreneur", "management", "retired",
-    "self-employed", "services", "student", "technician", "unemployed",
-    "unknown",
-]
-
-MARITAL_OPTIONS = ["single", "married", "divorced", "unknown"]
-EDU_OPTIONS = ["primary", "secondary", "tertiary", "unknown"]
-DEFAULT_OPTIONS = ["no", "yes", "unknown"]
-HOUSING_OPTIONS = ["no", "yes", "unknown"]
-LOAN_OPTIONS = ["no", "yes", "unknown"]
-CONTACT_OPTIONS = ["cellular", "telephone"]
-MONTH_OPTIONS = [
-    "jan", "feb", "mar", "apr", "may", "jun", "jul", "aug",
-    "sep", "oct", "nov", "dec",
-]
-DOW_OPTIONS = ["mon", "tue", "wed", "thu", "fri"]
-POUTCOME_OPTIONS = ["nonexistent", "failure", "success"]
+# Options come from the training vocabulary so every choice maps onto a
+# column the model was actually trained with
+JOB_OPTIONS = CATEGORIES["job"]
+MARITAL_OPTIONS = CATEGORIES["marital"]
+EDU_OPTIONS = CATEGORIES["education"]
+DEFAULT_OPTIONS = CATEGORIES["default"]
+HOUSING_OPTIONS = CATEGORIES["housing"]
+LOAN_OPTIONS = CATEGORIES["loan"]
+CONTACT_OPTIONS = CATEGORIES["contact"]
+MONTH_OPTIONS = CATEGORIES["month"]
+DOW_OPTIONS = CATEGORIES["day_of_week"]
+POUTCOME_OPTIONS = CATEGORIES["poutcome"]
 
 # =============================
 # Model loader (cached)
 # =============================
 @st.cache_resource()
-def load_model():
-    with open("best_model.pkl", "rb") as f:
-        model = pickle.load(f)
-    return model
+def load_registry():
+    # Scaling parameters, one-hot layout and estimator in one artifact; a
+    # model file replaced by rename is warmed in the background and swapped in
+    return ModelRegistry(batch=validation_batch()).start()
 
-model = load_model()
+# Read once per run, so a submission is scored by a single model
+model = load_registry().current
+encoder = model.encoder
 
 # =============================
 # Prediction form page
@@ -144,42 +140,25 @@ def create_interface():
         submitted = st.form_submit_button("🔮 Predict")
 
         if submitted:
-            # Assemble input row
-            data = {
-                "age": [age],
-                "duration": [duration],
-                "campaign": [campaign],
-                "pdays": [pdays],
-                "previous": [previous],
-                "emp.var.rate": [emp_var_rate],
-                "cons.price.idx": [cons_price_idx],
-                "cons.conf.idx": [cons_conf_idx],
-                "euribor3m": [euribor3m],
-                "nr.employed": [nr_employed],
-                # One‑hot
-                **{f"job_{j}": [1 if job == j else 0] for j in JOB_OPTIONS},
-                **{f"marital_{m}": [1 if marital == m else 0] for m in MARITAL_OPTIONS},
-                **{f"education_{e}": [1 if education == e else 0] for e in EDU_OPTIONS},
-                "default_unknown": [1 if default == "unknown" else 0],
-                "default_yes": [1 if default == "yes" else 0],
-                "housing_unknown": [1 if housing == "unknown" else 0],
-                "housing_yes": [1 if housing == "yes" else 0],
-                "loan_unknown": [1 if loan == "unknown" else 0],
-                "loan_yes": [1 if loan == "yes" else 0],
-                "contact_telephone": [1 if contact_type == "telephone" else 0],
-                **{f"month_{m}": [1 if month == m else 0] for m in MONTH_OPTIONS},
-                **{f"day_of_week_{d}": [1 if day_of_week == d else 0] for d in DOW_OPTIONS},
-                "poutcome_nonexistent": [1 if poutcome == "nonexistent" else 0],
-                "poutcome_success": [1 if poutcome == "success" else 0],
+            # Scale + encode straight into the training column layout
+            record = {
+                "age": age, "duration": duration, "campaign": campaign,
+                "pdays": pdays, "previous": previous,
+                "emp.var.rate": emp_var_rate, "cons.price.idx": cons_price_idx,
+                "cons.conf.idx": cons_conf_idx, "euribor3m": euribor3m,
+                "nr.employed": nr_employed,
+                "job": job, "marital": marital, "education": education,
+                "default": default, "housing": housing, "loan": loan,
+                "contact": contact_type, "month": month,
+                "day_of_week": day_of_week, "poutcome": poutcome,
             }
-
-            input_df = pd.DataFrame(data)
-            prediction = model.predict(input_df)[0]
-
+            input_row = encoder.encode_row(record)
+            prediction = model.predict_encoded(input_row.reshape(1, -1))[0]
             if prediction == 1:
                 st.success("✅ Prediction: Subscribed (Yes)")
             else:
                 st.error("❌ Prediction: Not Subscribed (No)")
+            st.caption(f"Scored by model {model.version}")
 
 # =============================
 # Welcome page
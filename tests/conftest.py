@@ -0,0 +1,72 @@
+"""conftest.py – Shared test fixtures
+---------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: A small forest fitted the way the notebook fits the real model
+             (get_dummies with drop_first, Min-Max scaled numerics) on the
+             first rows of bank-additional.csv, so the tests run in seconds
+             and never need best_model.pkl.
+"""
+
+# =============================
+# Imports
+# =============================
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import MinMaxScaler
+
+from features import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, FeatureEncoder
+from model_artifact import ModelArtifact
+
+# =============================
+# Constants
+# =============================
+RAW_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bank-additional.csv")
+TRAIN_ROWS = 1500
+TEST_ROWS = 300
+
+
+def one_hot(frame, scaler, drop_first=True):
+    """The notebook's feature matrix: scaled numerics, then get_dummies."""
+    features = pd.get_dummies(frame, columns=CATEGORICAL_COLUMNS, drop_first=drop_first, dtype=np.float64)
+    features[NUMERIC_COLUMNS] = scaler.transform(frame[NUMERIC_COLUMNS])
+    return features
+
+
+def training_data():
+    """(raw rows, one-hot matrix, target, fitted scaler) of the training rows."""
+    raw = pd.read_csv(RAW_DATA_PATH, sep=";", nrows=TRAIN_ROWS)
+    y = (raw.pop("y") == "yes").astype(int)
+    scaler = MinMaxScaler().fit(raw[NUMERIC_COLUMNS])
+    return raw, one_hot(raw, scaler), y, scaler
+
+
+def fit_artifact(random_state=0, n_estimators=12):
+    """ModelArtifact of a freshly fitted small forest."""
+    _, X, y, scaler = training_data()
+    forest = RandomForestClassifier(n_estimators=n_estimators, max_depth=8, random_state=random_state)
+    forest.fit(X, y)
+    return ModelArtifact(FeatureEncoder.with_scaler(list(X.columns), scaler), forest)
+
+
+# =============================
+# Fixtures
+# =============================
+@pytest.fixture(scope="session")
+def training():
+    return training_data()
+
+
+@pytest.fixture(scope="session")
+def artifact():
+    return fit_artifact()
+
+
+@pytest.fixture(scope="session")
+def raw_rows():
+    """Rows the forest was not trained on, without the target."""
+    frame = pd.read_csv(RAW_DATA_PATH, sep=";", skiprows=range(1, TRAIN_ROWS + 1), nrows=TEST_ROWS)
+    return frame.drop(columns="y")
@@ -0,0 +1,76 @@
+"""test_audit_log.py – Audit records written and read back
+-------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Logged rows must decode to the raw records and answers that went in.
+"""
+
+import numpy as np
+import pandas as pd
+
+from audit_log import AuditLogger, decode, read_day_frame, read_log
+from features import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS
+
+
+def log_rows(artifact, raw_rows, directory):
+    records = raw_rows.to_dict("records")
+    proba = artifact.predict_proba(raw_rows)[:, 1]
+    predictions = artifact.predict(raw_rows)
+    logger = AuditLogger(str(directory), flush_interval=60)
+    logger.log(artifact, records[:-1], predictions[:-1], proba[:-1])
+    logger.log_one(artifact, records[-1], predictions[-1], proba[-1])
+    logger.close()
+    return logger, predictions, proba
+
+
+def test_records_round_trip(artifact, raw_rows, tmp_path):
+    logger, predictions, proba = log_rows(artifact, raw_rows, tmp_path)
+    assert logger.stats()["rows"] == len(raw_rows) and logger.stats()["errors"] == 0
+    rows, header = read_log(logger.files[0])
+    frame = decode(rows, header)
+    assert len(frame) == len(raw_rows)
+    for field in NUMERIC_COLUMNS:
+        assert np.array_equal(frame[field], raw_rows[field]), field
+    for field in CATEGORICAL_COLUMNS:
+        assert frame[field].astype(str).tolist() == raw_rows[field].tolist(), field
+    assert np.array_equal(frame["prediction"], predictions)
+    assert np.array_equal(frame["probability_yes"], proba.astype(np.float32))
+    assert (frame["model_version"] == artifact.version).all()
+
+
+def test_day_frame_reads_every_part(artifact, raw_rows, tmp_path):
+    logger, _, _ = log_rows(artifact, raw_rows, tmp_path)
+    day = pd.Timestamp.now(tz="UTC").strftime("%Y-%m-%d")
+    assert len(read_day_frame(str(tmp_path), day)) == len(raw_rows)
+
+
+def test_values_outside_the_vocabulary_round_trip(artifact, raw_rows, tmp_path):
+    # Unseen categories go to the side table; numerics are kept unrounded
+    records = [dict(raw_rows.iloc[0], job="astronaut", month="jan", age=150, euribor3m=1.23456789),
+               dict(raw_rows.iloc[1], job="astronaut", marital=None),
+               dict(raw_rows.iloc[2])]
+    frame_rows = raw_rows.iloc[:3].assign(job=["astronaut", "pilot", "admin."])
+    logger = AuditLogger(str(tmp_path), flush_interval=60)
+    logger.log(artifact, records, [0, 1, 0], [0.25, 0.75, 0.5])
+    logger.log_frame(artifact, frame_rows, [0, 0, 0], [0.1, 0.2, 0.3])
+    logger.close()
+    frame = decode(*read_log(logger.files[0]))
+    assert frame["job"].tolist() == ["astronaut", "astronaut", records[2]["job"], "astronaut", "pilot", "admin."]
+    assert frame["month"][0] == "jan"
+    assert pd.isna(frame["marital"][1])
+    assert frame["age"][0] == 150 and frame["euribor3m"][0] == 1.23456789
+    assert frame["marital"][0] == records[0]["marital"]
+
+
+def test_batch_frames_and_records_share_a_file(artifact, raw_rows, tmp_path):
+    # Batch chunks are queued as DataFrames, form rows as raw records
+    chunk, records = raw_rows.iloc[:200], raw_rows.iloc[200:].to_dict("records")
+    logger = AuditLogger(str(tmp_path), flush_interval=60)
+    logger.log_frame(artifact, chunk, artifact.predict(chunk), artifact.predict_proba(chunk)[:, 1])
+    logger.log(artifact, records, artifact.predict(records), artifact.predict_proba(records)[:, 1])
+    logger.log_frame(artifact, chunk.iloc[:5], np.zeros(5, dtype=int), np.full(5, np.nan))
+    logger.close()
+    frame = decode(*read_log(logger.files[0]))
+    assert len(frame) == len(raw_rows) + 5
+    assert np.array_equal(frame["duration"][:len(raw_rows)], raw_rows["duration"])
+    assert frame["job"][:len(raw_rows)].astype(str).tolist() == raw_rows["job"].tolist()
+    assert np.isnan(frame["probability_yes"].to_numpy()[-5:]).all()
@@ -0,0 +1,42 @@
+"""test_distill.py – Tiered scoring with a distilled student
+--------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: A TieredScorer must stand in for the full artifact on every
+             scoring path, and escalate exactly the rows the student is
+             unsure about.
+"""
+
+import numpy as np
+import pytest
+
+from batch_score import score_chunk
+from distill import TieredScorer, distill
+
+
+@pytest.fixture(scope="module")
+def tiered(artifact, training):
+    raw, _, y, _ = training
+    student, _ = distill(artifact, raw.assign(y=np.where(y == 1, "yes", "no")), depth=4, augment=1)
+    return TieredScorer(student, artifact)
+
+
+def test_coded_and_one_hot_paths_agree(tiered, raw_rows):
+    expected = tiered.predict_proba(raw_rows)
+    assert np.array_equal(tiered.predict_proba_coded(tiered.transform_coded(raw_rows)), expected)
+    assert np.array_equal(tiered.predict_coded(tiered.transform_coded(raw_rows)), tiered.predict(raw_rows))
+
+
+def test_only_uncertain_rows_reach_the_teacher(tiered, artifact, raw_rows):
+    X = tiered.transform(raw_rows)
+    p_student = tiered.student_proba_yes(X)
+    uncertain = np.abs(p_student - 0.5) < tiered.margin
+    proba = tiered.predict_proba_encoded(X)
+    assert np.array_equal(proba[uncertain], artifact.predict_proba_encoded(X[uncertain]))
+    assert np.array_equal(proba[~uncertain, 1], p_student[~uncertain])
+
+
+def test_batch_scoring_explains_with_the_full_model(tiered, raw_rows):
+    assert tiered.explainer is tiered.teacher.explainer
+    result = score_chunk(tiered, raw_rows, explain_top=2)
+    assert np.array_equal(result["probability_yes"], tiered.predict_proba(raw_rows)[:, 1])
+    assert (result["reason_1"] != "").any()
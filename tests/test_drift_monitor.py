@@ -0,0 +1,44 @@
+"""test_drift_monitor.py – Streaming drift counts and PSI
+------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Frames and single records must count (and decay) the same way.
+"""
+
+import numpy as np
+import pytest
+
+from drift_monitor import DriftMonitor, build_reference
+from tests.conftest import RAW_DATA_PATH
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return build_reference(RAW_DATA_PATH)
+
+
+@pytest.mark.parametrize("window", [7, 64, 10_000])
+def test_frames_decay_like_single_records(reference, raw_rows, window):
+    by_frame, by_record = DriftMonitor(reference, window), DriftMonitor(reference, window)
+    by_frame.update_frame(raw_rows.iloc[:3])
+    by_frame.update_frame(raw_rows.iloc[3:])
+    by_record.update_records(raw_rows.to_dict("records"))
+    assert by_frame.counts == by_record.counts
+    assert by_frame.rows == by_record.rows == len(raw_rows)
+    assert by_frame.pending == by_record.pending == len(raw_rows) % window
+
+
+def test_training_data_does_not_drift(reference, raw_rows):
+    monitor = DriftMonitor(reference)
+    monitor.update_frame(raw_rows)
+    report = monitor.report()
+    assert report["rows"] == len(raw_rows)
+    assert set(report["fields"]) == set(monitor.fields)
+    assert all(np.isfinite(entry["psi"]) for entry in report["fields"].values())
+
+
+def test_shifted_inputs_are_flagged(reference, raw_rows):
+    monitor = DriftMonitor(reference)
+    monitor.update_frame(raw_rows.assign(duration=raw_rows["duration"] * 5, contact="telephone"))
+    report = monitor.report()["fields"]
+    assert report["duration"]["status"] == "drift"
+    assert report["contact"]["status"] == "drift"
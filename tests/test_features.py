@@ -0,0 +1,58 @@
+"""test_features.py – FeatureEncoder against the notebook's get_dummies layout
+--------------------------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Every encoding path must produce the matrix the model was fitted on.
+"""
+
+import numpy as np
+
+from features import CATEGORICAL_COLUMNS, UNSEEN_CODE, FeatureEncoder
+from tests.conftest import one_hot
+
+
+def test_encode_frame_matches_get_dummies(artifact, training):
+    raw, X, _, _ = training
+    encoded = artifact.encoder.encode_frame(raw)
+    assert artifact.encoder.columns == list(X.columns)
+    assert np.array_equal(encoded, X.to_numpy())
+
+
+def test_unseen_rows_match_get_dummies(artifact, training, raw_rows):
+    # Without drop_first, then reduced to the training columns: baselines drop out
+    scaler = training[3]
+    expected = one_hot(raw_rows, scaler, drop_first=False).reindex(columns=artifact.columns, fill_value=0.0)
+    assert np.array_equal(artifact.encoder.encode_frame(raw_rows), expected.to_numpy())
+
+
+def test_row_paths_match_the_frame_path(artifact, raw_rows):
+    encoder = artifact.encoder
+    records = raw_rows.to_dict("records")
+    block = encoder.encode_frame(raw_rows)
+    assert np.array_equal(encoder.encode_records(records), block)
+    out = np.empty(encoder.n_features)
+    for record, row in zip(records[:25], block):
+        assert np.array_equal(encoder.encode_row(record, out), row)
+
+
+def test_unknown_values_encode_to_zeros(artifact, raw_rows):
+    encoder = artifact.encoder
+    record = dict(raw_rows.iloc[0], job="astronaut")
+    row = encoder.encode_row(record)
+    assert not any(row[i] for i in encoder.category_index["job"].values())
+    codes = encoder.encode_records_codes([record]).codes
+    assert codes[0, CATEGORICAL_COLUMNS.index("job")] == UNSEEN_CODE
+
+
+def test_coded_block_expands_to_the_one_hot_rows(artifact, raw_rows):
+    encoder = artifact.encoder
+    block = encoder.encode_codes(raw_rows)
+    expected = encoder.encode_frame(raw_rows).astype(np.float32)
+    assert np.array_equal(encoder.expand_codes(block, dtype=np.float32), expected)
+    records = encoder.encode_records_codes(raw_rows.to_dict("records"))
+    assert np.array_equal(records.numeric, block.numeric)
+    assert np.array_equal(records.codes, block.codes)
+
+
+def test_state_round_trip(artifact, raw_rows):
+    encoder = FeatureEncoder.from_state(artifact.encoder.state())
+    assert np.array_equal(encoder.encode_frame(raw_rows), artifact.encoder.encode_frame(raw_rows))
@@ -0,0 +1,48 @@
+"""test_forest_engine.py – CompiledForest against sklearn
+-----------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: The compiled engine must give exactly sklearn's numbers.
+"""
+
+import numpy as np
+
+from features import unnamed_features
+from forest_engine import CompiledForest, compile_model
+
+
+def sklearn_proba(artifact, X):
+    with unnamed_features():
+        return artifact.estimator.predict_proba(X)
+
+
+def test_predict_proba_is_bit_identical_to_sklearn(artifact, raw_rows):
+    X = artifact.transform(raw_rows)
+    assert np.array_equal(artifact.engine.predict_proba(X), sklearn_proba(artifact, X))
+
+
+def test_training_rows_and_single_rows_match(artifact, training):
+    X = training[1].to_numpy()
+    assert np.array_equal(artifact.engine.predict_proba(X), sklearn_proba(artifact, X))
+    for row in X[:20]:
+        assert np.array_equal(artifact.engine.predict_proba(row.reshape(1, -1)),
+                              sklearn_proba(artifact, row.reshape(1, -1)))
+
+
+def test_predict_returns_the_classes(artifact, raw_rows):
+    X = artifact.transform(raw_rows)
+    with unnamed_features():
+        expected = artifact.estimator.predict(X)
+    assert np.array_equal(artifact.engine.predict(X), expected)
+
+
+def test_arrays_round_trip(artifact, raw_rows):
+    arrays, meta = artifact.engine.to_arrays()
+    engine = CompiledForest.from_arrays(arrays, meta)
+    X = artifact.transform(raw_rows)
+    assert np.array_equal(engine.predict_proba(X), artifact.engine.predict_proba(X))
+
+
+def test_non_tree_models_are_not_compiled(training):
+    from sklearn.linear_model import LogisticRegression
+    _, X, y, _ = training
+    assert compile_model(LogisticRegression(max_iter=200).fit(X, y)) is None
@@ -0,0 +1,58 @@
+"""test_incremental.py – Model updates from new campaign outcomes
+-------------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Every model the training stage can pick is either updated or
+             refused, and the outcome history only grows on success.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import LinearSVC
+from sklearn.tree import DecisionTreeClassifier
+
+import incremental
+from features import FeatureEncoder
+from model_artifact import ModelArtifact, load_artifact
+from tests.conftest import RAW_DATA_PATH, TRAIN_ROWS, training_data
+
+
+def fitted_artifact(model):
+    _, X, y, scaler = training_data()
+    return ModelArtifact(FeatureEncoder.with_scaler(list(X.columns), scaler), model.fit(X, y))
+
+
+@pytest.fixture(scope="module")
+def outcomes():
+    return pd.read_csv(RAW_DATA_PATH, sep=";", skiprows=range(1, TRAIN_ROWS + 1), nrows=800)
+
+
+@pytest.mark.parametrize("model", [LogisticRegression(max_iter=500), LinearSVC()])
+def test_linear_models_are_refined_in_place(model, outcomes):
+    base = fitted_artifact(model)
+    updated = incremental.update_artifact(base, outcomes, random_state=0)
+    final = updated.estimator
+    assert type(final) is type(base.estimator) and updated.metadata["update_method"] == "linear"
+    assert final.coef_.shape == base.estimator.coef_.shape
+    assert not np.array_equal(final.coef_, base.estimator.coef_)
+    assert updated.has_proba == base.has_proba
+    assert len(updated.predict(outcomes.drop(columns="y"))) == len(outcomes)
+
+
+def test_history_grows_only_after_a_saved_update(artifact, outcomes, tmp_path):
+    new, history = tmp_path / "new.csv", tmp_path / "history.csv"
+    outcomes.to_csv(new, sep=";", index=False)
+
+    tree = fitted_artifact(DecisionTreeClassifier(max_depth=3))
+    tree.save(tmp_path / "tree.pkl")
+    with pytest.raises(ValueError, match="cannot be updated incrementally"):
+        incremental.main([str(new), "--model", str(tmp_path / "tree.pkl"), "--out", str(tmp_path / "out.pkl"),
+                          "--history", str(history)])
+    assert not history.exists()
+
+    artifact.save(tmp_path / "forest.pkl")
+    incremental.main([str(new), "--model", str(tmp_path / "forest.pkl"), "--out", str(tmp_path / "forest.pkl"),
+                      "--history", str(history), "--trees", "4", "--seed", "0"])
+    assert load_artifact(str(tmp_path / "forest.pkl")).metadata["base_version"] == artifact.version
+    assert len(pd.read_csv(history, sep=";")) == len(outcomes)
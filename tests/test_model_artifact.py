@@ -0,0 +1,64 @@
+"""test_model_artifact.py – Scoring paths and saved formats of a ModelArtifact
+--------------------------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: Coded and one-hot rows, the engine and sklearn, and the pickled
+             and memory-mapped files must all give the same probabilities.
+"""
+
+import numpy as np
+import pytest
+
+import model_artifact
+from model_artifact import load_artifact
+
+
+def test_coded_and_one_hot_paths_agree(artifact, raw_rows):
+    expected = artifact.predict_proba_encoded(artifact.transform(raw_rows))
+    assert np.array_equal(artifact.predict_proba_coded(artifact.transform_coded(raw_rows)), expected)
+    assert np.array_equal(artifact.predict_coded(artifact.transform_coded(raw_rows)),
+                          artifact.predict_encoded(artifact.transform(raw_rows)))
+
+
+def test_sklearn_path_agrees_with_the_engine(artifact, raw_rows, monkeypatch):
+    expected = artifact.predict_proba(raw_rows)
+    # Every batch is "large": the estimator answers, coded rows are expanded in slices
+    monkeypatch.setattr(model_artifact, "ENGINE_MAX_ROWS", 0)
+    monkeypatch.setattr(model_artifact, "EXPAND_ROWS", 64)
+    assert np.array_equal(artifact.predict_proba(raw_rows), expected)
+    assert np.array_equal(artifact.predict_proba_coded(artifact.transform_coded(raw_rows)), expected)
+
+
+def test_record_and_frame_inputs_agree(artifact, raw_rows):
+    records = raw_rows.to_dict("records")
+    expected = artifact.predict_proba(raw_rows)
+    assert np.array_equal(artifact.predict_proba(records), expected)
+    assert np.array_equal(artifact.predict_proba(records[3]), expected[3:4])
+
+
+@pytest.mark.parametrize("copy", [False, True])
+def test_mapped_and_pickled_artifacts_agree(artifact, raw_rows, tmp_path, copy):
+    artifact.save(tmp_path / "model_artifact.pkl")
+    artifact.save_mapped(tmp_path / "model.forest")
+    pickled = load_artifact(str(tmp_path / "model_artifact.pkl"))
+    mapped = load_artifact(str(tmp_path / "model.forest"), copy=copy)
+    assert mapped.estimator is None
+    assert pickled.version == mapped.version == artifact.version
+    expected = artifact.predict_proba(raw_rows)
+    assert np.array_equal(pickled.predict_proba(raw_rows), expected)
+    assert np.array_equal(mapped.predict_proba(raw_rows), expected)
+    assert np.array_equal(mapped.predict_proba_coded(mapped.transform_coded(raw_rows)), expected)
+
+
+def test_copied_arrays_survive_the_file(artifact, raw_rows, tmp_path):
+    path = tmp_path / "model.forest"
+    artifact.save_mapped(path)
+    mapped = load_artifact(str(path), copy=True)
+    path.unlink()
+    assert np.array_equal(mapped.predict_proba(raw_rows), artifact.predict_proba(raw_rows))
+
+
+def test_unsupported_format_is_rejected(artifact, tmp_path):
+    payload = artifact.to_dict()
+    payload["format"] = model_artifact.ARTIFACT_FORMAT + 1
+    with pytest.raises(ValueError, match="Unsupported artifact format"):
+        model_artifact.ModelArtifact.from_dict(payload)
@@ -0,0 +1,145 @@
+"""test_model_registry.py – Hot reload, swap and rollback
+-----------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: A model file replaced by rename goes live once it is valid, a
+             file rewritten in place is refused, and rollback() brings the
+             previous model straight back and keeps it.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from model_registry import ModelRegistry
+from tests.conftest import fit_artifact
+
+
+@pytest.fixture(scope="module")
+def other_artifact():
+    return fit_artifact(random_state=1)
+
+
+def replace(path, artifact):
+    # Both savers write next to the file and rename over it
+    if path.endswith(".forest"):
+        artifact.save_mapped(path)
+    else:
+        artifact.save(path)
+
+
+def test_replaced_file_is_swapped_in_and_rolled_back(artifact, other_artifact, raw_rows, tmp_path):
+    path = str(tmp_path / "model_artifact.pkl")
+    artifact.save(path)
+    registry = ModelRegistry(path, batch=raw_rows.iloc[:32])
+    assert registry.current.version == artifact.version
+    assert not registry.check()                 # Nothing changed
+
+    replace(path, other_artifact)
+    assert registry.check()
+    assert registry.current.version == other_artifact.version
+    assert registry.previous.version == artifact.version
+    assert np.array_equal(registry.current.predict_proba(raw_rows), other_artifact.predict_proba(raw_rows))
+    assert not registry.check()                 # Loaded once only
+
+    deployed = registry.fingerprint
+    assert registry.rollback().version == artifact.version
+    assert registry.current.version == artifact.version
+    assert registry.previous.version == other_artifact.version
+    assert registry.swaps == 2
+    # The status names the rolled-back model's file, and the newer file is not reloaded
+    assert registry.status()["pinned"] and registry.fingerprint != deployed
+    assert not registry.check()
+    assert registry.current.version == artifact.version
+
+    replace(path, other_artifact)               # A new deployment ends the pin
+    assert registry.check()
+    assert registry.current.version == other_artifact.version
+    assert not registry.status()["pinned"]
+
+
+@pytest.mark.parametrize("name", ["model_artifact.pkl", "model.forest"])
+def test_saving_over_the_live_file_is_picked_up(artifact, other_artifact, raw_rows, tmp_path, name):
+    path = str(tmp_path / name)
+    replace(path, artifact)
+    registry = ModelRegistry(path, batch=raw_rows.iloc[:32])
+    inode = os.stat(path).st_ino
+    replace(path, other_artifact)              # What training.py and incremental.py --out do
+    assert os.stat(path).st_ino != inode
+    assert registry.check()
+    assert registry.current.version == other_artifact.version
+    assert registry.last_error is None
+    assert os.listdir(tmp_path) == [name]      # No temporary file left behind
+
+
+def test_file_rewritten_in_place_is_refused(artifact, other_artifact, raw_rows, tmp_path):
+    path = str(tmp_path / "model_artifact.pkl")
+    artifact.save(path)
+    registry = ModelRegistry(path, batch=raw_rows.iloc[:32])
+    other_artifact.save(f"{path}.new")
+    with open(f"{path}.new", "rb") as source, open(path, "r+b") as target:
+        target.write(source.read())             # What `cp` over the live file does
+        target.truncate()
+    assert not registry.check()
+    assert "rewritten in place" in registry.last_error
+    assert registry.current.version == artifact.version
+    assert not registry.check()                 # Reported once, not retried
+
+    replace(path, other_artifact)
+    assert registry.check()
+    assert registry.current.version == other_artifact.version
+    assert registry.last_error is None
+
+
+def test_broken_file_keeps_the_current_model(artifact, raw_rows, tmp_path):
+    path = str(tmp_path / "model_artifact.pkl")
+    artifact.save(path)
+    registry = ModelRegistry(path, batch=raw_rows.iloc[:32])
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(b"not a model")
+    os.replace(f"{path}.tmp", path)
+    assert not registry.check()
+    assert registry.current.version == artifact.version
+    assert registry.last_error.startswith(path)
+    assert not registry.check()                 # The broken file is not retried
+    with pytest.raises(ValueError):
+        registry.rollback()
+
+
+def test_swaps_under_load_never_mix_models(artifact, other_artifact, raw_rows, tmp_path):
+    # Mapped files: readers keep walking the old file's pages while it is replaced
+    path = str(tmp_path / "model.forest")
+    artifact.save_mapped(path)
+    registry = ModelRegistry(path, batch=raw_rows.iloc[:32])
+    rows = raw_rows.iloc[:64]
+    expected = {a.version: a.predict_proba(rows) for a in (artifact, other_artifact)}
+    stop = threading.Event()
+    errors, seen = [], set()
+
+    def serve():
+        while not stop.is_set():
+            try:
+                model = registry.current            # Once per request
+                if not np.array_equal(model.predict_proba(rows), expected[model.version]):
+                    errors.append(f"wrong answer from {model.version}")
+                seen.add(model.version)
+            except Exception as exc:
+                errors.append(repr(exc))
+
+    readers = [threading.Thread(target=serve) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for i in range(6):
+            replace(path, (other_artifact, artifact)[i % 2])
+            assert registry.check()
+            if i % 3 == 2:
+                registry.rollback()
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+    assert not errors, errors[:3]
+    assert seen == set(expected)
+    assert registry.swaps == 8
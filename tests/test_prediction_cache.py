@@ -0,0 +1,51 @@
+"""test_prediction_cache.py – PredictionCache hits, misses and eviction
+-------------------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: A hit must return exactly what the model answered for that row.
+"""
+
+import numpy as np
+
+from prediction_cache import PredictionCache, row_key
+
+
+def test_hits_return_the_computed_answer(artifact, raw_rows):
+    cache = PredictionCache(max_entries=64, model_version=artifact.version)
+    calls = []
+
+    def score(row):
+        calls.append(row.copy())
+        return float(artifact.predict_proba_encoded(row.reshape(1, -1))[0, 1])
+
+    rows = artifact.transform(raw_rows.iloc[:10])
+    first = [cache.get_or_compute(row, score) for row in rows]
+    again = [cache.get_or_compute(row.copy(), score) for row in rows]
+    assert again == first
+    assert len(calls) == len(rows)
+    assert first == artifact.predict_proba(raw_rows.iloc[:10])[:, 1].tolist()
+    assert cache.stats()["hits"] == len(rows)
+
+
+def test_different_rows_do_not_collide(artifact, raw_rows):
+    rows = artifact.transform(raw_rows)
+    unique = np.unique(rows, axis=0)
+    assert len({row_key(row) for row in unique}) == len(unique)
+    # Rows differing in the last bit of one value are different keys
+    row = rows[0].copy()
+    nudged = row.copy()
+    nudged[0] = np.nextafter(nudged[0], 1.0)
+    assert row_key(row) != row_key(nudged)
+    assert row_key(row) == row_key(row.astype(np.float64).copy())
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = PredictionCache(max_entries=2)
+    a, b, c = (np.full(3, v) for v in (1.0, 2.0, 3.0))
+    cache.put(row_key(a), "a")
+    cache.put(row_key(b), "b")
+    assert cache.get(row_key(a)) == "a"       # b is now the oldest
+    cache.put(row_key(c), "c")
+    assert cache.get(row_key(b)) is None
+    assert cache.get(row_key(a)) == "a"
+    assert cache.get(row_key(c)) == "c"
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,35 @@
+"""test_training.py – Scaling of the training data
+----------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: The artifact must scale raw inputs the way the data it was
+             trained on was scaled, whatever file `--data` names.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_cache import build_dataset
+from model_artifact import scaling_from_raw_data
+from tests.conftest import RAW_DATA_PATH
+from training import data_scaling
+
+
+def test_cache_scaling_comes_from_its_own_source(tmp_path):
+    raw, cache = tmp_path / "raw.csv", tmp_path / "data.bin"
+    pd.read_csv(RAW_DATA_PATH, sep=";", nrows=2000).to_csv(raw, sep=";", index=False)
+    build_dataset(str(raw), str(cache))
+    scale, low, source = data_scaling(str(cache))
+    expected = scaling_from_raw_data(str(raw))
+    assert source == str(raw)
+    assert np.allclose(scale, expected[0], rtol=1e-12) and np.allclose(low, expected[1], rtol=1e-12)
+    assert not np.allclose(scale, scaling_from_raw_data(RAW_DATA_PATH)[0])
+    with pytest.raises(ValueError, match="was built from"):
+        data_scaling(str(cache), RAW_DATA_PATH)
+
+
+def test_csv_scaling_comes_from_the_raw_file(tmp_path):
+    raw = tmp_path / "raw.csv"
+    pd.read_csv(RAW_DATA_PATH, sep=";", nrows=500).to_csv(raw, sep=";", index=False)
+    scale, _, source = data_scaling("cleaned_data.csv", str(raw))
+    assert source == str(raw) and np.array_equal(scale, scaling_from_raw_data(str(raw))[0])
@@ -0,0 +1,352 @@
+"""training.py – Model selection and hyperparameter search
+-------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: The notebook's findBestModel / findHyperParameters as an
+             importable module. Folds and candidates run across a process
+             pool, bad candidates are dropped early by successive halving
+             (every round scores the survivors on more folds), and fold
+             splits plus every per-fold score are cached on disk, so a rerun
+             only computes the candidates, folds or data that changed.
+
+             With `--balance weights` the data is used unbalanced, every row
+             once, and the notebook's resampling is replaced by class weights
+             passed to every fit and score. No duplicated minority rows end
+             up on both sides of the train/test split or of a CV fold.
+
+Usage:
+    python training.py --data cleaned_data.csv --out model_artifact.pkl
+    python dataset_cache.py bank-additional.csv raw_data.bin --no-balance
+    python training.py --data raw_data.bin --balance weights
+"""
+
+# =============================
+# Imports
+# =============================
+import argparse
+import hashlib
+import itertools
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Memory, Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_selection import SelectFromModel
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import get_scorer, recall_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.svm import LinearSVC
+from sklearn.tree import DecisionTreeClassifier
+
+from dataset_cache import RAW_DATA_PATH, is_dataset_file, load_dataset, open_dataset
+
+# =============================
+# Constants
+# =============================
+CLEANED_DATA_PATH = "cleaned_data.csv"
+CACHE_DIR = ".training_cache"
+N_SPLITS = 10
+CV_RANDOM_STATE = 0
+SPLIT_RANDOM_STATE = 10
+TEST_SIZE = 0.25
+MAJORITY_FRACTION = 0.5   # Notebook: majority class undersampled to half, minority oversampled to match
+
+# Same grids as the notebook's findHyperParameters
+PARAM_GRIDS = {
+    RandomForestClassifier: {
+        "model__n_estimators": [200, 300, 400],   # Number of trees in the forest
+        "model__max_depth": [4, 6, 8, 10],        # Maximum depth of the trees
+        "model__min_samples_split": [5, 10, 15],  # Minimum samples required to split a node
+    },
+    LogisticRegression: {
+        "model__C": [0.1, 1, 10],                 # Regularization strength
+        "model__solver": ["liblinear", "lbfgs"],  # Optimization algorithm
+        "model__max_iter": [100, 200, 300],       # Maximum number of iterations
+    },
+    DecisionTreeClassifier: {
+        "model__max_depth": [4, 6, 8, None],      # Maximum depth of the tree
+        "model__min_samples_split": [2, 5, 10],   # Minimum samples required to split a node
+        "model__criterion": ["gini", "entropy"],  # Function to measure the quality of a split
+    },
+    LinearSVC: {
+        "model__C": [0.1, 1, 10],                 # Regularization parameter
+        "model__max_iter": [1000, 2000],          # Maximum number of iterations
+    },
+}
+
+
+# =============================
+# Data
+# =============================
+def load_cleaned_data(path=CLEANED_DATA_PATH):
+    # The binary columnar cache from dataset_cache.py is mapped instead of parsed
+    if is_dataset_file(path):
+        return load_dataset(path)
+    cleaned_data = pd.read_csv(path)
+    return cleaned_data.drop("y", axis=1), cleaned_data["y"]
+
+
+def data_scaling(path=CLEANED_DATA_PATH, raw_path=None):
+    """(scale, min, raw file) of the MinMax scaling the numerics in `path` went through.
+
+    A dataset_cache.py file records its scaling and raw source, and a
+    `raw_path` naming another file is rejected. The notebook's CSV does not,
+    so the scaling is rebuilt from `raw_path` (default bank-additional.csv).
+    """
+    if is_dataset_file(path):
+        meta = open_dataset(path)[1]
+        if "numeric_scale" not in meta:
+            raise ValueError(f"{path} does not record its scaling; rebuild it with dataset_cache.py")
+        if raw_path is not None and os.path.abspath(raw_path) != os.path.abspath(meta["source"]):
+            raise ValueError(f"{path} was built from {meta['source']}, not {raw_path}")
+        return np.asarray(meta["numeric_scale"]), np.asarray(meta["numeric_min"]), meta["source"]
+    from model_artifact import scaling_from_raw_data
+
+    raw_path = raw_path or RAW_DATA_PATH
+    scale, low = scaling_from_raw_data(raw_path)
+    return scale, low, raw_path
+
+
+def split_data(X, y):
+    return train_test_split(X, y, test_size=TEST_SIZE, random_state=SPLIT_RANDOM_STATE)
+
+
+def balanced_sample_weight(y, majority_fraction=MAJORITY_FRACTION):
+    """Per-row weights equivalent to the notebook's resampling.
+
+    The notebook keeps `majority_fraction` of the majority class and draws
+    the minority class with replacement up to the same count. Weighting each
+    class to that same total (n_c * w_c = majority_fraction * n_majority)
+    gives every estimator the same class balance and total weight, in
+    expectation, without copying a single row.
+    """
+    y = np.asarray(y)
+    classes, counts = np.unique(y, return_counts=True)
+    target = majority_fraction * counts.max()
+    per_class = dict(zip(classes.tolist(), (target / counts).tolist()))
+    return np.array([per_class[c] for c in y.tolist()], dtype=np.float64)
+
+
+def fit_params(pipeline, sample_weight):
+    """Fit keyword arguments that hand `sample_weight` to every step that takes one."""
+    if sample_weight is None:
+        return {}
+    return {f"{name}__sample_weight": sample_weight for name, _ in pipeline.steps}
+
+
+def data_fingerprint(X, y, sample_weight=None):
+    """Content hash of the training data (and weights); part of every cache key."""
+    digest = hashlib.sha256()
+    digest.update(repr(list(getattr(X, "columns", []))).encode())
+    digest.update(np.ascontiguousarray(np.asarray(X, dtype=np.float64)).tobytes())
+    digest.update(np.ascontiguousarray(np.asarray(y)).tobytes())
+    if sample_weight is not None:
+        digest.update(np.ascontiguousarray(sample_weight, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+# =============================
+# Model selection (notebook: findBestModel)
+# =============================
+def create_pipeline(model):
+    return make_pipeline(SelectFromModel(model), model)
+
+
+def find_best_model(models, x_train, y_train, x_test, y_test, n_jobs=-1, sample_weight=None):
+    """Fit every candidate pipeline in parallel and return the one with the best recall."""
+    def fit_and_recall(model):
+        pipeline = create_pipeline(clone(model))
+        pipeline.fit(x_train, y_train, **fit_params(pipeline, sample_weight))
+        return recall_score(y_test, pipeline.predict(x_test), pos_label=1)
+
+    recalls = Parallel(n_jobs=n_jobs)(delayed(fit_and_recall)(m) for m in models)
+    return models[int(np.argmax(recalls))]
+
+
+# =============================
+# Cached fold work
+# =============================
+def _fold_indices(data_key, y, n_splits, random_state):
+    cv = StratifiedKFold(n_splits=n_splits, random_state=random_state, shuffle=True)
+    return [(train, test) for train, test in cv.split(np.zeros(len(y)), y)]
+
+
+def _fit_and_score(data_key, model, params, n_splits, random_state, fold, scoring, X, y, train, test,
+                   sample_weight=None):
+    # data_key/model/params/scoring and the fold (its number within the
+    # n_splits-fold split seeded with random_state) identify the work; the key
+    # covers the weights too. X, y, the index arrays and the weights are
+    # ignored by the cache (see _cached)
+    pipeline = Pipeline(steps=[("model", clone(model))]).set_params(**params)
+    if sample_weight is None:
+        pipeline.fit(X[train], y[train])
+        return float(get_scorer(scoring)(pipeline, X[test], y[test]))
+    pipeline.fit(X[train], y[train], **fit_params(pipeline, sample_weight[train]))
+    # Weighted scores match scoring a resampled fold (recall is unchanged by class weights)
+    return float(get_scorer(scoring)(pipeline, X[test], y[test], sample_weight=sample_weight[test]))
+
+
+def _cached(cache_dir):
+    memory = Memory(cache_dir, verbose=0)
+    folds = memory.cache(_fold_indices, ignore=["y"])
+    score = memory.cache(_fit_and_score, ignore=["X", "y", "train", "test", "sample_weight"])
+    return folds, score
+
+
+def _param_key(params):
+    return tuple(sorted((k, repr(v)) for k, v in params.items()))
+
+
+# =============================
+# Search (notebook: findHyperParameters)
+# =============================
+def expand_grid(param_grid):
+    names = sorted(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(param_grid[n] for n in names))]
+
+
+def halving_search(model, param_grid, X, y, scoring="recall", n_splits=N_SPLITS, factor=3,
+                   min_folds=2, halving=True, n_jobs=-1, cache_dir=CACHE_DIR, verbose=True,
+                   sample_weight=None):
+    """Cross-validated search over `param_grid` with successive halving.
+
+    Round r scores the surviving candidates on the first min_folds * factor**r
+    folds (capped at n_splits) and keeps the best 1/factor of them, until the
+    survivors have been scored on every fold. With halving=False every
+    candidate is scored on all folds, which is exactly a full grid search.
+    Scores already on disk are reused, so each (data, candidate, fold) is
+    only ever fitted once. `sample_weight` (one weight per row of X) is
+    passed to every fit and score.
+
+    Returns (best_params, mean_scores), where mean_scores maps each candidate
+    to its mean score over the folds it was scored on.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    data_key = data_fingerprint(X, y, sample_weight)
+    folds_fn, score_fn = _cached(cache_dir)
+    folds = folds_fn(data_key, y, n_splits, CV_RANDOM_STATE)
+
+    candidates = expand_grid(param_grid)
+    scores = {}   # (param_key, fold) -> score
+    n_folds = min(min_folds, n_splits) if halving else n_splits
+    round_no = 0
+    with Parallel(n_jobs=n_jobs) as parallel:
+        while True:
+            todo = [(p, f) for p in candidates for f in range(n_folds)
+                    if (_param_key(p), f) not in scores]
+            start = time.perf_counter()
+            results = parallel(
+                delayed(score_fn)(data_key, model, p, n_splits, CV_RANDOM_STATE, f, scoring, X, y, *folds[f],
+                                  sample_weight)
+                for p, f in todo
+            )
+            for (p, f), s in zip(todo, results):
+                scores[(_param_key(p), f)] = s
+
+            means = {_param_key(p): np.mean([scores[(_param_key(p), f)] for f in range(n_folds)])
+                     for p in candidates}
+            if verbose:
+                print(f"Round {round_no}: {len(candidates)} candidates x {n_folds} folds "
+                      f"({len(todo)} fits, {time.perf_counter() - start:.1f}s)")
+            if n_folds >= n_splits or len(candidates) == 1:
+                break
+            keep = max(1, math.ceil(len(candidates) / factor))
+            candidates = sorted(candidates, key=lambda p: means[_param_key(p)], reverse=True)[:keep]
+            n_folds = min(n_splits, n_folds * factor)
+            round_no += 1
+
+    best = max(candidates, key=lambda p: means[_param_key(p)])
+    return best, means
+
+
+def find_hyper_parameters(model, x_train, y_train, x_test, y_test, scoring="recall", halving=True,
+                          n_jobs=-1, cache_dir=CACHE_DIR, sample_weight=None):
+    """Parallel, cached replacement for the notebook's findHyperParameters.
+
+    Prints the same baseline CV score, best hyperparameters and test recall,
+    and returns (best_model, recall_yes) with best_model refitted on the
+    whole training split.
+    """
+    param_grid = next((g for cls, g in PARAM_GRIDS.items() if isinstance(model, cls)), None)
+    if param_grid is None:
+        raise ValueError(f"Unsupported model type: {type(model)}")
+
+    # Baseline: the model's own settings on every fold (notebook: cross_validate)
+    _, baseline = halving_search(model, {}, x_train, y_train, scoring="accuracy", halving=False,
+                                 n_jobs=n_jobs, cache_dir=cache_dir, verbose=False,
+                                 sample_weight=sample_weight)
+    print("CV score: ", next(iter(baseline.values())))
+
+    best_params, _ = halving_search(model, param_grid, x_train, y_train, scoring=scoring,
+                                    halving=halving, n_jobs=n_jobs, cache_dir=cache_dir,
+                                    sample_weight=sample_weight)
+    best_model = Pipeline(steps=[("model", clone(model))]).set_params(**best_params)
+    best_model.fit(x_train, y_train, **fit_params(best_model, sample_weight))
+
+    recall_yes = recall_score(y_test, best_model.predict(x_test), pos_label=1)
+    print("Best Hyperparameters:", best_params)
+    print("Recall score:", recall_yes)
+    return best_model, recall_yes
+
+
+# =============================
+# CLI: the notebook's training flow end to end
+# =============================
+def main(argv=None):
+    from drift_monitor import REFERENCE_PATH, build_reference, save_reference
+    from features import FeatureEncoder
+    from model_artifact import ModelArtifact
+
+    parser = argparse.ArgumentParser(description="Select, tune and export the term deposit model.")
+    parser.add_argument("--data", default=CLEANED_DATA_PATH,
+                        help="Cleaned training data: the notebook's CSV or a dataset_cache.py file")
+    parser.add_argument("--raw", default=None,
+                        help="Raw file the data was scaled from (default: the one a dataset_cache.py "
+                             "file records, else bank-additional.csv)")
+    parser.add_argument("--out", default="model_artifact.pkl", help="Where to write the model artifact")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Worker processes (-1 = all cores)")
+    parser.add_argument("--no-halving", action="store_true", help="Score every candidate on every fold")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--balance", choices=["resample", "weights"], default="resample",
+                        help="resample: data is already balanced (notebook); weights: unbalanced data "
+                             "(dataset_cache.py --no-balance) with class weights")
+    parser.add_argument("--drift-reference", default=REFERENCE_PATH,
+                        help="Where to write the input profile the drift monitor compares against")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    # Checked first: a mismatch should fail before minutes of training
+    scale, low, raw_path = data_scaling(args.data, args.raw)
+    X, y = load_cleaned_data(args.data)
+    x_train, x_test, y_train, y_test = split_data(X, y)
+    weights = balanced_sample_weight(y_train) if args.balance == "weights" else None
+    if weights is not None and np.ptp(weights) < 0.1:
+        print("Note: the classes are already balanced; --balance weights expects unbalanced data",
+              file=sys.stderr)
+    models = [LogisticRegression(), RandomForestClassifier(), DecisionTreeClassifier(), LinearSVC()]
+    best = find_best_model(models, x_train, y_train, x_test, y_test, args.n_jobs, weights)
+    print("Best model:", type(best).__name__)
+    tuned, recall = find_hyper_parameters(best, x_train, y_train, x_test, y_test,
+                                          halving=not args.no_halving, n_jobs=args.n_jobs,
+                                          cache_dir=args.cache_dir, sample_weight=weights)
+
+    # The training data is already scaled; the artifact scales raw inputs the same way
+    artifact = ModelArtifact(FeatureEncoder(list(X.columns), scale, low), tuned,
+                             metadata={"recall": recall, "trained_on": args.data, "raw_data": raw_path,
+                                       "balance": args.balance})
+    artifact.save(args.out)
+    print(f"Model artifact {artifact.version} saved to {args.out} ({time.perf_counter() - start:.1f}s)")
+    # Profile of the raw inputs the model was trained on, for drift_monitor.py
+    save_reference(build_reference(raw_path), args.drift_reference)
+    print(f"Drift reference saved to {args.drift_reference}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""worker_pool.py – Pre-fork worker pool for the scoring service
+-------------------------------------------------------------
+Author: ADA442 Project Team (İdil Yakut, Helin Kahraman, Kardelen Helvacıoğlu)
+Description: One Python process scores on one core at a time (the GIL), and
+             st.cache_resource only shares the loaded model inside one process.
+             The pool lets the parent load the model once and bind the
+             listening socket, then forks `--workers` scoring processes that
+             all accept connections from that socket. The workers inherit
+             the model instead of loading it: the forest's NumPy arrays are
+             shared copy-on-write (with the mapped model.forest, through the
+             page cache), and gc.freeze() keeps the collector from writing
+             to, and so copying, everything loaded before the fork. The
+             parent only supervises: it restarts workers that die and stops
+             them all on SIGTERM or Ctrl+C.
+
+             Needs os.fork (Linux, macOS). Metrics (/metrics) are per worker.
+
+Usage:
+    python scoring_service.py --workers 4 --model model.forest
+"""
+
+# =============================
+# Imports
+# =============================
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+# =============================
+# Constants
+# =============================
+BACKLOG = 1024
+RESTART_DELAY = 1.0   # Seconds to wait before replacing a worker that died right after starting
+
+
+# =============================
+# Sockets and memory
+# =============================
+def bind_socket(host, port, backlog=BACKLOG):
+    """Listening socket created in the parent and inherited by every worker."""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.setblocking(False)
+    return sock
+
+
+def memory_usage(pid):
+    """Resident, proportional and private memory of a process in MB (Linux).
+
+    rss counts shared pages in full for every process; pss splits them
+    between the processes sharing them; private is what the process alone
+    holds, i.e. the true cost of one more worker.
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                fields[name] = int(rest.split()[0]) / 1024.0
+    return {
+        "rss_mb": fields.get("Rss", 0.0),
+        "pss_mb": fields.get("Pss", 0.0),
+        "private_mb": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+# =============================
+# Pool
+# =============================
+class WorkerPool:
+    """Forks `workers` processes that each run `target()` and keeps them running.
+
+    Everything `target` needs (model, listening socket) should exist before
+    run() is called, so the workers inherit it instead of building their own.
+    """
+
+    def __init__(self, target, workers):
+        if workers < 1:
+            raise ValueError("A pool needs at least one worker")
+        self.target = target
+        self.workers = int(workers)
+        self.started = {}   # pid -> start time
+        self.stopping = False
+
+    @property
+    def pids(self):
+        return list(self.started)
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            # Worker: run the target and never return into the parent's code
+            code = 1
+            try:
+                signal.signal(signal.SIGINT, signal.SIG_IGN)   # The parent stops the workers
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                self.target()
+                code = 0
+            except BaseException:  # noqa: BLE001 - reported, then the worker exits
+                traceback.print_exc()
+            finally:
+                sys.stderr.flush()
+                os._exit(code)
+        self.started[pid] = time.monotonic()
+        return pid
+
+    def stop(self, signum=None, frame=None):
+        self.stopping = True
+        for pid in self.pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self, ready=None):
+        """Fork the workers and supervise them until SIGTERM/SIGINT; then wait for them."""
+        # Objects that exist now are never scanned by the collector again, so
+        # their pages stay shared with the workers
+        gc.collect()
+        gc.freeze()
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for _ in range(self.workers):
+            self.spawn()
+        if ready is not None:
+            ready(self)
+
+        while self.started:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = self.started.pop(pid, None)
+            if self.stopping or started is None:
+                continue
+            print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; restarting",
+                  file=sys.stderr)
+            if time.monotonic() - started < RESTART_DELAY:
+                time.sleep(RESTART_DELAY)
+            if not self.stopping:
+                self.spawn()